@@ -0,0 +1,174 @@
+"""baseline schema
+
+Revision ID: 0000_baseline
+Revises:
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0000_baseline'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Базы, поднятые раньше через create_all, уже содержат эти таблицы — создаём только недостающие
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    def create_table(name, *columns):
+        if name in existing:
+            return False
+        op.create_table(name, *columns)
+        op.create_index(f'ix_{name}_id', name, ['id'])
+        return True
+
+    if create_table(
+        'users',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('telegram_id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(), nullable=True),
+        sa.Column('first_name', sa.String(), nullable=True),
+        sa.Column('last_name', sa.String(), nullable=True),
+        sa.Column('phone', sa.String(), nullable=True),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('is_admin', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    ):
+        op.create_index('ix_users_telegram_id', 'users', ['telegram_id'], unique=True)
+
+    create_table(
+        'services',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('category', sa.String(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('price', sa.Numeric(10, 2), nullable=False),
+        sa.Column('duration_minutes', sa.Integer(), nullable=False),
+        sa.Column('image_url', sa.String(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    )
+
+    create_table(
+        'masters',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('specialization', sa.String(), nullable=True),
+        sa.Column('phone', sa.String(), nullable=True),
+        sa.Column('telegram_id', sa.Integer(), nullable=True),
+        sa.Column('photo_url', sa.String(), nullable=True),
+        sa.Column('work_schedule', sa.JSON(), nullable=True),
+        sa.Column('rating', sa.Numeric(3, 2), nullable=True),
+        sa.Column('reviews_count', sa.Integer(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    )
+
+    create_table(
+        'master_services',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('master_id', sa.Integer(), sa.ForeignKey('masters.id'), nullable=False),
+        sa.Column('service_id', sa.Integer(), sa.ForeignKey('services.id'), nullable=False),
+    )
+
+    if create_table(
+        'certificates',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('code', sa.String(), nullable=False),
+        sa.Column('amount', sa.Numeric(10, 2), nullable=False),
+        sa.Column('category', sa.String(), nullable=True),
+        sa.Column('description', sa.JSON(), nullable=True),
+        sa.Column('image_url', sa.String(), nullable=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=True),
+        sa.Column('purchased_by_user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=True),
+        sa.Column('is_used', sa.Boolean(), nullable=True),
+        sa.Column('used_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    ):
+        op.create_index('ix_certificates_code', 'certificates', ['code'], unique=True)
+
+    create_table(
+        'promotions',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('discount_percent', sa.Numeric(5, 2), nullable=False),
+        sa.Column('image_url', sa.String(), nullable=True),
+        sa.Column('start_date', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('end_date', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+
+    create_table(
+        'salon_settings',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('working_hours', sa.JSON(), nullable=True),
+        sa.Column('address', sa.String(), nullable=True),
+        sa.Column('phone', sa.String(), nullable=True),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('social_links', sa.JSON(), nullable=True),
+        sa.Column('map_coordinates', sa.String(), nullable=True),
+        sa.Column('privacy_policy_text', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    )
+
+    create_table(
+        'bookings',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('service_id', sa.Integer(), sa.ForeignKey('services.id'), nullable=False),
+        sa.Column('master_id', sa.Integer(), sa.ForeignKey('masters.id'), nullable=True),
+        sa.Column('booking_date', sa.Date(), nullable=False),
+        sa.Column('booking_time', sa.String(), nullable=False),
+        sa.Column(
+            'status',
+            sa.Enum('PENDING', 'CONFIRMED', 'COMPLETED', 'CANCELLED', name='bookingstatus'),
+            nullable=True,
+        ),
+        sa.Column('comment', sa.String(), nullable=True),
+        sa.Column('certificate_id', sa.Integer(), sa.ForeignKey('certificates.id'), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    )
+
+    create_table(
+        'notifications',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('type', sa.String(), nullable=False),
+        sa.Column('message', sa.String(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('is_read', sa.Boolean(), nullable=True),
+    )
+
+    create_table(
+        'reviews',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('master_id', sa.Integer(), sa.ForeignKey('masters.id'), nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('booking_id', sa.Integer(), sa.ForeignKey('bookings.id'), nullable=True),
+        sa.Column('rating', sa.Integer(), nullable=False),
+        sa.Column('comment', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    for name in (
+        'reviews', 'notifications', 'bookings', 'salon_settings', 'promotions',
+        'certificates', 'master_services', 'masters', 'services', 'users',
+    ):
+        op.drop_table(name)
+    sa.Enum(name='bookingstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,81 @@
+"""booking periods and overlap exclusion constraint
+
+Revision ID: 0001_booking_periods
+Revises: 0000_baseline
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_booking_periods'
+down_revision = '0000_baseline'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    columns = {column['name'] for column in inspector.get_columns('bookings')}
+
+    # Схему строят только миграции: расширение для bookings_no_overlap создаётся здесь и больше нигде
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    if 'starts_at' not in columns:
+        op.add_column('bookings', sa.Column('starts_at', sa.DateTime(), nullable=True))
+    if 'ends_at' not in columns:
+        op.add_column('bookings', sa.Column('ends_at', sa.DateTime(), nullable=True))
+
+    op.execute(
+        """
+        UPDATE bookings AS b
+        SET starts_at = b.booking_date + b.booking_time::time,
+            ends_at = b.booking_date + b.booking_time::time + make_interval(mins => s.duration_minutes)
+        FROM services AS s
+        WHERE s.id = b.service_id AND b.starts_at IS NULL
+        """
+    )
+    op.alter_column('bookings', 'starts_at', nullable=False)
+    op.alter_column('bookings', 'ends_at', nullable=False)
+
+    constraints = bind.execute(
+        sa.text("SELECT 1 FROM pg_constraint WHERE conname = 'bookings_no_overlap'")
+    ).first()
+    if constraints:
+        return
+
+    overlaps = bind.execute(
+        sa.text(
+            """
+            SELECT a.id, b.id
+            FROM bookings AS a
+            JOIN bookings AS b
+              ON a.master_id = b.master_id
+             AND a.id < b.id
+             AND tsrange(a.starts_at, a.ends_at) && tsrange(b.starts_at, b.ends_at)
+            WHERE a.status IN ('PENDING', 'CONFIRMED') AND b.status IN ('PENDING', 'CONFIRMED')
+            """
+        )
+    ).fetchall()
+    if overlaps:
+        pairs = ", ".join(f"{first}/{second}" for first, second in overlaps)
+        raise RuntimeError(f"Overlapping active bookings must be resolved before migrating: {pairs}")
+
+    op.create_exclude_constraint(
+        'bookings_no_overlap',
+        'bookings',
+        ('master_id', '='),
+        (sa.text('tsrange(starts_at, ends_at)'), '&&'),
+        using='gist',
+        where=sa.text("status IN ('PENDING', 'CONFIRMED')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('bookings_no_overlap', 'bookings')
+    op.drop_column('bookings', 'ends_at')
+    op.drop_column('bookings', 'starts_at')
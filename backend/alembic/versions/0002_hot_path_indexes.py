@@ -0,0 +1,39 @@
+"""composite indexes for hot queries
+
+Revision ID: 0002_hot_path_indexes
+Revises: 0001_booking_periods
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_hot_path_indexes'
+down_revision = '0001_booking_periods'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    # занятость мастеров на диапазон дат (load_busy_masks)
+    ('ix_bookings_master_date_status', 'bookings', ['master_id', 'booking_date', 'status']),
+    # "мои записи", сортировка по дате
+    ('ix_bookings_user_date', 'bookings', ['user_id', 'booking_date']),
+    # отзывы мастера, новые сверху
+    ('ix_reviews_master_created', 'reviews', ['master_id', 'created_at']),
+    # сертификаты пользователя с фильтром по is_used
+    ('ix_certificates_user_used_created', 'certificates', ['user_id', 'is_used', 'created_at']),
+    # мастера услуги
+    ('ix_master_services_service_master', 'master_services', ['service_id', 'master_id']),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
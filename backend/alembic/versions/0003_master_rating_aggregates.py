@@ -0,0 +1,59 @@
+"""master rating sum and per-star counters
+
+Revision ID: 0003_master_rating_aggregates
+Revises: 0002_hot_path_indexes
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_master_rating_aggregates'
+down_revision = '0002_hot_path_indexes'
+branch_labels = None
+depends_on = None
+
+
+COUNTERS = ['rating_sum'] + [f'rating_{star}_count' for star in range(1, 6)]
+
+
+def upgrade() -> None:
+    for name in COUNTERS:
+        op.add_column('masters', sa.Column(name, sa.Integer(), nullable=False, server_default='0'))
+
+    op.execute(
+        """
+        UPDATE masters AS m
+        SET rating_sum = s.total,
+            reviews_count = s.count,
+            rating_1_count = s.r1,
+            rating_2_count = s.r2,
+            rating_3_count = s.r3,
+            rating_4_count = s.r4,
+            rating_5_count = s.r5,
+            rating = s.total::numeric / s.count
+        FROM (
+            SELECT master_id,
+                   SUM(rating) AS total,
+                   COUNT(*) AS count,
+                   COUNT(*) FILTER (WHERE rating = 1) AS r1,
+                   COUNT(*) FILTER (WHERE rating = 2) AS r2,
+                   COUNT(*) FILTER (WHERE rating = 3) AS r3,
+                   COUNT(*) FILTER (WHERE rating = 4) AS r4,
+                   COUNT(*) FILTER (WHERE rating = 5) AS r5
+            FROM reviews
+            GROUP BY master_id
+        ) AS s
+        WHERE m.id = s.master_id
+        """
+    )
+    op.execute("UPDATE masters SET reviews_count = 0 WHERE reviews_count IS NULL")
+    op.alter_column('masters', 'reviews_count', nullable=False, server_default='0')
+
+
+def downgrade() -> None:
+    op.alter_column('masters', 'reviews_count', nullable=True, server_default=None)
+    for name in reversed(COUNTERS):
+        op.drop_column('masters', name)
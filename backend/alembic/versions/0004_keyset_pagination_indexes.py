@@ -0,0 +1,38 @@
+"""extend listing indexes with the full keyset sort key
+
+Revision ID: 0004_keyset_pagination_indexes
+Revises: 0003_master_rating_aggregates
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_keyset_pagination_indexes'
+down_revision = '0003_master_rating_aggregates'
+branch_labels = None
+depends_on = None
+
+
+# Курсор сравнивает весь ключ сортировки, поэтому индекс должен покрывать его целиком, включая id
+INDEXES = (
+    ('ix_bookings_user_date', 'bookings', ['user_id', 'booking_date'], ['user_id', 'booking_date', 'booking_time', 'id']),
+    ('ix_reviews_master_created', 'reviews', ['master_id', 'created_at'], ['master_id', 'created_at', 'id']),
+    (
+        'ix_certificates_user_used_created', 'certificates',
+        ['user_id', 'is_used', 'created_at'], ['user_id', 'is_used', 'created_at', 'id'],
+    ),
+)
+
+
+def upgrade() -> None:
+    for name, table, _, columns in INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, columns, _ in INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
+        op.create_index(name, table, columns)
@@ -0,0 +1,35 @@
+"""link notifications to bookings for reminders
+
+Revision ID: 0005_booking_reminders
+Revises: 0004_keyset_pagination_indexes
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_booking_reminders'
+down_revision = '0004_keyset_pagination_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'notifications',
+        sa.Column('booking_id', sa.Integer(), sa.ForeignKey('bookings.id', ondelete='CASCADE'), nullable=True)
+    )
+    # Уникальность (booking_id, type) — отметка «напоминание уже отправлено», переживающая рестарт
+    op.create_index('uq_notifications_booking_type', 'notifications', ['booking_id', 'type'], unique=True)
+    op.create_index(
+        'ix_bookings_confirmed_starts_at', 'bookings', ['starts_at'],
+        postgresql_where=sa.text("status = 'CONFIRMED'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bookings_confirmed_starts_at', table_name='bookings')
+    op.drop_index('uq_notifications_booking_type', table_name='notifications')
+    op.drop_column('notifications', 'booking_id')
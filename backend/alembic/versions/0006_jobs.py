@@ -0,0 +1,45 @@
+"""durable background job queue
+
+Revision ID: 0006_jobs
+Revises: 0005_booking_reminders
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_jobs'
+down_revision = '0005_booking_reminders'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.BigInteger(), primary_key=True),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'DONE', 'FAILED', name='jobstatus'), nullable=False),
+        sa.Column('run_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('dedup_key', sa.String(), nullable=True, unique=True),
+        sa.Column('locked_by', sa.String(), nullable=True),
+        sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_jobs_queued_run_at', 'jobs', ['run_at', 'id'], postgresql_where=sa.text("status = 'QUEUED'"))
+    op.create_index(
+        'ix_jobs_running_locked_at', 'jobs', ['locked_at'], postgresql_where=sa.text("status = 'RUNNING'")
+    )
+    op.create_index('ix_jobs_finished_at', 'jobs', ['finished_at'])
+
+
+def downgrade() -> None:
+    op.drop_table('jobs')
+    sa.Enum(name='jobstatus').drop(op.get_bind(), checkfirst=True)
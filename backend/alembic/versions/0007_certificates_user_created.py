@@ -0,0 +1,24 @@
+"""certificates index for unfiltered keyset pages
+
+Revision ID: 0007_certificates_user_created
+Revises: 0006_jobs
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_certificates_user_created'
+down_revision = '0006_jobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Без фильтра по is_used индекс (user_id, is_used, created_at, id) не отдаёт строки в порядке курсора
+    op.create_index('ix_certificates_user_created', 'certificates', ['user_id', 'created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_certificates_user_created', table_name='certificates')
@@ -1,16 +1,77 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
     database_url: str
+    # Реплики только для чтения, через запятую; пусто — все запросы идут в основную БД
+    database_replica_urls: str = ""
     secret_key: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     telegram_bot_token: Optional[str] = None
+    telegram_init_data_max_age_seconds: int = 86400
+    # Только для локальной разработки: доверять голому заголовку X-Telegram-User-Id без initData
+    telegram_allow_unsigned_user_id: bool = False
+    telegram_update_queue_size: int = 1000
+    telegram_update_workers: int = 8
+    telegram_update_dedup_size: int = 10000
+    telegram_update_drain_seconds: float = 10
+    telegram_api_base_url: str = "https://api.telegram.org"
+    telegram_dispatch_global_rate: float = 30
+    telegram_dispatch_chat_rate: float = 1
+    telegram_dispatch_group_rate_per_minute: float = 20
+    telegram_dispatch_concurrency: int = 10
+    telegram_dispatch_max_attempts: int = 5
+    # Сколько при остановке ждать отправки уже поставленных исходящих сообщений
+    telegram_dispatch_drain_seconds: float = 10
+    reminder_tick_seconds: int = 60
+    # Каждый тик догоняет напоминания, время которых наступило за последний час (простой, очередь задач)
+    reminder_catchup_seconds: float = 3600
+    reminder_batch_size: int = 500
+    # Воркеры очереди jobs в этом процессе; 0 — процесс только ставит задачи
+    job_workers: int = 4
+    job_claim_batch: int = 10
+    job_poll_seconds: float = 1
+    job_lease_seconds: float = 300
+    job_max_attempts: int = 5
+    job_retry_base_seconds: float = 5
+    job_retry_max_seconds: float = 600
+    job_retention_days: int = 7
+    job_drain_seconds: float = 10
+    user_cache_size: int = 10000
+    user_cache_ttl_seconds: int = 60
     upload_dir: str = "./uploads"
     max_upload_size: int = 10485760
     admin_telegram_id: Optional[int] = None
+    internal_api_token: Optional[str] = None
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 300
+    db_pool_pre_ping: bool = False
+    db_connect_timeout: float = 10
+    db_statement_timeout_ms: Optional[int] = None
+    db_query_count_header: bool = False
+    occupancy_cache_size: int = 4096
+    occupancy_cache_ttl_seconds: int = 60
+    occupancy_cache_horizon_days: int = 60
+    slot_hold_ttl_seconds: int = 300
+    catalog_cache_ttl_seconds: int = 300
+    catalog_cache_size: int = 256
+    # Часовой пояс салона (IANA): в нём заданы расписания мастеров и время записей
+    salon_timezone: str = "Europe/Moscow"
+    # Собранный фронтенд (npm run build): если задан, бэкенд сам отдаёт файлы, прокси на Vite только для разработки
+    frontend_dist_dir: Optional[str] = None
+    frontend_proxy_max_connections: int = 50
+    frontend_proxy_max_keepalive: int = 20
+    frontend_proxy_timeout_seconds: float = 30
+    frontend_proxy_failure_threshold: int = 5
+    frontend_proxy_reset_seconds: float = 10
+
+    @property
+    def replica_urls(self) -> List[str]:
+        return [url.strip() for url in self.database_replica_urls.split(",") if url.strip()]
 
     class Config:
         env_file = ".env"
@@ -1,8 +1,13 @@
-from sqlalchemy import create_engine
+from fastapi import Header
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import settings
+from typing import Optional
+import itertools
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -17,15 +22,77 @@ if not database_url.endswith('/booking_db'):
 
 print(f"INFO: Database URL configured: {database_url.split('@')[1] if '@' in database_url else database_url}", file=sys.stderr)
 
-try:
-    engine = create_engine(
-        database_url,
-        pool_pre_ping=False,
-        pool_recycle=300,
+
+def async_database_url(url: str) -> str:
+    # DATABASE_URL общий с alembic и ботом (psycopg2), приложению нужен драйвер asyncpg
+    scheme, _, rest = url.partition("://")
+    if scheme in ("postgres", "postgresql", "postgresql+psycopg2"):
+        scheme = "postgresql+asyncpg"
+    return f"{scheme}://{rest}"
+
+
+class PoolWaitStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float):
+        self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    # Замеряем, сколько запрос ждёт свободное соединение — главный признак нехватки пула
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.wait_stats.timeouts += 1
+            raise
+        finally:
+            self.wait_stats.record(time.perf_counter() - started)
+
+
+def connect_args() -> dict:
+    args = {"timeout": settings.db_connect_timeout}
+    if settings.db_statement_timeout_ms:
+        args["server_settings"] = {"statement_timeout": str(settings.db_statement_timeout_ms)}
+    return args
+
+
+def create_engine(url: str):
+    return create_async_engine(
+        async_database_url(url),
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_recycle=settings.db_pool_recycle,
         echo=False,
-        connect_args={"connect_timeout": 10}
+        connect_args=connect_args()
     )
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def create_sessionmaker(bind):
+    return async_sessionmaker(bind=bind, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+try:
+    engine = create_engine(database_url)
+    SessionLocal = create_sessionmaker(engine)
+    replica_engines = [create_engine(url) for url in settings.replica_urls]
+    ReplicaSessions = [create_sessionmaker(replica) for replica in replica_engines]
+    if replica_engines:
+        print(f"INFO: {len(replica_engines)} read replica(s) configured", file=sys.stderr)
     print("INFO: Database engine created successfully", file=sys.stderr)
 except Exception as e:
     error_msg = f"ERROR: Failed to create database engine: {e}"
@@ -36,10 +103,51 @@ except Exception as e:
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+_replica_cycle = itertools.cycle(ReplicaSessions) if ReplicaSessions else None
+
+
+def _pool_status(pool) -> dict:
+    wait_stats = pool.wait_stats
+    checkouts = wait_stats.checkouts
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": settings.db_max_overflow,
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": checkouts,
+        "timeouts": wait_stats.timeouts,
+        "avg_wait_ms": round(wait_stats.total_wait / checkouts * 1000, 3) if checkouts else 0.0,
+        "max_wait_ms": round(wait_stats.max_wait * 1000, 3),
+    }
+
+
+def pool_status() -> dict:
+    status = _pool_status(engine.pool)
+    if replica_engines:
+        status["replicas"] = [_pool_status(replica.pool) for replica in replica_engines]
+    return status
+
+
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
+
+def read_session_factory(read_primary: Optional[str] = None):
+    # GET-роуты читают с реплик по кругу. Клиент, который только что записал данные,
+    # шлёт X-Read-Primary, чтобы не увидеть отставшую реплику (read-your-writes)
+    return SessionLocal if read_primary or _replica_cycle is None else next(_replica_cycle)
+
+
+async def get_read_db(read_primary: Optional[str] = Header(None, alias="X-Read-Primary")):
+    factory = read_session_factory(read_primary)
+    async with factory() as db:
+        # Кэши процесса (индекс занятости) по этим меткам решают, можно ли верить прочитанному
+        db.info["replica"] = factory is not SessionLocal
+        db.info["read_primary"] = bool(read_primary)
+        yield db
+
+
+def read_primary_requested(read_primary: Optional[str] = Header(None, alias="X-Read-Primary")) -> bool:
+    return bool(read_primary)
@@ -1,7 +1,14 @@
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base
 from app.config import settings
+from app.database import engine, replica_engines
+from app.middleware.query_counter import QueryCountMiddleware, install_query_counter
+from app.services import frontend_proxy
+from app.services.frontend_files import FrontendFiles
+from app.services.tasks import job_queue
+from app.services.telegram_dispatcher import telegram_dispatcher
+from app.services.update_queue import update_queue
+from app.utils.responses import JSONResponse
 from app.routes import (
     webhook,
     services,
@@ -11,15 +18,15 @@ from app.routes import (
     promotions,
     reviews,
     settings as settings_route,
-    users
+    users,
+    bootstrap,
+    internal
 )
 import logging
-import os
-import httpx
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Booking Bot API", version="1.0.0")
+app = FastAPI(title="Booking Bot API", version="1.0.0", default_response_class=JSONResponse)
 
 app.include_router(webhook.router)
 app.include_router(services.router)
@@ -30,8 +37,8 @@ app.include_router(promotions.router)
 app.include_router(reviews.router)
 app.include_router(settings_route.router)
 app.include_router(users.router)
-
-FRONTEND_URL = os.getenv("FRONTEND_URL", "http://frontend:5173")
+app.include_router(bootstrap.router)
+app.include_router(internal.router)
 
 app.add_middleware(
     CORSMiddleware,
@@ -41,25 +48,46 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# В продакшене фронтенд отдаётся из собранного каталога, прокси на Vite — режим разработки
+frontend_files = FrontendFiles(settings.frontend_dist_dir) if settings.frontend_dist_dir else None
+
+if settings.db_query_count_header:
+    for db_engine in [engine, *replica_engines]:
+        install_query_counter(db_engine)
+    app.add_middleware(QueryCountMiddleware)
+
 
 @app.on_event("startup")
 async def startup():
-    try:
-        Base.metadata.create_all(bind=engine)
-        logger.info("Database tables created/verified successfully")
-    except Exception as e:
-        logger.error(f"Failed to create database tables: {e}")
-        raise
+    # Схемой управляет alembic (alembic upgrade head перед запуском), create_all на старте не нужен
+    if frontend_files is None:
+        await frontend_proxy.open_client()
+    else:
+        logger.info(f"Serving frontend from {frontend_files.root}: {frontend_files.stats()}")
     
-    if os.getenv("TELEGRAM_BOT_TOKEN"):
+    # Тот же признак, что и у расписания напоминаний в app.services.tasks: токен из окружения или .env
+    if settings.telegram_bot_token:
+        await telegram_dispatcher.start()
         try:
             from app.routes.webhook import create_bot_application, set_bot_application
             
             bot_app = await create_bot_application()
             set_bot_application(bot_app)
+            await update_queue.start(bot_app.process_update)
             logger.info("Bot application initialized in FastAPI")
         except Exception as e:
             logger.warning(f"Failed to initialize bot application: {e}")
+    
+    if settings.job_workers:
+        await job_queue.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await job_queue.stop(settings.job_drain_seconds)
+    await update_queue.stop(settings.telegram_update_drain_seconds)
+    await telegram_dispatcher.stop(settings.telegram_dispatch_drain_seconds)
+    await frontend_proxy.close_client()
 
 
 @app.get("/health")
@@ -67,43 +95,15 @@ async def health():
     return {"status": "ok"}
 
 
-@app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"])
+@app.api_route("/{path:path}", methods=["GET", "HEAD", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"])
 async def proxy_frontend(request: Request, path: str):
-    # Don't proxy API routes, webhook, or health check
-    if path.startswith("api/") or path.startswith("webhook/") or path == "health":
+    # Don't proxy API routes, webhook, internal stats, or health check
+    if path.startswith("api/") or path.startswith("webhook/") or path.startswith("internal/") or path == "health":
         return Response(content="Not Found", status_code=404)
     
-    async with httpx.AsyncClient() as client:
-        # Construct URL - add path only if it's not empty
-        if path:
-            url = f"{FRONTEND_URL}/{path}"
-        else:
-            url = FRONTEND_URL
-        params = dict(request.query_params)
-        
-        # Prepare headers - remove host and content-length, set proper host for Vite
-        headers = {k: v for k, v in request.headers.items() if k.lower() not in ["host", "content-length"]}
-        # Set Host header to localhost to bypass Vite host checking
-        headers["Host"] = "localhost:5173"
-        
-        try:
-            response = await client.request(
-                method=request.method,
-                url=url,
-                params=params,
-                headers=headers,
-                content=await request.body() if request.method in ["POST", "PUT", "PATCH"] else None,
-                timeout=30.0,
-                follow_redirects=True
-            )
-            
-            return Response(
-                content=response.content,
-                status_code=response.status_code,
-                headers={k: v for k, v in response.headers.items() if k.lower() not in ["content-encoding", "transfer-encoding"]},
-                media_type=response.headers.get("content-type")
-            )
-        except Exception as e:
-            logger.error(f"Error proxying to frontend: {e}")
-            return Response(content=f"Frontend unavailable: {str(e)}", status_code=503)
-
+    if frontend_files is not None:
+        if request.method not in ("GET", "HEAD"):
+            return Response(content="Method Not Allowed", status_code=405, headers={"Allow": "GET, HEAD"})
+        return frontend_files.response(request, path)
+    
+    return await frontend_proxy.proxy(request, path)
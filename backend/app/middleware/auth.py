@@ -0,0 +1,164 @@
+import hashlib
+import hmac
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from fastapi import Depends, HTTPException, Header
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import settings
+from app.database import get_db
+from app.models import User
+
+
+class TTLCache:
+    # Ограниченный LRU-кэш с временем жизни на каждую запись
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None or item[0] <= time.monotonic():
+                if item is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def put(self, key, value, ttl_seconds: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries, "hits": self.hits, "misses": self.misses}
+
+
+# initData -> telegram_id, живёт до истечения самой подписи: HMAC считаем один раз за сессию
+verified_init_data = TTLCache(max_entries=settings.user_cache_size)
+# telegram_id -> данные строки users; сбрасывается при обновлении профиля
+user_cache = TTLCache(max_entries=settings.user_cache_size)
+
+
+def _secret_key(bot_token: str) -> bytes:
+    return hmac.new(b"WebAppData", bot_token.encode(), hashlib.sha256).digest()
+
+
+def verify_init_data(init_data: str) -> int:
+    telegram_id = verified_init_data.get(init_data)
+    if telegram_id is not None:
+        return telegram_id
+    
+    if not settings.telegram_bot_token:
+        raise HTTPException(status_code=401, detail="Telegram authentication is not configured")
+    
+    fields = dict(parse_qsl(init_data, keep_blank_values=True))
+    received_hash = fields.pop("hash", "")
+    data_check_string = "\n".join(f"{key}={value}" for key, value in sorted(fields.items()))
+    expected_hash = hmac.new(_secret_key(settings.telegram_bot_token), data_check_string.encode(), hashlib.sha256).hexdigest()
+    if not hmac.compare_digest(expected_hash, received_hash):
+        raise HTTPException(status_code=401, detail="Invalid Telegram init data")
+    
+    try:
+        auth_date = int(fields["auth_date"])
+        telegram_id = int(json.loads(fields["user"])["id"])
+    except (KeyError, ValueError, TypeError):
+        raise HTTPException(status_code=401, detail="Invalid Telegram init data")
+    
+    ttl = auth_date + settings.telegram_init_data_max_age_seconds - time.time()
+    if ttl <= 0:
+        raise HTTPException(status_code=401, detail="Telegram init data expired")
+    
+    verified_init_data.put(init_data, telegram_id, ttl)
+    return telegram_id
+
+
+def _user_row(user: User) -> Dict[str, Any]:
+    return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+
+def _detached_user(row: Dict[str, Any]) -> User:
+    # Отдельный экземпляр на каждый запрос: роуты могут менять его, общий кэш остаётся нетронутым
+    user = User(**row)
+    make_transient_to_detached(user)
+    return user
+
+
+def invalidate_user(telegram_id: int):
+    user_cache.pop(telegram_id)
+
+
+def _request_telegram_id(init_data: Optional[str], telegram_id: Optional[int]) -> Optional[int]:
+    if init_data:
+        return verify_init_data(init_data)
+    if settings.telegram_allow_unsigned_user_id:
+        return telegram_id
+    return None
+
+
+async def load_user(db: AsyncSession, telegram_id: int) -> Optional[User]:
+    row = user_cache.get(telegram_id)
+    if row is None:
+        result = await db.execute(select(User).where(User.telegram_id == telegram_id))
+        user = result.scalars().first()
+        if not user:
+            return None
+        row = _user_row(user)
+        user_cache.put(telegram_id, row, settings.user_cache_ttl_seconds)
+    
+    return _detached_user(row)
+
+
+async def get_current_user(
+    init_data: Optional[str] = Header(None, alias="X-Telegram-Init-Data"),
+    telegram_id: Optional[int] = Header(None, alias="X-Telegram-User-Id"),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    telegram_id = _request_telegram_id(init_data, telegram_id)
+    if not telegram_id:
+        raise HTTPException(status_code=401, detail="Telegram user ID required")
+    
+    user = await load_user(db, telegram_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    return user
+
+
+async def get_optional_user(
+    init_data: Optional[str] = Header(None, alias="X-Telegram-Init-Data"),
+    telegram_id: Optional[int] = Header(None, alias="X-Telegram-User-Id"),
+    db: AsyncSession = Depends(get_db)
+) -> Optional[User]:
+    # Для публичных экранов: без заголовков или для ещё не заведённого пользователя — None,
+    # но поддельная или просроченная подпись по-прежнему даёт 401
+    telegram_id = _request_telegram_id(init_data, telegram_id)
+    if not telegram_id:
+        return None
+    
+    return await load_user(db, telegram_id)
@@ -0,0 +1,34 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+from sqlalchemy import event
+from starlette.middleware.base import BaseHTTPMiddleware
+
+_query_counter: ContextVar[Optional[List[int]]] = ContextVar("db_query_counter", default=None)
+
+
+def install_query_counter(engine):
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        counter = _query_counter.get()
+        if counter is not None:
+            counter[0] += 1
+
+
+@contextmanager
+def count_queries():
+    counter = [0]
+    token = _query_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _query_counter.reset(token)
+
+
+class QueryCountMiddleware(BaseHTTPMiddleware):
+    # Число SQL-запросов за запрос в заголовке ответа — быстрый способ поймать N+1
+    async def dispatch(self, request, call_next):
+        with count_queries() as counter:
+            response = await call_next(request)
+        response.headers["X-DB-Query-Count"] = str(counter[0])
+        return response
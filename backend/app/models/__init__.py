@@ -7,6 +7,7 @@ from .promotion import Promotion
 from .notification import Notification
 from .review import Review
 from .salon_settings import SalonSettings
+from .job import Job, JobStatus
 
 __all__ = [
     "User",
@@ -19,5 +20,7 @@ __all__ = [
     "Notification",
     "Review",
     "SalonSettings",
+    "Job",
+    "JobStatus",
 ]
 
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Enum as SQLEnum, Index, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -21,6 +22,8 @@ class Booking(Base):
     master_id = Column(Integer, ForeignKey("masters.id"), nullable=True)  # nullable для "любой специалист"
     booking_date = Column(Date, nullable=False)
     booking_time = Column(String, nullable=False)
+    starts_at = Column(DateTime, nullable=False)
+    ends_at = Column(DateTime, nullable=False)  # starts_at + Service.duration_minutes
     status = Column(SQLEnum(BookingStatus), default=BookingStatus.PENDING)
     comment = Column(String, nullable=True)
     certificate_id = Column(Integer, ForeignKey("certificates.id"), nullable=True)
@@ -28,7 +31,22 @@ class Booking(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     user = relationship("User", back_populates="bookings")
-    service = relationship("Service")
-    master = relationship("Master")
+    # Связи отдаются в BookingResponse: грузим явно через selectinload, случайная ленивая загрузка падает
+    service = relationship("Service", lazy="raise")
+    master = relationship("Master", lazy="raise")
     certificate = relationship("Certificate")
 
+    __table_args__ = (
+        # Активные записи одного мастера не могут пересекаться по времени
+        ExcludeConstraint(
+            (master_id, "="),
+            (func.tsrange(starts_at, ends_at), "&&"),
+            name="bookings_no_overlap",
+            using="gist",
+            where=text("status IN ('PENDING', 'CONFIRMED')"),
+        ),
+        Index("ix_bookings_master_date_status", master_id, booking_date, status),
+        Index("ix_bookings_user_date", user_id, booking_date, booking_time, id),
+        # Напоминания выбирают подтверждённые записи по окну starts_at
+        Index("ix_bookings_confirmed_starts_at", starts_at, postgresql_where=text("status = 'CONFIRMED'")),
+    )
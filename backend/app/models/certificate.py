@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Numeric, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Numeric, Boolean, DateTime, ForeignKey, Index, JSON
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -23,3 +23,9 @@ class Certificate(Base):
     user = relationship("User", foreign_keys=[user_id])
     purchased_by = relationship("User", foreign_keys=[purchased_by_user_id])
 
+    __table_args__ = (
+        Index("ix_certificates_user_used_created", "user_id", "is_used", "created_at", "id"),
+        # Список без фильтра по is_used: тот же порядок курсора без сортировки всех сертификатов пользователя
+        Index("ix_certificates_user_created", "user_id", "created_at", "id"),
+    )
+
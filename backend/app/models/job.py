@@ -0,0 +1,36 @@
+from sqlalchemy import Column, BigInteger, Integer, String, Text, DateTime, JSON, Enum as SQLEnum, Index, text
+from sqlalchemy.sql import func
+from app.database import Base
+import enum
+
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(BigInteger, primary_key=True)
+    name = Column(String, nullable=False)  # имя задачи из реестра app.services.jobs
+    payload = Column(JSON, nullable=False, default=dict)
+    status = Column(SQLEnum(JobStatus), nullable=False, default=JobStatus.QUEUED)
+    run_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    dedup_key = Column(String, nullable=True, unique=True)  # периодические задачи: одна строка на слот расписания
+    locked_by = Column(String, nullable=True)  # воркер, взявший задачу
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Воркеры забирают готовые задачи по этому индексу, завершённые строки в него не попадают
+        Index("ix_jobs_queued_run_at", run_at, id, postgresql_where=text("status = 'QUEUED'")),
+        Index("ix_jobs_running_locked_at", locked_at, postgresql_where=text("status = 'RUNNING'")),
+        Index("ix_jobs_finished_at", finished_at),
+    )
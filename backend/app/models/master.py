@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Numeric, Boolean, DateTime, ForeignKey, Table, JSON
+from sqlalchemy import Column, Integer, String, Numeric, Boolean, DateTime, ForeignKey, Index, Table, JSON
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -10,6 +10,7 @@ master_service_association = Table(
     Column("id", Integer, primary_key=True, index=True),
     Column("master_id", Integer, ForeignKey("masters.id"), nullable=False),
     Column("service_id", Integer, ForeignKey("services.id"), nullable=False),
+    Index("ix_master_services_service_master", "service_id", "master_id"),
 )
 
 
@@ -24,10 +25,24 @@ class Master(Base):
     photo_url = Column(String, nullable=True)
     work_schedule = Column(JSON, nullable=True)  # JSON для индивидуального расписания мастера
     rating = Column(Numeric(3, 2), nullable=True, default=0)
-    reviews_count = Column(Integer, default=0)
+    reviews_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Агрегаты отзывов обновляются атомарным UPDATE при каждом отзыве (app/services/ratings.py)
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_1_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_2_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_3_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_4_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_5_count = Column(Integer, nullable=False, default=0, server_default="0")
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    services = relationship("Service", secondary=master_service_association, back_populates="masters")
+    # Порядок услуг фиксирован: от него зависят байты ответа и ETag каталога
+    services = relationship(
+        "Service", secondary=master_service_association, back_populates="masters", lazy="raise", order_by="Service.id"
+    )
     reviews = relationship("Review", back_populates="master")
+
+    @property
+    def rating_histogram(self):
+        return {star: getattr(self, f"rating_{star}_count") or 0 for star in range(1, 6)}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -9,6 +9,7 @@ class Notification(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    booking_id = Column(Integer, ForeignKey("bookings.id", ondelete="CASCADE"), nullable=True)
     type = Column(String, nullable=False)
     message = Column(String, nullable=False)
     sent_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -16,3 +17,8 @@ class Notification(Base):
 
     user = relationship("User", back_populates="notifications")
 
+    __table_args__ = (
+        # Одно уведомление каждого типа на запись: повторная вставка после рестарта ничего не делает
+        Index("uq_notifications_booking_type", booking_id, type, unique=True),
+    )
+
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -20,3 +20,7 @@ class Review(Base):
     user = relationship("User")
     booking = relationship("Booking")
 
+    __table_args__ = (
+        Index("ix_reviews_master_created", "master_id", "created_at", "id"),
+    )
+
@@ -18,5 +18,5 @@ class Service(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    masters = relationship("Master", secondary="master_services", back_populates="services")
+    masters = relationship("Master", secondary="master_services", back_populates="services", lazy="raise")
 
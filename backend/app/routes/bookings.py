@@ -1,104 +1,212 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import date, datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import Optional
+from datetime import datetime, timezone
 from app.database import get_db
-from app.schemas import BookingResponse, BookingCreate
-from app.models import Booking, User, Service, Master
+from app.middleware.auth import get_current_user
+from app.schemas import BookingResponse, BookingCreate, Page, SlotHoldCreate, SlotHoldResponse
+from app.models import Booking, User, Service, Master, Certificate
 from app.models.booking import BookingStatus
+from app.services.allocator import load_capacity, pick_master
+from app.services.holds import slot_holds
+from app.services.occupancy import load_busy_masks, occupancy_index
+from app.services.rows import booking_rows, booking_rows_query
+from app.services.slots import booking_interval, booking_period, fits_window, working_window
+from app.utils.db_errors import is_exclusion_violation, is_retryable
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, fetch_page
+from app.utils.responses import JSONResponse
+import asyncio
+import random
 
 router = APIRouter(prefix="/api/bookings", tags=["bookings"])
 
+BOOKING_INSERT_ATTEMPTS = 3
+BOOKING_RETRY_BACKOFF = 0.05
 
-def get_current_user(telegram_id: Optional[int] = Header(None, alias="X-Telegram-User-Id"), db: Session = Depends(get_db)) -> User:
-    if not telegram_id:
-        raise HTTPException(status_code=401, detail="Telegram user ID required")
-    
-    user = db.query(User).filter(User.telegram_id == telegram_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    return user
+
+BOOKING_LOAD_OPTIONS = (
+    selectinload(Booking.service),
+    selectinload(Booking.master).selectinload(Master.services),
+)
+
+
+async def load_booking(db: AsyncSession, booking_id: int, user_id: int) -> Optional[Booking]:
+    result = await db.execute(
+        select(Booking).options(*BOOKING_LOAD_OPTIONS).where(
+            Booking.id == booking_id,
+            Booking.user_id == user_id
+        ).execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
 
 
 @router.post("/", response_model=BookingResponse)
 async def create_booking(
     booking: BookingCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    service = db.query(Service).filter(Service.id == booking.service_id).first()
+    # rollback при проигранной гонке экспирит ORM-объекты, поэтому id пользователя берём заранее
+    user_id = current_user.id
+    
+    service = await db.get(Service, booking.service_id)
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
     
     if booking.master_id:
-        master = db.query(Master).filter(Master.id == booking.master_id).first()
+        master = await db.get(Master, booking.master_id)
         if not master:
             raise HTTPException(status_code=404, detail="Master not found")
     
     if booking.certificate_id:
-        from app.models import Certificate
-        certificate = db.query(Certificate).filter(
+        result = await db.execute(select(Certificate).where(
             Certificate.id == booking.certificate_id,
-            Certificate.user_id == current_user.id,
+            Certificate.user_id == user_id,
             Certificate.is_used == False
-        ).first()
+        ))
+        certificate = result.scalars().first()
         if not certificate:
             raise HTTPException(status_code=404, detail="Certificate not found or already used")
     
-    existing_booking = db.query(Booking).filter(
-        Booking.master_id == booking.master_id,
-        Booking.booking_date == booking.booking_date,
-        Booking.booking_time == booking.booking_time,
-        Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED])
-    ).first()
-    
-    if existing_booking:
-        raise HTTPException(status_code=400, detail="Time slot already booked")
-    
-    db_booking = Booking(
-        user_id=current_user.id,
-        service_id=booking.service_id,
-        master_id=booking.master_id,
-        booking_date=booking.booking_date,
-        booking_time=booking.booking_time,
-        comment=booking.comment,
-        certificate_id=booking.certificate_id,
-        status=BookingStatus.PENDING
-    )
+    try:
+        starts_at, ends_at = booking_period(booking.booking_date, booking.booking_time, service.duration_minutes)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid booking time")
+    
+    interval = booking_interval(starts_at, ends_at)
+    
+    if booking.master_id and not fits_window(working_window(master.work_schedule, booking.booking_date), interval):
+        raise HTTPException(status_code=400, detail="Booking time is outside the master's schedule")
+    
+    if booking.master_id and slot_holds.is_held_by_other(booking.master_id, booking.booking_date, interval, user_id):
+        raise HTTPException(status_code=409, detail="Time slot is temporarily held")
+    
+    # "Любой специалист": мастер назначается по загрузке дня, при проигранной гонке берём следующего
+    capacity = None
+    if not booking.master_id:
+        capacity = await load_capacity(db, booking.service_id, booking.booking_date, user_id)
+        if capacity and not any(fits_window(day.window, interval) for day in capacity):
+            raise HTTPException(status_code=400, detail="Booking time is outside the specialists' schedule")
+    tried = set()
+    
+    # Пересечения отсекает exclusion-констрейнт bookings_no_overlap прямо на INSERT,
+    # проигравшие в гонке за слот получают 409 без глобальных блокировок
+    for attempt in range(1, BOOKING_INSERT_ATTEMPTS + 1):
+        master_id = booking.master_id or pick_master(capacity, interval, skip=tried)
+        if master_id is None:
+            raise HTTPException(status_code=409, detail="No specialist is available at this time")
+        
+        db_booking = Booking(
+            user_id=user_id,
+            service_id=booking.service_id,
+            master_id=master_id,
+            booking_date=booking.booking_date,
+            booking_time=booking.booking_time,
+            starts_at=starts_at,
+            ends_at=ends_at,
+            comment=booking.comment,
+            certificate_id=booking.certificate_id,
+            status=BookingStatus.PENDING
+        )
+        db.add(db_booking)
+        try:
+            await db.commit()
+            break
+        except DBAPIError as e:
+            await db.rollback()
+            if is_exclusion_violation(e):
+                if booking.master_id:
+                    raise HTTPException(status_code=409, detail="Time slot already booked")
+                tried.add(master_id)
+                continue
+            if not is_retryable(e) or attempt == BOOKING_INSERT_ATTEMPTS:
+                raise
+            await asyncio.sleep(random.uniform(0, BOOKING_RETRY_BACKOFF * attempt))
+    else:
+        raise HTTPException(status_code=409, detail="Time slot already booked")
+    slot_holds.release_user(user_id)
+    if master_id:
+        occupancy_index.add_booking(master_id, booking.booking_date, db_booking.id, interval)
+    
+    return await load_booking(db, db_booking.id, user_id)
+
+
+@router.post("/holds", response_model=SlotHoldResponse)
+async def create_slot_hold(
+    hold: SlotHoldCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    service = await db.get(Service, hold.service_id)
+    if not service:
+        raise HTTPException(status_code=404, detail="Service not found")
+    
+    master = await db.get(Master, hold.master_id)
+    if not master:
+        raise HTTPException(status_code=404, detail="Master not found")
+    
+    try:
+        interval = booking_interval(*booking_period(hold.booking_date, hold.booking_time, service.duration_minutes))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid booking time")
+    
+    if not fits_window(working_window(master.work_schedule, hold.booking_date), interval):
+        raise HTTPException(status_code=400, detail="Booking time is outside the master's schedule")
     
-    db.add(db_booking)
-    db.commit()
-    db.refresh(db_booking)
+    span = (1 << (interval[1] - interval[0])) - 1
+    busy = await load_busy_masks(db, hold.booking_date, hold.booking_date, [hold.master_id])
+    if busy.get((hold.master_id, hold.booking_date), 0) & (span << interval[0]):
+        raise HTTPException(status_code=409, detail="Time slot already booked")
     
-    return db_booking
+    slot_hold = slot_holds.acquire(current_user.id, hold.master_id, hold.booking_date, interval)
+    if slot_hold is None:
+        raise HTTPException(status_code=409, detail="Time slot is temporarily held")
+    
+    return SlotHoldResponse(
+        id=slot_hold.id,
+        expires_at=datetime.fromtimestamp(slot_hold.expires_at, tz=timezone.utc),
+        **hold.model_dump()
+    )
 
 
-@router.get("/", response_model=List[BookingResponse])
+@router.delete("/holds/{hold_id}")
+async def release_slot_hold(
+    hold_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    if not slot_holds.release(hold_id, current_user.id):
+        raise HTTPException(status_code=404, detail="Hold not found")
+    
+    return {"ok": True}
+
+
+@router.get("/", response_model=Page[BookingResponse])
 async def get_bookings(
     current_user: User = Depends(get_current_user),
     status: Optional[BookingStatus] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db)
 ):
-    query = db.query(Booking).filter(Booking.user_id == current_user.id)
+    query = booking_rows_query().where(Booking.user_id == current_user.id)
     
     if status:
-        query = query.filter(Booking.status == status)
+        query = query.where(Booking.status == status)
     
-    bookings = query.order_by(Booking.booking_date.desc(), Booking.booking_time.desc()).all()
-    return bookings
+    page = await fetch_page(db, query, (Booking.booking_date, Booking.booking_time, Booking.id), cursor, limit, rows=True)
+    return JSONResponse({"items": await booking_rows(db, page["items"]), "next_cursor": page["next_cursor"]})
 
 
 @router.get("/{booking_id}", response_model=BookingResponse)
 async def get_booking(
     booking_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    booking = db.query(Booking).filter(
-        Booking.id == booking_id,
-        Booking.user_id == current_user.id
-    ).first()
+    booking = await load_booking(db, booking_id, current_user.id)
     
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
@@ -110,12 +218,9 @@ async def get_booking(
 async def cancel_booking(
     booking_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    booking = db.query(Booking).filter(
-        Booking.id == booking_id,
-        Booking.user_id == current_user.id
-    ).first()
+    booking = await load_booking(db, booking_id, current_user.id)
     
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
@@ -124,7 +229,9 @@ async def cancel_booking(
         raise HTTPException(status_code=400, detail="Cannot cancel completed or already cancelled booking")
     
     booking.status = BookingStatus.CANCELLED
-    db.commit()
-    db.refresh(booking)
+    await db.commit()
     
-    return booking
+    if booking.master_id:
+        occupancy_index.remove_booking(booking.master_id, booking.booking_date, booking.id)
+    
+    return await load_booking(db, booking_id, current_user.id)
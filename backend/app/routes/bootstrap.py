@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends, Request, Response
+from pydantic import TypeAdapter
+from typing import Optional
+from app.database import read_primary_requested
+from app.middleware.auth import get_optional_user
+from app.schemas import BootstrapResponse, UserResponse
+from app.models import User
+from app.services.catalog import categories_entry, promotions_entry, services_entry, settings_entry
+from app.services.catalog_cache import etag_matches, make_etag
+import asyncio
+import json
+
+router = APIRouter(prefix="/api/bootstrap", tags=["bootstrap"])
+
+USER = TypeAdapter(Optional[UserResponse])
+
+
+def _section(request: Request, name: str, etag: str, body: bytes) -> bytes:
+    # Секцию, etag которой клиент уже знает, отдаём без данных
+    if etag_matches(request, etag):
+        return b'"%s":{"etag":%s}' % (name.encode(), json.dumps(etag).encode())
+    return b'"%s":{"etag":%s,"data":%s}' % (name.encode(), json.dumps(etag).encode(), body)
+
+
+@router.get("/", response_model=BootstrapResponse)
+async def get_bootstrap(
+    request: Request,
+    refresh: bool = Depends(read_primary_requested),
+    current_user: Optional[User] = Depends(get_optional_user)
+):
+    # Всё, что нужно главному экрану mini-app, одним запросом: на мобильной сети каждый
+    # лишний запрос стоит TLS, прокси и зависимостей.
+    # Промах кэша открывает свою сессию, поэтому секции собираются параллельно
+    services, categories, promotions, salon_settings = await asyncio.gather(
+        services_entry(None, True, refresh),
+        categories_entry(refresh),
+        promotions_entry(True, refresh),
+        settings_entry(refresh)
+    )
+    
+    user_body = USER.dump_json(USER.validate_python(current_user, from_attributes=True))
+    sections = (
+        ("services", services.etag, services.body),
+        ("categories", categories.etag, categories.body),
+        ("promotions", promotions.etag, promotions.body),
+        ("settings", salon_settings.etag, salon_settings.body),
+        ("user", make_etag(user_body), user_body),
+    )
+    
+    etag = make_etag(",".join(section_etag for _, section_etag, _ in sections).encode())
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache" if current_user else "no-cache",
+        "Vary": "X-Telegram-Init-Data, X-Telegram-User-Id",
+    }
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    
+    body = b"{" + b",".join(_section(request, *section) for section in sections) + b"}"
+    return Response(content=body, media_type="application/json", headers=headers)
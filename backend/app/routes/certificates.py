@@ -1,49 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from app.database import get_db
-from app.schemas import CertificateResponse
+from app.middleware.auth import get_current_user
+from app.schemas import CertificateResponse, Page
 from app.models import Certificate, User
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, fetch_page
 
 router = APIRouter(prefix="/api/certificates", tags=["certificates"])
 
 
-def get_current_user(telegram_id: Optional[int] = Header(None, alias="X-Telegram-User-Id"), db: Session = Depends(get_db)) -> User:
-    if not telegram_id:
-        raise HTTPException(status_code=401, detail="Telegram user ID required")
-    
-    user = db.query(User).filter(User.telegram_id == telegram_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    return user
-
-
-@router.get("/", response_model=List[CertificateResponse])
+@router.get("/", response_model=Page[CertificateResponse])
 async def get_certificates(
     current_user: User = Depends(get_current_user),
     is_used: bool = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db)
 ):
-    query = db.query(Certificate).filter(Certificate.user_id == current_user.id)
+    query = select(Certificate).where(Certificate.user_id == current_user.id)
     
     if is_used is not None:
-        query = query.filter(Certificate.is_used == is_used)
+        query = query.where(Certificate.is_used == is_used)
     
-    certificates = query.order_by(Certificate.created_at.desc()).all()
-    return certificates
+    return await fetch_page(db, query, (Certificate.created_at, Certificate.id), cursor, limit)
 
 
 @router.get("/{certificate_id}", response_model=CertificateResponse)
 async def get_certificate(
     certificate_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    certificate = db.query(Certificate).filter(
+    result = await db.execute(select(Certificate).where(
         Certificate.id == certificate_id,
         Certificate.user_id == current_user.id
-    ).first()
+    ))
+    certificate = result.scalars().first()
     
     if not certificate:
         raise HTTPException(status_code=404, detail="Certificate not found")
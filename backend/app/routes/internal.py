@@ -0,0 +1,76 @@
+import hmac
+
+from fastapi import APIRouter, Depends, HTTPException, Header
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.config import settings
+from app.database import get_db, pool_status
+from app.services.catalog_cache import catalog_cache
+from app.services.frontend_proxy import proxy_status
+from app.services.jobs import job_queue
+from app.services.occupancy import occupancy_index
+from app.services.ratings import recompute_master_ratings
+from app.services.reminders import reminder_scheduler
+from app.services.telegram_dispatcher import telegram_dispatcher
+from app.services.update_queue import update_queue
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+def verify_internal_token(token: Optional[str] = Header(None, alias="X-Internal-Token")):
+    # Без настроенного токена /internal закрыт целиком: снаружи он выглядит как несуществующий путь
+    if not settings.internal_api_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if token is None or not hmac.compare_digest(token.encode(), settings.internal_api_token.encode()):
+        raise HTTPException(status_code=403, detail="Invalid internal token")
+
+
+@router.get("/db-pool", dependencies=[Depends(verify_internal_token)])
+async def get_db_pool_stats():
+    return pool_status()
+
+
+@router.get("/occupancy-cache", dependencies=[Depends(verify_internal_token)])
+async def get_occupancy_cache_stats():
+    return occupancy_index.stats()
+
+
+@router.get("/catalog-cache", dependencies=[Depends(verify_internal_token)])
+async def get_catalog_cache_stats():
+    return catalog_cache.stats()
+
+
+@router.get("/update-queue", dependencies=[Depends(verify_internal_token)])
+async def get_update_queue_stats():
+    return update_queue.stats()
+
+
+@router.get("/telegram-dispatcher", dependencies=[Depends(verify_internal_token)])
+async def get_telegram_dispatcher_stats():
+    return telegram_dispatcher.stats()
+
+
+@router.get("/reminders", dependencies=[Depends(verify_internal_token)])
+async def get_reminder_stats():
+    return reminder_scheduler.stats()
+
+
+@router.get("/jobs", dependencies=[Depends(verify_internal_token)])
+async def get_job_queue_stats():
+    return {**job_queue.stats(), "queue": await job_queue.counts()}
+
+
+@router.get("/frontend-proxy", dependencies=[Depends(verify_internal_token)])
+async def get_frontend_proxy_stats():
+    return proxy_status()
+
+
+@router.post("/catalog-cache/clear", dependencies=[Depends(verify_internal_token)])
+async def clear_catalog_cache():
+    catalog_cache.clear()
+    return {"ok": True}
+
+
+@router.post("/ratings/recompute", dependencies=[Depends(verify_internal_token)])
+async def recompute_ratings(master_id: Optional[int] = None, db: AsyncSession = Depends(get_db)):
+    return {"repaired": await recompute_master_ratings(db, master_id)}
@@ -1,39 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import List, Optional
-from datetime import date, datetime, timedelta
-from app.database import get_db
-from app.schemas import MasterResponse, AvailableTimeSlot, AvailableSlotsResponse
-from app.models import Master, Service, Booking, master_service_association
-from app.models.booking import BookingStatus
-from sqlalchemy import and_, or_
+from datetime import date, timedelta
+from app.database import get_read_db, read_primary_requested
+from app.schemas import MasterResponse, AvailableSlotsResponse, AvailabilityCalendarResponse
+from app.models import Master, Service, master_service_association
+from app.services.allocator import load_service_masters, master_days
+from app.services.catalog_cache import catalog_cache, catalog_response
+from app.services.occupancy import load_busy_masks
+from app.services.rows import master_rows, master_rows_query
+from app.services.slots import build_slots, count_free_slots, merge_free_slots
+from app.utils.responses import JSONResponse, dumps
 
 router = APIRouter(prefix="/api/masters", tags=["masters"])
 
+MAX_CALENDAR_DAYS = 42
+
 
 @router.get("/", response_model=List[MasterResponse])
 async def get_masters(
+    request: Request,
     service_id: Optional[int] = None,
     is_active: bool = True,
-    db: Session = Depends(get_db)
+    refresh: bool = Depends(read_primary_requested)
 ):
-    query = db.query(Master)
-    
-    if is_active:
-        query = query.filter(Master.is_active == True)
-    
-    if service_id:
-        query = query.join(master_service_association).filter(
-            master_service_association.c.service_id == service_id
-        )
+    async def load(db: AsyncSession):
+        query = master_rows_query()
+        
+        if is_active:
+            query = query.where(Master.is_active == True)
+        
+        if service_id:
+            query = query.join(master_service_association).where(
+                master_service_association.c.service_id == service_id
+            )
+        
+        result = await db.execute(query)
+        return dumps(await master_rows(db, result.all()))
     
-    masters = query.all()
-    return masters
+    entry = await catalog_cache.get_or_load(
+        ("masters", service_id, is_active), ("masters", "master_services", "services"), load, refresh=refresh
+    )
+    return catalog_response(request, entry)
 
 
 @router.get("/{master_id}", response_model=MasterResponse)
-async def get_master(master_id: int, db: Session = Depends(get_db)):
-    master = db.query(Master).filter(Master.id == master_id).first()
+async def get_master(master_id: int, db: AsyncSession = Depends(get_read_db)):
+    master = await db.get(Master, master_id, options=[selectinload(Master.services)])
     if not master:
         raise HTTPException(status_code=404, detail="Master not found")
     return master
@@ -44,55 +58,21 @@ async def get_available_slots(
     master_id: int,
     booking_date: date,
     service_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    master = db.query(Master).filter(Master.id == master_id).first()
+    master = await db.get(Master, master_id)
     if not master:
         raise HTTPException(status_code=404, detail="Master not found")
     
-    service = db.query(Service).filter(Service.id == service_id).first()
+    service = await db.get(Service, service_id)
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
     
-    existing_bookings = db.query(Booking).filter(
-        and_(
-            Booking.master_id == master_id,
-            Booking.booking_date == booking_date,
-            Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED])
-        )
-    ).all()
-    
-    booked_times = {booking.booking_time for booking in existing_bookings}
-    
-    work_schedule = master.work_schedule or {}
-    day_name = booking_date.strftime("%A").lower()
-    day_schedule = work_schedule.get(day_name, {})
+    busy = await load_busy_masks(db, booking_date, booking_date, [master_id])
     
-    start_time = day_schedule.get("start", "09:00")
-    end_time = day_schedule.get("end", "18:00")
+    slots = build_slots(master_days([master], booking_date, busy), service.duration_minutes)
     
-    slots = []
-    start = datetime.strptime(start_time, "%H:%M").time()
-    end = datetime.strptime(end_time, "%H:%M").time()
-    duration = timedelta(minutes=service.duration_minutes)
-    
-    current = datetime.combine(booking_date, start)
-    end_datetime = datetime.combine(booking_date, end)
-    
-    while current + duration <= end_datetime:
-        time_str = current.time().strftime("%H:%M")
-        is_available = time_str not in booked_times
-        
-        slots.append(AvailableTimeSlot(
-            time=time_str,
-            available=is_available,
-            master_id=master_id,
-            master_name=master.name
-        ))
-        
-        current += timedelta(minutes=30)
-    
-    return AvailableSlotsResponse(date=booking_date, slots=slots)
+    return JSONResponse({"date": booking_date.isoformat(), "slots": slots})
 
 
 @router.get("/service/{service_id}/available-slots", response_model=AvailableSlotsResponse)
@@ -100,69 +80,76 @@ async def get_available_slots_for_service(
     service_id: int,
     booking_date: date,
     master_id: Optional[int] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    service = db.query(Service).filter(Service.id == service_id).first()
+    service = await db.get(Service, service_id)
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
     
+    masters = await load_service_masters(db, service_id, master_id)
+    
+    if not masters:
+        return JSONResponse({"date": booking_date.isoformat(), "slots": []})
+    
+    busy = await load_busy_masks(db, booking_date, booking_date, [master.id for master in masters])
+    day_masters = master_days(masters, booking_date, busy)
+    
     if master_id:
-        masters = [db.query(Master).filter(Master.id == master_id).first()]
+        slots = build_slots(day_masters, service.duration_minutes)
     else:
-        masters = db.query(Master).join(master_service_association).filter(
-            master_service_association.c.service_id == service_id,
-            Master.is_active == True
-        ).all()
+        slots = merge_free_slots(day_masters, service.duration_minutes)
     
-    if not masters:
-        return AvailableSlotsResponse(date=booking_date, slots=[])
+    return JSONResponse({"date": booking_date.isoformat(), "slots": slots})
+
+
+@router.get("/service/{service_id}/calendar", response_model=AvailabilityCalendarResponse)
+async def get_availability_calendar(
+    service_id: int,
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    master_id: Optional[int] = None,
+    include_slots: bool = False,
+    db: AsyncSession = Depends(get_read_db)
+):
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="'to' must not be earlier than 'from'")
     
-    existing_bookings = db.query(Booking).filter(
-        and_(
-            Booking.booking_date == booking_date,
-            Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED])
-        )
-    ).all()
+    days_count = (date_to - date_from).days + 1
+    if days_count > MAX_CALENDAR_DAYS:
+        raise HTTPException(status_code=400, detail=f"Calendar window is limited to {MAX_CALENDAR_DAYS} days")
     
-    booked_slots = {}
-    for booking in existing_bookings:
-        if booking.master_id:
-            if booking.master_id not in booked_slots:
-                booked_slots[booking.master_id] = set()
-            booked_slots[booking.master_id].add(booking.booking_time)
+    service = await db.get(Service, service_id)
+    if not service:
+        raise HTTPException(status_code=404, detail="Service not found")
     
-    all_slots = []
+    masters = await load_service_masters(db, service_id, master_id)
+    busy = await load_busy_masks(db, date_from, date_to, [master.id for master in masters]) if masters else {}
     
-    for master in masters:
-        work_schedule = master.work_schedule or {}
-        day_name = booking_date.strftime("%A").lower()
-        day_schedule = work_schedule.get(day_name, {})
-        
-        start_time = day_schedule.get("start", "09:00")
-        end_time = day_schedule.get("end", "18:00")
+    days = []
+    for offset in range(days_count):
+        day = date_from + timedelta(days=offset)
+        day_masters = master_days(masters, day, busy)
         
-        start = datetime.strptime(start_time, "%H:%M").time()
-        end = datetime.strptime(end_time, "%H:%M").time()
-        duration = timedelta(minutes=service.duration_minutes)
+        if master_id and not include_slots:
+            days.append({
+                "date": day.isoformat(),
+                "free_slots": count_free_slots(day_masters, service.duration_minutes)
+            })
+            continue
         
-        current = datetime.combine(booking_date, start)
-        end_datetime = datetime.combine(booking_date, end)
+        if master_id:
+            slots = build_slots(day_masters, service.duration_minutes)
+        else:
+            slots = merge_free_slots(day_masters, service.duration_minutes)
         
-        master_booked = booked_slots.get(master.id, set())
-        
-        while current + duration <= end_datetime:
-            time_str = current.time().strftime("%H:%M")
-            is_available = time_str not in master_booked
-            
-            all_slots.append(AvailableTimeSlot(
-                time=time_str,
-                available=is_available,
-                master_id=master.id,
-                master_name=master.name
-            ))
-            
-            current += timedelta(minutes=30)
-    
-    all_slots.sort(key=lambda x: x.time)
-    
-    return AvailableSlotsResponse(date=booking_date, slots=all_slots)
+        calendar_day = {"date": day.isoformat(), "free_slots": sum(slot["available"] for slot in slots)}
+        if include_slots:
+            calendar_day["slots"] = slots
+        days.append(calendar_day)
+    
+    return JSONResponse({
+        "service_id": service_id,
+        "from": date_from.isoformat(),
+        "to": date_to.isoformat(),
+        "days": days
+    })
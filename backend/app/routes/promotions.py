@@ -1,36 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from datetime import datetime
-from app.database import get_db
+from app.database import get_read_db, read_primary_requested
 from app.schemas import PromotionResponse
 from app.models import Promotion
+from app.services.catalog import promotions_entry
+from app.services.catalog_cache import catalog_response
 
 router = APIRouter(prefix="/api/promotions", tags=["promotions"])
 
 
 @router.get("/", response_model=List[PromotionResponse])
 async def get_promotions(
+    request: Request,
     active_only: bool = True,
-    db: Session = Depends(get_db)
+    refresh: bool = Depends(read_primary_requested)
 ):
-    query = db.query(Promotion)
-    
-    if active_only:
-        now = datetime.utcnow()
-        query = query.filter(
-            Promotion.is_active == True,
-            Promotion.start_date <= now,
-            Promotion.end_date >= now
-        )
-    
-    promotions = query.order_by(Promotion.start_date.desc()).all()
-    return promotions
+    return catalog_response(request, await promotions_entry(active_only, refresh))
 
 
 @router.get("/{promotion_id}", response_model=PromotionResponse)
-async def get_promotion(promotion_id: int, db: Session = Depends(get_db)):
-    promotion = db.query(Promotion).filter(Promotion.id == promotion_id).first()
+async def get_promotion(promotion_id: int, db: AsyncSession = Depends(get_read_db)):
+    promotion = await db.get(Promotion, promotion_id)
     if not promotion:
         raise HTTPException(status_code=404, detail="Promotion not found")
     return promotion
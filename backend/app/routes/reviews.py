@@ -1,48 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from app.database import get_db
-from app.schemas import ReviewResponse, ReviewCreate
+from app.middleware.auth import get_current_user
+from app.schemas import Page, ReviewResponse, ReviewCreate
 from app.models import Review, User, Master, Booking
+from app.services.ratings import apply_review_rating
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, fetch_page
 
 router = APIRouter(prefix="/api/reviews", tags=["reviews"])
 
 
-def get_current_user(telegram_id: Optional[int] = Header(None, alias="X-Telegram-User-Id"), db: Session = Depends(get_db)) -> User:
-    if not telegram_id:
-        raise HTTPException(status_code=401, detail="Telegram user ID required")
-    
-    user = db.query(User).filter(User.telegram_id == telegram_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    return user
-
-
 @router.post("/", response_model=ReviewResponse)
 async def create_review(
     review: ReviewCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    master = db.query(Master).filter(Master.id == review.master_id).first()
+    master = await db.get(Master, review.master_id)
     if not master:
         raise HTTPException(status_code=404, detail="Master not found")
     
     if review.booking_id:
-        booking = db.query(Booking).filter(
+        result = await db.execute(select(Booking).where(
             Booking.id == review.booking_id,
             Booking.user_id == current_user.id,
             Booking.master_id == review.master_id
-        ).first()
+        ))
+        booking = result.scalars().first()
         if not booking:
             raise HTTPException(status_code=404, detail="Booking not found")
     
-    existing_review = db.query(Review).filter(
+    result = await db.execute(select(Review).where(
         Review.user_id == current_user.id,
         Review.master_id == review.master_id,
         Review.booking_id == review.booking_id
-    ).first()
+    ))
+    existing_review = result.scalars().first()
     
     if existing_review:
         raise HTTPException(status_code=400, detail="Review already exists for this booking")
@@ -56,27 +51,24 @@ async def create_review(
     )
     
     db.add(db_review)
+    await apply_review_rating(db, review.master_id, review.rating)
     
-    reviews = db.query(Review).filter(Review.master_id == review.master_id).all()
-    total_rating = sum(r.rating for r in reviews) + review.rating
-    count = len(reviews) + 1
-    master.rating = total_rating / count
-    master.reviews_count = count
-    
-    db.commit()
-    db.refresh(db_review)
+    await db.commit()
+    await db.refresh(db_review)
     
     return db_review
 
 
-@router.get("/master/{master_id}", response_model=List[ReviewResponse])
-async def get_master_reviews(master_id: int, db: Session = Depends(get_db)):
-    master = db.query(Master).filter(Master.id == master_id).first()
+@router.get("/master/{master_id}", response_model=Page[ReviewResponse])
+async def get_master_reviews(
+    master_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db)
+):
+    master = await db.get(Master, master_id)
     if not master:
         raise HTTPException(status_code=404, detail="Master not found")
     
-    reviews = db.query(Review).filter(Review.master_id == master_id).order_by(
-        Review.created_at.desc()
-    ).all()
-    
-    return reviews
+    query = select(Review).where(Review.master_id == master_id)
+    return await fetch_page(db, query, (Review.created_at, Review.id), cursor, limit)
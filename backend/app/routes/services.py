@@ -1,43 +1,59 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.database import get_db
-from app.schemas import ServiceResponse
+from app.database import get_read_db, read_primary_requested
+from app.schemas import ServiceResponse, NextAvailableSlot
 from app.models import Service
+from app.services.allocator import find_next_available
+from app.services.catalog import categories_entry, services_entry
+from app.services.catalog_cache import catalog_response
+from app.services.slots import TIME_LABELS
+from app.utils.responses import JSONResponse
+from app.utils.salon_time import salon_now
 
 router = APIRouter(prefix="/api/services", tags=["services"])
 
+NEXT_AVAILABLE_HORIZON_DAYS = 42
+
 
 @router.get("/", response_model=List[ServiceResponse])
 async def get_services(
+    request: Request,
     category: str = None,
     is_active: bool = True,
-    db: Session = Depends(get_db)
+    refresh: bool = Depends(read_primary_requested)
 ):
-    query = db.query(Service)
-    
-    if is_active:
-        query = query.filter(Service.is_active == True)
-    
-    if category:
-        query = query.filter(Service.category == category)
-    
-    services = query.all()
-    return services
+    return catalog_response(request, await services_entry(category, is_active, refresh))
 
 
 @router.get("/{service_id}", response_model=ServiceResponse)
-async def get_service(service_id: int, db: Session = Depends(get_db)):
-    service = db.query(Service).filter(Service.id == service_id).first()
+async def get_service(service_id: int, db: AsyncSession = Depends(get_read_db)):
+    service = await db.get(Service, service_id)
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
     return service
 
 
 @router.get("/categories/list", response_model=List[str])
-async def get_categories(db: Session = Depends(get_db)):
-    categories = db.query(Service.category).distinct().filter(
-        Service.category.isnot(None),
-        Service.is_active == True
-    ).all()
-    return [cat[0] for cat in categories if cat[0]]
+async def get_categories(request: Request, refresh: bool = Depends(read_primary_requested)):
+    return catalog_response(request, await categories_entry(refresh))
+
+
+@router.get("/{service_id}/next-available", response_model=List[NextAvailableSlot])
+async def get_next_available(
+    service_id: int,
+    limit: int = Query(5, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db)
+):
+    service = await db.get(Service, service_id)
+    if not service:
+        raise HTTPException(status_code=404, detail="Service not found")
+    
+    slots = await find_next_available(
+        db, service.id, service.duration_minutes, limit, salon_now(), NEXT_AVAILABLE_HORIZON_DAYS
+    )
+    
+    return JSONResponse([
+        {"date": day.isoformat(), "time": TIME_LABELS[minute], "master_id": master_id, "master_name": master_name}
+        for day, minute, master_id, master_name in slots
+    ])
@@ -1,19 +1,12 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi import APIRouter, Depends, Request
+from app.database import read_primary_requested
 from app.schemas import SalonSettingsResponse
-from app.models import SalonSettings
+from app.services.catalog import settings_entry
+from app.services.catalog_cache import catalog_response
 
 router = APIRouter(prefix="/api/settings", tags=["settings"])
 
 
 @router.get("/", response_model=SalonSettingsResponse)
-async def get_settings(db: Session = Depends(get_db)):
-    settings = db.query(SalonSettings).first()
-    if not settings:
-        default_settings = SalonSettings()
-        db.add(default_settings)
-        db.commit()
-        db.refresh(default_settings)
-        return default_settings
-    return settings
+async def get_settings(request: Request, refresh: bool = Depends(read_primary_requested)):
+    return catalog_response(request, await settings_entry(refresh))
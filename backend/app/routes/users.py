@@ -1,24 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy.orm import Session
-from typing import Optional
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
+from app.middleware.auth import get_current_user, invalidate_user
 from app.schemas import UserResponse, UserUpdate
 from app.models import User
 
 router = APIRouter(prefix="/api/users", tags=["users"])
 
 
-def get_current_user(telegram_id: Optional[int] = Header(None, alias="X-Telegram-User-Id"), db: Session = Depends(get_db)) -> User:
-    if not telegram_id:
-        raise HTTPException(status_code=401, detail="Telegram user ID required")
-    
-    user = db.query(User).filter(User.telegram_id == telegram_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    return user
-
-
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_profile(
     current_user: User = Depends(get_current_user)
@@ -30,8 +19,11 @@ async def get_current_user_profile(
 async def update_current_user_profile(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
+    # current_user собран из кэша и не привязан к сессии: подключаем без повторного SELECT
+    current_user = await db.merge(current_user, load=False)
+    
     if user_update.phone is not None:
         current_user.phone = user_update.phone
     if user_update.email is not None:
@@ -41,7 +33,8 @@ async def update_current_user_profile(
     if user_update.last_name is not None:
         current_user.last_name = user_update.last_name
     
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    invalidate_user(current_user.telegram_id)
+    await db.refresh(current_user)
     
     return current_user
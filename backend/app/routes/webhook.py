@@ -6,6 +6,7 @@ import os
 import logging
 import json
 from urllib.parse import unquote
+from app.services.update_queue import FULL, update_queue
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +40,15 @@ async def create_bot_application():
     return application
 
 
+def update_chat_key(update: Update):
+    # Порядок важен внутри одного чата; апдейты без чата и пользователя независимы
+    if update.effective_chat:
+        return update.effective_chat.id
+    if update.effective_user:
+        return ("user", update.effective_user.id)
+    return ("update", update.update_id)
+
+
 def set_bot_application(app: Application):
     global bot_application
     bot_application = app
@@ -60,13 +70,18 @@ async def webhook_endpoint(
     if not bot_application:
         raise HTTPException(status_code=503, detail="Bot application not initialized")
     
+    # Telegram ждёт ответа на каждый апдейт и при задержке шлёт его повторно:
+    # здесь только проверяем и ставим в очередь, обработчики бота работают в фоне
     try:
-        body = await request.body()
-        data = json.loads(body)
-        update = Update.de_json(data, bot_application.bot)
-        await bot_application.process_update(update)
-        return {"ok": True}
+        update = Update.de_json(json.loads(await request.body()), bot_application.bot)
     except Exception as e:
-        logger.error(f"Error processing webhook update: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
-
+        logger.warning(f"Invalid webhook update: {e}")
+        raise HTTPException(status_code=400, detail="Invalid update")
+    
+    if update is None:
+        raise HTTPException(status_code=400, detail="Invalid update")
+    
+    if update_queue.put(update.update_id, update_chat_key(update), update) == FULL:
+        raise HTTPException(status_code=503, detail="Update queue is full", headers={"Retry-After": "1"})
+    
+    return {"ok": True}
@@ -1,10 +1,24 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Dict, Generic, Optional, List, TypeVar
 from datetime import datetime, date, time
 from decimal import Decimal
 from app.models.booking import BookingStatus
 
 
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+class BootstrapSection(BaseModel, Generic[T]):
+    # data не приходит, если etag секции совпал с переданным в If-None-Match
+    etag: str
+    data: Optional[T] = None
+
+
 class ServiceBase(BaseModel):
     name: str
     category: Optional[str] = None
@@ -46,6 +60,7 @@ class MasterResponse(MasterBase):
     id: int
     rating: Optional[Decimal] = None
     reviews_count: int = 0
+    rating_histogram: Dict[int, int] = {}
     services: List[ServiceResponse] = []
     created_at: datetime
     updated_at: Optional[datetime] = None
@@ -58,6 +73,11 @@ class MasterWithServices(MasterResponse):
     available_services: List[ServiceResponse] = []
 
 
+# Начало записи — HH:MM в пределах суток, иначе «24:30» уехало бы на следующий день.
+# Проверяется только на входе: BookingResponse читает уже сохранённые записи
+BOOKING_TIME_PATTERN = r"^([01]\d|2[0-3]):[0-5]\d$"
+
+
 class BookingBase(BaseModel):
     service_id: int
     master_id: Optional[int] = None
@@ -68,7 +88,7 @@ class BookingBase(BaseModel):
 
 
 class BookingCreate(BookingBase):
-    pass
+    booking_time: str = Field(..., pattern=BOOKING_TIME_PATTERN)
 
 
 class BookingResponse(BookingBase):
@@ -84,6 +104,18 @@ class BookingResponse(BookingBase):
         from_attributes = True
 
 
+class SlotHoldCreate(BaseModel):
+    service_id: int
+    master_id: int
+    booking_date: date
+    booking_time: str = Field(..., pattern=BOOKING_TIME_PATTERN)
+
+
+class SlotHoldResponse(SlotHoldCreate):
+    id: str
+    expires_at: datetime
+
+
 class CertificateBase(BaseModel):
     code: str
     amount: Decimal
@@ -190,3 +222,31 @@ class AvailableTimeSlot(BaseModel):
 class AvailableSlotsResponse(BaseModel):
     date: date
     slots: List[AvailableTimeSlot]
+
+
+class CalendarDay(BaseModel):
+    date: date
+    free_slots: int
+    slots: Optional[List[AvailableTimeSlot]] = None
+
+
+class AvailabilityCalendarResponse(BaseModel):
+    service_id: int
+    date_from: date = Field(..., alias="from")
+    date_to: date = Field(..., alias="to")
+    days: List[CalendarDay]
+
+
+class NextAvailableSlot(BaseModel):
+    date: date
+    time: str
+    master_id: int
+    master_name: Optional[str] = None
+
+
+class BootstrapResponse(BaseModel):
+    services: BootstrapSection[List[ServiceResponse]]
+    categories: BootstrapSection[List[str]]
+    promotions: BootstrapSection[List[PromotionResponse]]
+    settings: BootstrapSection[SalonSettingsResponse]
+    user: BootstrapSection[Optional[UserResponse]]
@@ -0,0 +1,115 @@
+import heapq
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Collection, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Master, master_service_association
+from app.services.holds import slot_holds
+from app.services.occupancy import load_busy_masks
+from app.services.slots import MasterDay, fits_window, free_starts, working_window
+
+
+async def load_service_masters(db: AsyncSession, service_id: int, master_id: Optional[int] = None):
+    query = select(Master.id, Master.name, Master.work_schedule)
+    if master_id:
+        query = query.where(Master.id == master_id)
+    else:
+        query = query.join(master_service_association).where(
+            master_service_association.c.service_id == service_id,
+            Master.is_active == True
+        )
+
+    result = await db.execute(query)
+    return result.all()
+
+
+def master_days(
+    masters,
+    day: date,
+    busy: Dict[Tuple[int, date], int],
+    user_id: Optional[int] = None
+) -> List[MasterDay]:
+    return [
+        MasterDay(
+            master.id,
+            master.name,
+            working_window(master.work_schedule, day),
+            busy.get((master.id, day), 0) | slot_holds.mask(master.id, day, exclude_user_id=user_id)
+        )
+        for master in masters
+    ]
+
+
+async def load_capacity(db: AsyncSession, service_id: int, day: date, user_id: Optional[int] = None) -> List[MasterDay]:
+    masters = await load_service_masters(db, service_id)
+    if not masters:
+        return []
+
+    busy = await load_busy_masks(db, day, day, [master.id for master in masters])
+    return master_days(masters, day, busy, user_id)
+
+
+def _fits(day: MasterDay, interval: Tuple[int, int]) -> bool:
+    start, end = interval
+    span = ((1 << (end - start)) - 1) << start
+    return fits_window(day.window, interval) and not day.busy & span
+
+
+def pick_master(
+    days: Sequence[MasterDay],
+    interval: Tuple[int, int],
+    skip: Collection[int] = ()
+) -> Optional[int]:
+    # Балансировка нагрузки: из свободных мастеров берём того, у кого меньше всего занятых минут за день
+    best = None
+    for day in days:
+        if day.master_id in skip or not _fits(day, interval):
+            continue
+        load = day.busy.bit_count()
+        if best is None or load < best[0]:
+            best = (load, day.master_id)
+    return best[1] if best else None
+
+
+def iter_free_starts(
+    master,
+    date_from: date,
+    days_count: int,
+    busy: Dict[Tuple[int, date], int],
+    duration: int,
+    earliest_minute: int = 0
+) -> Iterator[Tuple[date, int, int, Optional[str]]]:
+    # Лениво, день за днём: следующий день считается только когда поток до него дошёл
+    for offset in range(days_count):
+        day = date_from + timedelta(days=offset)
+        master_day = master_days([master], day, busy)[0]
+        window_start, window_end = master_day.window
+        window_mask = ((1 << max(window_end - window_start, 0)) - 1) << window_start
+        if master_day.busy & window_mask == window_mask:
+            continue
+        for minute, available in free_starts(master_day.window, master_day.busy, duration):
+            if available and (offset or minute >= earliest_minute):
+                yield day, minute, master.id, master.name
+
+
+async def find_next_available(
+    db: AsyncSession,
+    service_id: int,
+    duration: int,
+    limit: int,
+    now: datetime,
+    horizon_days: int
+) -> List[Tuple[date, int, int, Optional[str]]]:
+    masters = await load_service_masters(db, service_id)
+    if not masters:
+        return []
+
+    today = now.date()
+    busy = await load_busy_masks(db, today, today + timedelta(days=horizon_days - 1), [master.id for master in masters])
+    earliest_minute = now.hour * 60 + now.minute + 1
+
+    streams = [iter_free_starts(master, today, horizon_days, busy, duration, earliest_minute) for master in masters]
+    return list(islice(heapq.merge(*streams), limit))
@@ -0,0 +1,80 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Promotion, SalonSettings, Service
+from app.schemas import PromotionResponse, SalonSettingsResponse, ServiceResponse
+from app.services.catalog_cache import CatalogEntry, catalog_cache, serialize
+
+SERVICE_LIST = TypeAdapter(List[ServiceResponse])
+CATEGORY_LIST = TypeAdapter(List[str])
+PROMOTION_LIST = TypeAdapter(List[PromotionResponse])
+SALON_SETTINGS = TypeAdapter(SalonSettingsResponse)
+
+# Активность акций зависит от текущего времени, поэтому список живёт в кэше недолго
+ACTIVE_PROMOTIONS_TTL_SECONDS = 60
+
+
+async def services_entry(category: Optional[str] = None, is_active: bool = True, refresh: bool = False) -> CatalogEntry:
+    async def load(db: AsyncSession):
+        query = select(Service)
+        
+        if is_active:
+            query = query.where(Service.is_active == True)
+        
+        if category:
+            query = query.where(Service.category == category)
+        
+        result = await db.execute(query)
+        return serialize(SERVICE_LIST, result.scalars().all())
+    
+    return await catalog_cache.get_or_load(("services", category, is_active), ("services",), load, refresh=refresh)
+
+
+async def categories_entry(refresh: bool = False) -> CatalogEntry:
+    async def load(db: AsyncSession):
+        result = await db.execute(select(Service.category).distinct().where(
+            Service.category.isnot(None),
+            Service.is_active == True
+        ))
+        return serialize(CATEGORY_LIST, [cat[0] for cat in result.all() if cat[0]])
+    
+    return await catalog_cache.get_or_load(("categories",), ("services",), load, refresh=refresh)
+
+
+async def promotions_entry(active_only: bool = True, refresh: bool = False) -> CatalogEntry:
+    async def load(db: AsyncSession):
+        query = select(Promotion)
+        
+        if active_only:
+            now = datetime.utcnow()
+            query = query.where(
+                Promotion.is_active == True,
+                Promotion.start_date <= now,
+                Promotion.end_date >= now
+            )
+        
+        result = await db.execute(query.order_by(Promotion.start_date.desc()))
+        return serialize(PROMOTION_LIST, result.scalars().all())
+    
+    return await catalog_cache.get_or_load(
+        ("promotions", active_only), ("promotions",), load,
+        ttl_seconds=ACTIVE_PROMOTIONS_TTL_SECONDS if active_only else None, refresh=refresh
+    )
+
+
+async def settings_entry(refresh: bool = False) -> CatalogEntry:
+    async def load(db: AsyncSession):
+        result = await db.execute(select(SalonSettings).limit(1))
+        settings = result.scalars().first()
+        if not settings:
+            settings = SalonSettings()
+            db.add(settings)
+            await db.commit()
+            await db.refresh(settings)
+        return serialize(SALON_SETTINGS, settings)
+    
+    return await catalog_cache.get_or_load(("settings",), ("salon_settings",), load, refresh=refresh)
@@ -0,0 +1,162 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, NamedTuple, Optional, Tuple
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+
+CATALOG_TABLES = frozenset({"services", "masters", "master_services", "promotions", "salon_settings"})
+
+
+def make_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+class CatalogEntry(NamedTuple):
+    versions: Tuple[int, ...]
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+class CatalogCache:
+    # Готовые JSON-байты каталога + версия на каждую таблицу. Запись в таблицу увеличивает её версию,
+    # записи, собранные на старой версии, при следующем чтении пересобираются.
+    # TTL страхует от правок мимо приложения и от других процессов (версии живут в памяти процесса).
+    # Промах читает основную БД, а не реплику: иначе отставшая реплика попала бы в кэш под новой версией
+    # и отдавалась бы до конца TTL. refresh (X-Read-Primary) собирает ответ из основной БД только для этого
+    # запроса: заголовок шлёт любой клиент, и общая запись от него не пересобирается.
+    # Ключи приходят из параметров запроса (?category=...), поэтому записей не больше max_entries:
+    # при переполнении уходят истёкшие, затем давно не читанные
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evicted = 0
+        self._versions: Dict[str, int] = {}
+        self._entries: "OrderedDict[Hashable, CatalogEntry]" = OrderedDict()
+
+    def versions(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        return tuple(self._versions.get(table, 0) for table in tables)
+
+    def bump(self, *tables: str):
+        for table in tables:
+            self._versions[table] = self._versions.get(table, 0) + 1
+
+    def clear(self):
+        self._entries.clear()
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        tables: Tuple[str, ...],
+        load: Callable[[AsyncSession], Awaitable[bytes]],
+        ttl_seconds: Optional[float] = None,
+        refresh: bool = False
+    ) -> CatalogEntry:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if refresh:
+            self.bypassed += 1
+            async with SessionLocal() as db:
+                body = await load(db)
+            return CatalogEntry(self.versions(tables), body, make_etag(body), time.monotonic() + ttl)
+        
+        versions = self.versions(tables)
+        entry = self._entries.get(key)
+        if entry is not None and entry.versions == versions and entry.expires_at > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        
+        self.misses += 1
+        async with SessionLocal() as db:
+            body = await load(db)
+        # Версии фиксируем до загрузки: если таблицу изменили во время запроса, запись сразу устареет
+        entry = CatalogEntry(versions, body, make_etag(body), time.monotonic() + ttl)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._evict()
+        return entry
+
+    def _evict(self):
+        now = time.monotonic()
+        for key in [key for key, entry in self._entries.items() if entry.expires_at <= now]:
+            del self._entries[key]
+            self.evicted += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evicted += 1
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "evicted": self.evicted,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "versions": dict(self._versions),
+        }
+
+
+catalog_cache = CatalogCache(ttl_seconds=settings.catalog_cache_ttl_seconds, max_entries=settings.catalog_cache_size)
+
+
+def serialize(adapter: TypeAdapter, data: Any) -> bytes:
+    return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return any(tag.strip() in (etag, "*") for tag in header.split(","))
+
+
+def catalog_response(request: Request, entry: CatalogEntry) -> Response:
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def _mark_written(session: Session, table: Optional[str]):
+    if table in CATALOG_TABLES:
+        session.info.setdefault("catalog_written", set()).add(table)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__table__", None)
+        _mark_written(session, table.name if table is not None else None)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_statement(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        _mark_written(orm_execute_state.session, getattr(table, "name", None))
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_after_commit(session):
+    written = session.info.pop("catalog_written", None)
+    if written:
+        catalog_cache.bump(*written)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("catalog_written", None)
@@ -0,0 +1,102 @@
+import mimetypes
+import os
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+
+from app.services.catalog_cache import etag_matches, make_etag
+
+# Vite кладёт в assets/ только файлы с хешем содержимого в имени: их можно кэшировать навсегда
+IMMUTABLE_PREFIX = "assets/"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Предсжатые соседи из scripts/compress.mjs, в порядке предпочтения
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+class FileVariant(NamedTuple):
+    path: Path
+    stat: os.stat_result
+    etag: str
+
+
+def _variant(path: Path) -> FileVariant:
+    return FileVariant(path, path.stat(), make_etag(path.read_bytes()))
+
+
+def accepted_encodings(header: str) -> set:
+    accepted = set()
+    for item in header.split(","):
+        name, _, params = item.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if quality > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+class FrontendFiles:
+    # Каталог сборки неизменен до следующего деплоя: индексируем его один раз при старте,
+    # на запрос — поиск в словаре, без stat и без выхода за пределы каталога
+    
+    def __init__(self, root: str):
+        self.root = Path(root).resolve()
+        self.files: Dict[str, Dict[Optional[str], FileVariant]] = {}
+        
+        paths = {path.relative_to(self.root).as_posix(): path for path in self.root.rglob("*") if path.is_file()}
+        for name, path in paths.items():
+            for encoding, suffix in ENCODINGS:
+                if name.endswith(suffix) and name[:-len(suffix)] in paths:
+                    self.files.setdefault(name[:-len(suffix)], {})[encoding] = _variant(path)
+                    break
+            else:
+                self.files.setdefault(name, {})[None] = _variant(path)
+    
+    def stats(self) -> dict:
+        return {
+            "root": str(self.root),
+            "files": len(self.files),
+            "precompressed": sum(len(variants) > 1 for variants in self.files.values()),
+        }
+    
+    def response(self, request: Request, path: str) -> Response:
+        name = path.strip("/")
+        variants = self.files.get(name)
+        if variants is None:
+            # Отсутствующий файл с расширением — честный 404, а не index.html под видом скрипта
+            if "." in name.rsplit("/", 1)[-1]:
+                return Response(content="Not Found", status_code=404)
+            # Клиентские маршруты SPA (/bookings, /masters/1) отдают index.html
+            name = "index.html"
+            variants = self.files.get(name)
+            if variants is None:
+                return Response(content="Not Found", status_code=404)
+        
+        accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+        encoding = next((encoding for encoding, _ in ENCODINGS if encoding in accepted and encoding in variants), None)
+        variant = variants[encoding]
+        
+        headers = {
+            "ETag": variant.etag,
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL if name.startswith(IMMUTABLE_PREFIX) else "no-cache",
+        }
+        if len(variants) > 1:
+            headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        
+        if etag_matches(request, variant.etag):
+            return Response(status_code=304, headers=headers)
+        
+        return FileResponse(
+            variant.path,
+            headers=headers,
+            media_type=mimetypes.guess_type(name)[0] or "application/octet-stream",
+            stat_result=variant.stat
+        )
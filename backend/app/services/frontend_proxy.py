@@ -0,0 +1,108 @@
+import logging
+import math
+import os
+from typing import Optional
+
+import httpx
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from app.config import settings
+from app.utils.circuit_breaker import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+FRONTEND_URL = os.getenv("FRONTEND_URL", "http://frontend:5173")
+
+# Hop-by-hop заголовки относятся к одному соединению, дальше прокси их не передаёт
+HOP_BY_HOP_HEADERS = frozenset({
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailer", "transfer-encoding", "upgrade",
+})
+UPSTREAM_FAILURE_STATUSES = frozenset({502, 503, 504})
+BODY_METHODS = frozenset({"POST", "PUT", "PATCH"})
+
+frontend_breaker = CircuitBreaker(
+    failure_threshold=settings.frontend_proxy_failure_threshold,
+    reset_seconds=settings.frontend_proxy_reset_seconds,
+)
+
+# Один клиент на процесс: keep-alive соединения к фронтенду переиспользуются между запросами
+_client: Optional[httpx.AsyncClient] = None
+
+
+async def open_client():
+    global _client
+    _client = httpx.AsyncClient(
+        timeout=httpx.Timeout(settings.frontend_proxy_timeout_seconds),
+        limits=httpx.Limits(
+            max_connections=settings.frontend_proxy_max_connections,
+            max_keepalive_connections=settings.frontend_proxy_max_keepalive,
+        ),
+    )
+
+
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def proxy_status() -> dict:
+    return {
+        "max_connections": settings.frontend_proxy_max_connections,
+        "max_keepalive": settings.frontend_proxy_max_keepalive,
+        "breaker": frontend_breaker.stats(),
+    }
+
+
+def _unavailable(detail: str) -> Response:
+    retry_after = max(math.ceil(frontend_breaker.retry_after()), 1)
+    return Response(content=f"Frontend unavailable: {detail}", status_code=503, headers={"Retry-After": str(retry_after)})
+
+
+async def proxy(request: Request, path: str) -> Response:
+    if _client is None or not frontend_breaker.allow():
+        return _unavailable("circuit open" if _client is not None else "proxy client is not started")
+    
+    url = f"{FRONTEND_URL}/{path}" if path else FRONTEND_URL
+    if request.url.query:
+        url = f"{url}?{request.url.query}"
+    
+    headers = {k: v for k, v in request.headers.items() if k not in HOP_BY_HOP_HEADERS and k != "host"}
+    # Host подменяем, чтобы Vite не отклонял запрос проверкой хоста
+    headers["host"] = "localhost:5173"
+    
+    upstream_request = _client.build_request(
+        request.method,
+        url,
+        headers=headers,
+        content=request.stream() if request.method in BODY_METHODS else None
+    )
+    try:
+        upstream = await _client.send(upstream_request, stream=True)
+    except httpx.HTTPError as e:
+        frontend_breaker.record_failure()
+        logger.error(f"Error proxying to frontend: {e!r}")
+        return _unavailable(type(e).__name__)
+    
+    if upstream.status_code in UPSTREAM_FAILURE_STATUSES:
+        frontend_breaker.record_failure()
+    else:
+        frontend_breaker.record_success()
+    
+    response_headers = {k: v for k, v in upstream.headers.items() if k not in HOP_BY_HOP_HEADERS}
+    # Редиректы отдаём браузеру как есть, убирая из Location внутренний адрес фронтенда
+    location = response_headers.get("location")
+    if location and location.startswith(FRONTEND_URL):
+        response_headers["location"] = location[len(FRONTEND_URL):] or "/"
+    
+    # Тело идёт потоком сырыми байтами (без распаковки gzip), соединение вернётся в пул после отправки
+    return StreamingResponse(
+        upstream.aiter_raw(),
+        status_code=upstream.status_code,
+        headers=response_headers,
+        background=BackgroundTask(upstream.aclose)
+    )
@@ -0,0 +1,105 @@
+import heapq
+import secrets
+import threading
+import time
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from app.config import settings
+from app.services.slots import occupancy_mask
+
+
+class SlotHold(NamedTuple):
+    id: str
+    user_id: int
+    master_id: int
+    day: date
+    interval: Tuple[int, int]
+    expires_at: float
+
+
+class SlotHoldStore:
+    # Временные брони слотов: словарь по (master_id, date) + min-heap по времени истечения.
+    # Просроченные холды снимаются лениво с вершины кучи, без обхода всех записей.
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._holds: Dict[str, SlotHold] = {}
+        self._by_day: Dict[Tuple[int, date], Dict[str, SlotHold]] = {}
+        self._by_user: Dict[int, str] = {}
+        self._expiry: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def _purge_expired(self):
+        now = time.time()
+        while self._expiry and self._expiry[0][0] <= now:
+            _, hold_id = heapq.heappop(self._expiry)
+            hold = self._holds.get(hold_id)
+            if hold is not None and hold.expires_at <= now:
+                self._drop(hold)
+
+    def _drop(self, hold: SlotHold):
+        del self._holds[hold.id]
+        day_holds = self._by_day.get((hold.master_id, hold.day))
+        if day_holds is not None:
+            day_holds.pop(hold.id, None)
+            if not day_holds:
+                del self._by_day[(hold.master_id, hold.day)]
+        if self._by_user.get(hold.user_id) == hold.id:
+            del self._by_user[hold.user_id]
+
+    def _overlapping(self, master_id: int, day: date, interval: Tuple[int, int], user_id: Optional[int]) -> bool:
+        start, end = interval
+        return any(
+            hold.user_id != user_id and hold.interval[0] < end and start < hold.interval[1]
+            for hold in self._by_day.get((master_id, day), {}).values()
+        )
+
+    def acquire(self, user_id: int, master_id: int, day: date, interval: Tuple[int, int]) -> Optional[SlotHold]:
+        with self._lock:
+            self._purge_expired()
+            if self._overlapping(master_id, day, interval, user_id):
+                return None
+
+            # У пользователя одновременно только один холд: новый заменяет предыдущий
+            previous_id = self._by_user.get(user_id)
+            if previous_id is not None:
+                self._drop(self._holds[previous_id])
+
+            hold = SlotHold(secrets.token_urlsafe(16), user_id, master_id, day, interval, time.time() + self.ttl_seconds)
+            self._holds[hold.id] = hold
+            self._by_day.setdefault((master_id, day), {})[hold.id] = hold
+            self._by_user[user_id] = hold.id
+            heapq.heappush(self._expiry, (hold.expires_at, hold.id))
+            return hold
+
+    def release(self, hold_id: str, user_id: int) -> bool:
+        with self._lock:
+            self._purge_expired()
+            hold = self._holds.get(hold_id)
+            if hold is None or hold.user_id != user_id:
+                return False
+            self._drop(hold)
+            return True
+
+    def release_user(self, user_id: int):
+        with self._lock:
+            hold_id = self._by_user.get(user_id)
+            if hold_id is not None:
+                self._drop(self._holds[hold_id])
+
+    def is_held_by_other(self, master_id: int, day: date, interval: Tuple[int, int], user_id: int) -> bool:
+        with self._lock:
+            self._purge_expired()
+            return self._overlapping(master_id, day, interval, user_id)
+
+    def mask(self, master_id: int, day: date, exclude_user_id: Optional[int] = None) -> int:
+        with self._lock:
+            self._purge_expired()
+            day_holds = self._by_day.get((master_id, day))
+            if not day_holds:
+                return 0
+            return occupancy_mask(hold.interval for hold in day_holds.values() if hold.user_id != exclude_user_id)
+
+
+slot_holds = SlotHoldStore(ttl_seconds=settings.slot_hold_ttl_seconds)
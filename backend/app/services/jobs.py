@@ -0,0 +1,378 @@
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import case, delete, func, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.job import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict], Awaitable[Any]]
+REAP_INTERVAL_SECONDS = 30
+
+
+class Task(NamedTuple):
+    handler: Handler
+    max_attempts: int
+
+
+class Periodic(NamedTuple):
+    name: str
+    interval_seconds: int
+    payload: dict
+
+
+class JobQueue:
+    # Очередь задач в таблице jobs. Воркер забирает пачку готовых строк через FOR UPDATE SKIP LOCKED:
+    # параллельные воркеры в любых процессах и на любых узлах пропускают чужие строки, а не ждут их,
+    # поэтому одну задачу выполняет один воркер и добавление воркеров не создаёт очереди на блокировках.
+    # Ошибка — повтор с экспоненциальной задержкой; воркер, умерший с задачей, теряет её по истечении аренды.
+    # Доставка «как минимум один раз»: обработчик должен быть идемпотентен
+    
+    def __init__(
+        self,
+        workers: int,
+        claim_batch: int,
+        poll_seconds: float,
+        lease_seconds: float,
+        max_attempts: int,
+        retry_base_seconds: float,
+        retry_max_seconds: float
+    ):
+        self.workers = workers
+        self.claim_batch = claim_batch
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.tasks: Dict[str, Task] = {}
+        self.schedules: List[Periodic] = []
+        self.claimed = 0
+        self.succeeded = 0
+        self.retried = 0
+        self.failed = 0
+        self.reaped = 0
+        self.released = 0
+        self._in_flight = 0
+        self._last_slots: Dict[str, int] = {}
+        self._last_reap = 0.0
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._worker_tasks: List[asyncio.Task] = []
+        self._scheduler_task: Optional[asyncio.Task] = None
+    
+    def task(self, name: str, max_attempts: Optional[int] = None):
+        def register(handler: Handler) -> Handler:
+            self.tasks[name] = Task(handler, max_attempts or self.max_attempts)
+            return handler
+        return register
+    
+    def periodic(self, name: str, interval_seconds: int, payload: Optional[dict] = None):
+        self.schedules.append(Periodic(name, interval_seconds, payload or {}))
+    
+    async def enqueue(
+        self,
+        name: str,
+        payload: Optional[dict] = None,
+        run_at: Optional[datetime] = None,
+        delay_seconds: float = 0,
+        dedup_key: Optional[str] = None,
+        db: Optional[AsyncSession] = None
+    ) -> Optional[int]:
+        # С db задача ставится в транзакции вызывающего и появится только вместе с его изменениями.
+        # Возвращает id или None, если задача с таким dedup_key уже есть
+        if name not in self.tasks:
+            raise ValueError(f"Unknown job: {name}")
+        if run_at is None:
+            run_at = datetime.now(timezone.utc) + timedelta(seconds=delay_seconds)
+        
+        statement = (
+            insert(Job)
+            .values(
+                name=name,
+                payload=payload or {},
+                status=JobStatus.QUEUED,
+                run_at=run_at,
+                attempts=0,
+                max_attempts=self.tasks[name].max_attempts,
+                dedup_key=dedup_key,
+            )
+            .on_conflict_do_nothing(index_elements=[Job.dedup_key])
+            .returning(Job.id)
+        )
+        if db is not None:
+            return (await db.execute(statement)).scalar()
+        
+        async with SessionLocal() as db:
+            job_id = (await db.execute(statement)).scalar()
+            await db.commit()
+        self._wakeup.set()
+        return job_id
+    
+    async def _claim(self) -> list:
+        ready = (
+            select(Job.id)
+            .where(Job.status == JobStatus.QUEUED, Job.run_at <= func.now())
+            .order_by(Job.run_at, Job.id)
+            .limit(self.claim_batch)
+            .with_for_update(skip_locked=True)
+        )
+        async with SessionLocal() as db:
+            result = await db.execute(
+                update(Job)
+                .where(Job.id.in_(ready.scalar_subquery()))
+                .values(
+                    status=JobStatus.RUNNING,
+                    attempts=Job.attempts + 1,
+                    locked_by=self.worker_id,
+                    locked_at=func.now(),
+                )
+                .returning(Job.id, Job.name, Job.payload, Job.attempts, Job.max_attempts)
+                .execution_options(synchronize_session=False)
+            )
+            jobs = result.all()
+            await db.commit()
+        self.claimed += len(jobs)
+        return sorted(jobs, key=lambda job: job.id)
+    
+    async def _execute(self, job, timeout: float) -> bool:
+        task = self.tasks.get(job.name)
+        try:
+            if task is None:
+                raise LookupError(f"No handler registered for job {job.name!r} in this process")
+            # Задача дольше аренды всё равно будет отдана другому воркеру: обрываем её сами
+            await asyncio.wait_for(task.handler(job.payload), timeout)
+            return True
+        except Exception as e:
+            logger.exception(f"Job {job.id} ({job.name}) failed, attempt {job.attempts}/{job.max_attempts}")
+            await self._fail(job, f"{type(e).__name__}: {e}")
+            return False
+    
+    def _owned(self, jobs: list):
+        # Результат пишем только в свою аренду. Задачу, которую _reap уже вернул в очередь, мог взять другой воркер
+        # (или этот же процесс заново): locked_by отличает чужой процесс, attempts — новую аренду в своём
+        return (
+            Job.status == JobStatus.RUNNING,
+            Job.locked_by == self.worker_id,
+            tuple_(Job.id, Job.attempts).in_([(job.id, job.attempts) for job in jobs]),
+        )
+    
+    async def _fail(self, job, error: str):
+        values = {"locked_by": None, "locked_at": None, "last_error": error}
+        exhausted = job.attempts >= job.max_attempts
+        if exhausted:
+            values.update(status=JobStatus.FAILED, finished_at=func.now())
+        else:
+            # Джиттер: упавшие вместе задачи не возвращаются одной волной
+            delay = min(self.retry_base_seconds * 2 ** (job.attempts - 1), self.retry_max_seconds)
+            values.update(status=JobStatus.QUEUED, run_at=func.now() + timedelta(seconds=random.uniform(delay / 2, delay)))
+        async with SessionLocal() as db:
+            result = await db.execute(
+                update(Job).where(*self._owned([job])).values(values).execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        if not result.rowcount:
+            logger.warning(f"Job {job.id} ({job.name}) lost its lease before the failure was recorded")
+        elif exhausted:
+            self.failed += 1
+        else:
+            self.retried += 1
+    
+    async def _complete(self, job):
+        async with SessionLocal() as db:
+            result = await db.execute(
+                update(Job)
+                .where(*self._owned([job]))
+                .values(status=JobStatus.DONE, finished_at=func.now(), locked_by=None, locked_at=None, last_error=None)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        if result.rowcount:
+            self.succeeded += 1
+        else:
+            logger.warning(f"Job {job.id} ({job.name}) lost its lease before completion")
+    
+    async def _release(self, jobs: list):
+        # Не начатые задачи возвращаются в очередь без траты попытки: иначе _reap сочтёт их упавшими по аренде,
+        # и задача с max_attempts=1 (reminders.tick) станет FAILED, так и не запустившись
+        async with SessionLocal() as db:
+            result = await db.execute(
+                update(Job)
+                .where(*self._owned(jobs))
+                .values(status=JobStatus.QUEUED, attempts=Job.attempts - 1, locked_by=None, locked_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        self.released += result.rowcount
+    
+    async def _worker(self):
+        while not self._stopping:
+            # Аренда отсчитывается до взятия пачки: здесь она кончается раньше, чем её увидит истёкшей _reap,
+            # и остаток пачки успевает вернуться в очередь сам
+            lease_ends = time.monotonic() + self.lease_seconds
+            try:
+                jobs = await self._claim()
+            except Exception:
+                logger.exception("Failed to claim jobs")
+                jobs = []
+            if not jobs:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            for index, job in enumerate(jobs):
+                remaining = lease_ends - time.monotonic()
+                if remaining <= 0:
+                    try:
+                        await self._release(jobs[index:])
+                    except Exception:
+                        # Не вернули сами — вернёт _reap по истечении аренды
+                        logger.exception("Failed to release unstarted jobs")
+                    break
+                self._in_flight += 1
+                try:
+                    # Каждую задачу отмечаем сразу: пока идёт остаток пачки, готовая задача не висит в RUNNING
+                    if await self._execute(job, remaining):
+                        await self._complete(job)
+                except Exception:
+                    # Незаписанный результат не теряется: задача вернётся в очередь по истечении аренды
+                    logger.exception(f"Failed to record the result of job {job.id} ({job.name})")
+                finally:
+                    self._in_flight -= 1
+    
+    async def _enqueue_due(self):
+        # Слот — начало текущего интервала. dedup_key со слотом делает постановку идемпотентной:
+        # сколько бы процессов ни запускало планировщик, на слот будет одна задача
+        now = time.time()
+        for schedule in self.schedules:
+            slot = int(now // schedule.interval_seconds) * schedule.interval_seconds
+            if self._last_slots.get(schedule.name) == slot:
+                continue
+            scheduled_for = datetime.fromtimestamp(slot, timezone.utc)
+            await self.enqueue(
+                schedule.name,
+                {**schedule.payload, "scheduled_for": scheduled_for.isoformat()},
+                run_at=scheduled_for,
+                dedup_key=f"{schedule.name}@{slot}"
+            )
+            self._last_slots[schedule.name] = slot
+    
+    async def _reap(self):
+        # Задачи, чья аренда истекла (воркер упал или завис), возвращаются в очередь или окончательно падают
+        exhausted = Job.attempts >= Job.max_attempts
+        async with SessionLocal() as db:
+            result = await db.execute(
+                update(Job)
+                .where(Job.status == JobStatus.RUNNING, Job.locked_at < func.now() - timedelta(seconds=self.lease_seconds))
+                .values(
+                    status=case(
+                        (exhausted, literal(JobStatus.FAILED, Job.status.type)),
+                        else_=literal(JobStatus.QUEUED, Job.status.type)
+                    ),
+                    finished_at=case((exhausted, func.now()), else_=None),
+                    locked_by=None,
+                    locked_at=None,
+                    last_error=f"Lease of {self.lease_seconds:g}s expired",
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        if result.rowcount:
+            self.reaped += result.rowcount
+            logger.warning(f"Requeued {result.rowcount} job(s) with an expired lease")
+    
+    async def _scheduler(self):
+        while True:
+            try:
+                await self._enqueue_due()
+                if time.monotonic() - self._last_reap >= REAP_INTERVAL_SECONDS:
+                    self._last_reap = time.monotonic()
+                    await self._reap()
+            except Exception:
+                logger.exception("Job scheduler tick failed")
+            await asyncio.sleep(1)
+    
+    async def purge(self, older_than: timedelta) -> int:
+        async with SessionLocal() as db:
+            result = await db.execute(
+                delete(Job).where(
+                    Job.status.in_([JobStatus.DONE, JobStatus.FAILED]),
+                    Job.finished_at < func.now() - older_than,
+                )
+            )
+            await db.commit()
+        return result.rowcount
+    
+    async def counts(self) -> dict:
+        async with SessionLocal() as db:
+            rows = (await db.execute(select(Job.status, func.count()).group_by(Job.status))).all()
+            oldest = (await db.execute(
+                select(func.min(Job.run_at)).where(Job.status == JobStatus.QUEUED, Job.run_at <= func.now())
+            )).scalar()
+        counts = {status.value: 0 for status in JobStatus}
+        counts.update({status.value: count for status, count in rows})
+        lag = (datetime.now(timezone.utc) - oldest).total_seconds() if oldest else 0.0
+        return {**counts, "oldest_ready_seconds": round(max(lag, 0.0), 3)}
+    
+    async def start(self):
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._scheduler_task = asyncio.create_task(self._scheduler())
+    
+    async def stop(self, drain_seconds: float):
+        if self._scheduler_task is None:
+            return
+        self._scheduler_task.cancel()
+        # Воркеры доделывают взятые пачки и больше не берут новых; недоделанное вернёт _reap после аренды
+        self._stopping = True
+        self._wakeup.set()
+        _, pending = await asyncio.wait(self._worker_tasks, timeout=drain_seconds)
+        if pending:
+            logger.warning(f"Stopping job queue with {self._in_flight} in-flight job(s)")
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(self._scheduler_task, *self._worker_tasks, return_exceptions=True)
+        self._scheduler_task = None
+        self._worker_tasks = []
+    
+    def stats(self) -> dict:
+        return {
+            "worker_id": self.worker_id,
+            "workers": len(self._worker_tasks),
+            "in_flight": self._in_flight,
+            "tasks": sorted(self.tasks),
+            "schedules": {schedule.name: schedule.interval_seconds for schedule in self.schedules},
+            "claimed": self.claimed,
+            "succeeded": self.succeeded,
+            "retried": self.retried,
+            "failed": self.failed,
+            "reaped": self.reaped,
+            "released": self.released,
+        }
+
+
+job_queue = JobQueue(
+    workers=settings.job_workers,
+    claim_batch=settings.job_claim_batch,
+    poll_seconds=settings.job_poll_seconds,
+    lease_seconds=settings.job_lease_seconds,
+    max_attempts=settings.job_max_attempts,
+    retry_base_seconds=settings.job_retry_base_seconds,
+    retry_max_seconds=settings.job_retry_max_seconds,
+)
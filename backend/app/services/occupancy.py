@@ -0,0 +1,174 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import Booking
+from app.models.booking import BookingStatus
+from app.services.slots import booking_interval, occupancy_mask
+from app.utils.salon_time import salon_today
+
+
+class _DayEntry:
+    __slots__ = ("bookings", "mask", "loaded_at")
+
+    def __init__(self, bookings: Dict[int, Tuple[int, int]]):
+        self.bookings = bookings
+        self.mask = occupancy_mask(bookings.values())
+        self.loaded_at = time.monotonic()
+
+
+class OccupancyIndex:
+    # Занятость мастера по дням: (master_id, date) -> {booking_id: (start, end)} в минутах дня
+
+    def __init__(self, max_entries: int, ttl_seconds: float, horizon_days: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.horizon_days = horizon_days
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple[int, date], _DayEntry]" = OrderedDict()
+        self._swept_on: Optional[date] = None
+        self._lock = threading.Lock()
+
+    def _cacheable(self, day: date) -> bool:
+        today = salon_today()
+        return today <= day <= today + timedelta(days=self.horizon_days)
+
+    def _expired(self, entry: _DayEntry) -> bool:
+        return self.ttl_seconds > 0 and time.monotonic() - entry.loaded_at > self.ttl_seconds
+
+    def _evict(self):
+        # Прошедшие дни вычищаем раз в сутки: полный обход на каждой вставке в заполненный кэш
+        # превращал загрузку нескольких тысяч дней одним запросом в квадратичную
+        today = salon_today()
+        if self._swept_on != today:
+            self._swept_on = today
+            for key in [key for key in self._entries if key[1] < today]:
+                del self._entries[key]
+                self.evictions += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, master_id: int, day: date) -> Optional[int]:
+        key = (master_id, day)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry):
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.mask
+
+    def put(self, master_id: int, day: date, bookings: Dict[int, Tuple[int, int]]):
+        if not self._cacheable(day):
+            return
+        with self._lock:
+            self._entries[(master_id, day)] = _DayEntry(dict(bookings))
+            self._entries.move_to_end((master_id, day))
+            if len(self._entries) > self.max_entries:
+                self._evict()
+
+    def add_booking(self, master_id: int, day: date, booking_id: int, interval: Tuple[int, int]):
+        # Write-through: обновляем только уже загруженный день, иначе он подтянется из БД при первом чтении
+        with self._lock:
+            entry = self._entries.get((master_id, day))
+            if entry is not None:
+                entry.bookings[booking_id] = interval
+                entry.mask = occupancy_mask(entry.bookings.values())
+
+    def remove_booking(self, master_id: int, day: date, booking_id: int):
+        with self._lock:
+            entry = self._entries.get((master_id, day))
+            if entry is not None and entry.bookings.pop(booking_id, None) is not None:
+                entry.mask = occupancy_mask(entry.bookings.values())
+
+    def invalidate(self, master_id: Optional[int] = None):
+        with self._lock:
+            if master_id is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == master_id]:
+                    del self._entries[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+occupancy_index = OccupancyIndex(
+    max_entries=settings.occupancy_cache_size,
+    ttl_seconds=settings.occupancy_cache_ttl_seconds,
+    horizon_days=settings.occupancy_cache_horizon_days,
+)
+
+
+async def load_busy_masks(
+    db: AsyncSession,
+    date_from: date,
+    date_to: date,
+    master_ids: List[int]
+) -> Dict[Tuple[int, date], int]:
+    days = [date_from + timedelta(days=offset) for offset in range((date_to - date_from).days + 1)]
+    # Индекс наполняется только с основной БД: маска с отставшей реплики жила бы в нём до TTL
+    # и доставалась бы всем, в том числе запросам с X-Read-Primary. Такие запросы индекс не читают,
+    # а перечитывают занятость с основной: запись могла пройти через другой процесс
+    from_replica = db.info.get("replica", False)
+    
+    busy = {}
+    missing = []
+    if db.info.get("read_primary"):
+        missing = list(master_ids)
+    else:
+        for master_id in master_ids:
+            for day in days:
+                mask = occupancy_index.get(master_id, day)
+                if mask is None:
+                    missing.append(master_id)
+                    break
+                busy[(master_id, day)] = mask
+    
+    if not missing:
+        return busy
+    
+    result = await db.execute(
+        select(
+            Booking.id, Booking.master_id, Booking.booking_date, Booking.starts_at, Booking.ends_at
+        ).where(
+            and_(
+                Booking.master_id.in_(missing),
+                Booking.booking_date >= date_from,
+                Booking.booking_date <= date_to,
+                Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED])
+            )
+        )
+    )
+    
+    bookings = {}
+    for booking_id, booking_master_id, booking_date, starts_at, ends_at in result.all():
+        bookings.setdefault((booking_master_id, booking_date), {})[booking_id] = booking_interval(starts_at, ends_at)
+    
+    for master_id in missing:
+        for day in days:
+            day_bookings = bookings.get((master_id, day), {})
+            if not from_replica:
+                occupancy_index.put(master_id, day, day_bookings)
+            busy[(master_id, day)] = occupancy_mask(day_bookings.values())
+    
+    return busy
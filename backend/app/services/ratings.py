@@ -0,0 +1,78 @@
+import asyncio
+import sys
+from typing import Optional
+
+from sqlalchemy import Numeric, cast, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Master
+from app.services.catalog_cache import catalog_cache
+
+RATING_STARS = range(1, 6)
+
+# Пересчёт агрегатов из таблицы reviews; обновляются только разошедшиеся строки
+RECOMPUTE_RATINGS_SQL = """
+UPDATE masters AS m
+SET rating_sum = s.total,
+    reviews_count = s.count,
+    rating_1_count = s.r1,
+    rating_2_count = s.r2,
+    rating_3_count = s.r3,
+    rating_4_count = s.r4,
+    rating_5_count = s.r5,
+    rating = CASE WHEN s.count > 0 THEN s.total::numeric / s.count ELSE 0 END
+FROM (
+    SELECT masters.id AS master_id,
+           COALESCE(SUM(reviews.rating), 0) AS total,
+           COUNT(reviews.id) AS count,
+           COUNT(reviews.id) FILTER (WHERE reviews.rating = 1) AS r1,
+           COUNT(reviews.id) FILTER (WHERE reviews.rating = 2) AS r2,
+           COUNT(reviews.id) FILTER (WHERE reviews.rating = 3) AS r3,
+           COUNT(reviews.id) FILTER (WHERE reviews.rating = 4) AS r4,
+           COUNT(reviews.id) FILTER (WHERE reviews.rating = 5) AS r5
+    FROM masters
+    LEFT JOIN reviews ON reviews.master_id = masters.id
+    WHERE CAST(:master_id AS INTEGER) IS NULL OR masters.id = :master_id
+    GROUP BY masters.id
+) AS s
+WHERE m.id = s.master_id
+  AND (m.rating_sum, m.reviews_count, m.rating_1_count, m.rating_2_count,
+       m.rating_3_count, m.rating_4_count, m.rating_5_count)
+      IS DISTINCT FROM (s.total, s.count, s.r1, s.r2, s.r3, s.r4, s.r5)
+"""
+
+
+async def apply_review_rating(db: AsyncSession, master_id: int, rating: int):
+    # Один UPDATE по строке мастера: O(1) независимо от числа отзывов, параллельные
+    # отзывы сериализуются на блокировке строки и не затирают друг друга
+    star_count = getattr(Master, f"rating_{rating}_count")
+    await db.execute(
+        update(Master).where(Master.id == master_id).values({
+            Master.rating_sum: Master.rating_sum + rating,
+            Master.reviews_count: Master.reviews_count + 1,
+            star_count: star_count + 1,
+            Master.rating: cast(Master.rating_sum + rating, Numeric) / (Master.reviews_count + 1),
+        }).execution_options(synchronize_session=False)
+    )
+
+
+async def recompute_master_ratings(db: AsyncSession, master_id: Optional[int] = None) -> int:
+    result = await db.execute(text(RECOMPUTE_RATINGS_SQL), {"master_id": master_id})
+    await db.commit()
+    if result.rowcount:
+        catalog_cache.bump("masters")
+    return result.rowcount
+
+
+async def main():
+    from app.database import SessionLocal, engine
+
+    master_id = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    async with SessionLocal() as db:
+        repaired = await recompute_master_ratings(db, master_id)
+    await engine.dispose()
+    print(f"Recomputed ratings, repaired {repaired} master(s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,156 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+from sqlalchemy import exists, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.booking import Booking, BookingStatus
+from app.models.master import Master
+from app.models.notification import Notification
+from app.models.service import Service
+from app.models.user import User
+from app.services.telegram_dispatcher import telegram_dispatcher
+from app.utils.salon_time import salon_now
+
+
+class Reminder(NamedTuple):
+    offset: timedelta
+    type: str
+    template: str
+
+
+# От дальнего к ближнему: пропущенное напоминание не отправляем, если уже подошло время следующего
+REMINDERS = (
+    Reminder(timedelta(hours=24), "booking_reminder_24h", "Напоминаем: завтра в {time} вас ждут на «{service}»{master}."),
+    Reminder(timedelta(hours=2), "booking_reminder_2h", "Через 2 часа, в {time}, вас ждут на «{service}»{master}."),
+)
+
+
+def reminder_text(reminder: Reminder, row) -> str:
+    return reminder.template.format(
+        time=row.starts_at.strftime("%H:%M"),
+        service=row.service_name,
+        master=f" к мастеру {row.master_name}" if row.master_name else "",
+    )
+
+
+class ReminderScheduler:
+    # Тик — периодическая задача очереди jobs, поэтому на весь кластер он выполняется один раз за интервал.
+    # Тик смотрит окно (сейчас - catchup + offset, сейчас + offset] по частичному индексу подтверждённых
+    # записей: стоимость зависит от числа записей в окне, а не от размера таблицы, а перекрытие окон
+    # догоняет тики, пропущенные в простое. Отправка фиксируется строкой Notification до вызова Telegram:
+    # повторный тик (или второй процесс) упирается в уникальный индекс, и повторного сообщения не будет
+    
+    def __init__(self, catchup_seconds: float, batch_size: int):
+        self.catchup_seconds = catchup_seconds
+        self.batch_size = batch_size
+        self.ticks = 0
+        self.sent = 0
+        self.delivered = 0
+        self.failed = 0
+        self.last_tick_at: Optional[datetime] = None
+        self.last_tick_seconds = 0.0
+    
+    def _query(self, reminder: Reminder, lower: datetime, upper: datetime):
+        already_sent = exists().where(Notification.booking_id == Booking.id, Notification.type == reminder.type)
+        return (
+            select(
+                Booking.id,
+                Booking.user_id,
+                Booking.starts_at,
+                User.telegram_id,
+                Service.name.label("service_name"),
+                Master.name.label("master_name"),
+            )
+            .join(User, User.id == Booking.user_id)
+            .join(Service, Service.id == Booking.service_id)
+            .outerjoin(Master, Master.id == Booking.master_id)
+            .where(
+                Booking.status == BookingStatus.CONFIRMED,
+                Booking.starts_at > lower,
+                Booking.starts_at <= upper,
+                ~already_sent,
+            )
+            .order_by(Booking.starts_at, Booking.id)
+            .limit(self.batch_size)
+        )
+    
+    async def _send_window(self, reminder: Reminder, lower: datetime, upper: datetime) -> int:
+        sent = 0
+        async with SessionLocal() as db:
+            while True:
+                rows = (await db.execute(self._query(reminder, lower, upper))).all()
+                if not rows:
+                    break
+                
+                texts = {row.id: reminder_text(reminder, row) for row in rows}
+                result = await db.execute(
+                    insert(Notification)
+                    .values([
+                        {"user_id": row.user_id, "booking_id": row.id, "type": reminder.type, "message": texts[row.id]}
+                        for row in rows
+                    ])
+                    .on_conflict_do_nothing(index_elements=[Notification.booking_id, Notification.type])
+                    .returning(Notification.booking_id)
+                )
+                claimed = set(result.scalars())
+                await db.commit()
+                
+                # Строки, занятые другим процессом, отправляет он; следующая пачка их уже не увидит
+                for row in rows:
+                    if row.id in claimed:
+                        future = telegram_dispatcher.send(row.telegram_id, texts[row.id])
+                        future.add_done_callback(self._on_delivery)
+                        sent += 1
+                if len(rows) < self.batch_size:
+                    break
+        return sent
+    
+    def _on_delivery(self, future: asyncio.Future):
+        if future.result():
+            self.delivered += 1
+        else:
+            self.failed += 1
+    
+    async def tick(self, now: Optional[datetime] = None) -> int:
+        # Без запущенного диспетчера напоминание было бы отмечено отправленным и потеряно: тик падает, окно догонит следующий
+        if not telegram_dispatcher.running:
+            raise RuntimeError("Telegram dispatcher is not running in this process")
+        
+        # starts_at хранится в местном времени салона без зоны, а часы контейнера обычно в UTC
+        now = now or salon_now()
+        started = time.perf_counter()
+        since = now - timedelta(seconds=self.catchup_seconds)
+        sent = 0
+        for i, reminder in enumerate(REMINDERS):
+            floor = now + REMINDERS[i + 1].offset if i + 1 < len(REMINDERS) else now
+            lower = max(since + reminder.offset, floor)
+            upper = now + reminder.offset
+            if lower < upper:
+                sent += await self._send_window(reminder, lower, upper)
+        
+        self.ticks += 1
+        self.sent += sent
+        self.last_tick_at = now
+        self.last_tick_seconds = time.perf_counter() - started
+        return sent
+    
+    def stats(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "last_tick_at": self.last_tick_at.isoformat() if self.last_tick_at else None,
+            "last_tick_seconds": round(self.last_tick_seconds, 3),
+            "sent": self.sent,
+            "delivered": self.delivered,
+            "failed": self.failed,
+        }
+
+
+reminder_scheduler = ReminderScheduler(
+    catchup_seconds=settings.reminder_catchup_seconds,
+    batch_size=settings.reminder_batch_size,
+)
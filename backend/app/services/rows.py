@@ -0,0 +1,98 @@
+from typing import Dict, Iterable, List, Sequence
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Booking, Master, Service, master_service_association
+from app.schemas import BookingResponse, MasterResponse, ServiceResponse
+
+# Горячие списки собираем прямо из кортежей запроса, минуя ORM -> Pydantic -> dict.
+# Набор и порядок полей берём из схем ответа, чтобы JSON совпадал с response_model
+
+
+def _fields(model, schema) -> List[str]:
+    columns = model.__table__.c
+    return [name for name in schema.model_fields if name in columns]
+
+
+SERVICE_FIELDS = _fields(Service, ServiceResponse)
+MASTER_FIELDS = _fields(Master, MasterResponse)
+BOOKING_FIELDS = _fields(Booking, BookingResponse)
+RATING_COUNT_FIELDS = [f"rating_{star}_count" for star in range(1, 6)]
+
+SERVICE_COLUMNS = [Service.__table__.c[name] for name in SERVICE_FIELDS]
+MASTER_COLUMNS = [Master.__table__.c[name] for name in MASTER_FIELDS + RATING_COUNT_FIELDS]
+BOOKING_COLUMNS = [Booking.__table__.c[name] for name in BOOKING_FIELDS]
+
+MASTER_ID = MASTER_FIELDS.index("id")
+
+# Порядок ключей — как у response_model: вложенные поля стоят в схеме до created_at/updated_at.
+# Словарь-заготовка с ключами схемы фиксирует порядок, значения дописываются поверх
+MASTER_KEYS = dict.fromkeys(MasterResponse.model_fields)
+BOOKING_KEYS = dict.fromkeys(BookingResponse.model_fields)
+
+
+def master_row(values: Sequence, services: List[dict]) -> dict:
+    row = MASTER_KEYS.copy()
+    row.update(zip(MASTER_FIELDS, values))
+    row["rating_histogram"] = {
+        star: count or 0 for star, count in enumerate(values[len(MASTER_FIELDS):], start=1)
+    }
+    row["services"] = services
+    return row
+
+
+async def load_master_services(db: AsyncSession, master_ids: Iterable[int]) -> Dict[int, List[dict]]:
+    master_ids = set(master_ids)
+    if not master_ids:
+        return {}
+    
+    result = await db.execute(
+        select(master_service_association.c.master_id, *SERVICE_COLUMNS)
+        .join(Service, Service.id == master_service_association.c.service_id)
+        .where(master_service_association.c.master_id.in_(master_ids))
+        .order_by(Service.id)
+    )
+    
+    services = {}
+    for master_id, *values in result.all():
+        services.setdefault(master_id, []).append(dict(zip(SERVICE_FIELDS, values)))
+    return services
+
+
+def master_rows_query() -> Select:
+    return select(*MASTER_COLUMNS)
+
+
+async def master_rows(db: AsyncSession, rows: Sequence) -> List[dict]:
+    services = await load_master_services(db, (row[MASTER_ID] for row in rows))
+    return [master_row(row, services.get(row[MASTER_ID], [])) for row in rows]
+
+
+def booking_rows_query() -> Select:
+    return (
+        select(*BOOKING_COLUMNS, *SERVICE_COLUMNS, *MASTER_COLUMNS)
+        .join(Service, Service.id == Booking.service_id)
+        .outerjoin(Master, Master.id == Booking.master_id)
+    )
+
+
+async def booking_rows(db: AsyncSession, rows: Sequence) -> List[dict]:
+    service_start = len(BOOKING_FIELDS)
+    master_start = service_start + len(SERVICE_FIELDS)
+    master_id = master_start + MASTER_ID
+    
+    # master_id у записи может ссылаться на удалённого мастера: смотрим на id из outer join
+    services = await load_master_services(db, (row[master_id] for row in rows if row[master_id] is not None))
+    
+    items = []
+    for row in rows:
+        item = BOOKING_KEYS.copy()
+        item.update(zip(BOOKING_FIELDS, row[:service_start]))
+        item["service"] = dict(zip(SERVICE_FIELDS, row[service_start:master_start]))
+        item["master"] = (
+            master_row(row[master_start:], services.get(row[master_id], []))
+            if row[master_id] is not None else None
+        )
+        items.append(item)
+    return items
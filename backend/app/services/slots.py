@@ -0,0 +1,120 @@
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from operator import itemgetter
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+SLOT_STEP_MINUTES = 30
+DEFAULT_DAY_START = "09:00"
+DEFAULT_DAY_END = "18:00"
+
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# Готовые подписи "HH:MM" для каждой минуты суток, чтобы не вызывать strftime на каждый слот
+TIME_LABELS = tuple(f"{minute // 60:02d}:{minute % 60:02d}" for minute in range(24 * 60))
+
+
+class MasterDay(NamedTuple):
+    master_id: int
+    master_name: Optional[str]
+    window: Tuple[int, int]
+    busy: int
+
+
+@lru_cache(maxsize=4096)
+def parse_time(value: str) -> int:
+    hours, minutes = value.split(":")[:2]
+    return int(hours) * 60 + int(minutes)
+
+
+def working_window(work_schedule: Optional[dict], day: date) -> Tuple[int, int]:
+    day_schedule = (work_schedule or {}).get(WEEKDAYS[day.weekday()]) or {}
+    start = parse_time(day_schedule.get("start", DEFAULT_DAY_START))
+    end = parse_time(day_schedule.get("end", DEFAULT_DAY_END))
+    return start, end
+
+
+def fits_window(window: Tuple[int, int], interval: Tuple[int, int], step: int = SLOT_STEP_MINUTES) -> bool:
+    # Запись должна начинаться ровно в один из слотов, которые отдаёт free_starts, и закончиться до конца смены
+    start, end = interval
+    window_start, window_end = window
+    return window_start <= start and end <= window_end and (start - window_start) % step == 0
+
+
+def booking_period(booking_date: date, booking_time: str, duration: int) -> Tuple[datetime, datetime]:
+    starts_at = datetime.combine(booking_date, datetime.min.time()) + timedelta(minutes=parse_time(booking_time))
+    return starts_at, starts_at + timedelta(minutes=duration)
+
+
+def booking_interval(starts_at: datetime, ends_at: datetime) -> Tuple[int, int]:
+    start = starts_at.hour * 60 + starts_at.minute
+    return start, start + int((ends_at - starts_at).total_seconds()) // 60
+
+
+def occupancy_mask(intervals: Iterable[Tuple[int, int]]) -> int:
+    # Бит i занят, если минута i дня занята записью
+    mask = 0
+    for start, end in intervals:
+        if end > start:
+            mask |= ((1 << (end - start)) - 1) << start
+    return mask
+
+
+def free_starts(
+    window: Tuple[int, int],
+    busy: int,
+    duration: int,
+    step: int = SLOT_STEP_MINUTES
+) -> List[Tuple[int, bool]]:
+    start, end = window
+    span = (1 << duration) - 1
+    return [(minute, not busy & (span << minute)) for minute in range(start, end - duration + 1, step)]
+
+
+def count_free_slots(
+    days: Sequence[MasterDay],
+    duration: int,
+    step: int = SLOT_STEP_MINUTES
+) -> int:
+    return sum(
+        available
+        for day in days
+        for _, available in free_starts(day.window, day.busy, duration, step)
+    )
+
+
+def build_slots(
+    days: Sequence[MasterDay],
+    duration: int,
+    step: int = SLOT_STEP_MINUTES
+) -> List[dict]:
+    rows = []
+    for day in days:
+        rows.extend(
+            (minute, available, day.master_id, day.master_name)
+            for minute, available in free_starts(day.window, day.busy, duration, step)
+        )
+
+    if len(days) > 1:
+        rows.sort(key=itemgetter(0))
+
+    return [
+        {"time": TIME_LABELS[minute], "available": available, "master_id": master_id, "master_name": master_name}
+        for minute, available, master_id, master_name in rows
+    ]
+
+
+def merge_free_slots(
+    days: Sequence[MasterDay],
+    duration: int,
+    step: int = SLOT_STEP_MINUTES
+) -> List[dict]:
+    # Режим "любой специалист": одно время — один слот, свободен, если свободен хотя бы один мастер
+    merged = {}
+    for day in days:
+        for minute, available in free_starts(day.window, day.busy, duration, step):
+            merged[minute] = merged.get(minute, False) or available
+
+    return [
+        {"time": TIME_LABELS[minute], "available": available, "master_id": None, "master_name": None}
+        for minute, available in sorted(merged.items())
+    ]
@@ -0,0 +1,56 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.jobs import job_queue
+from app.services.ratings import recompute_master_ratings
+from app.services.reminders import reminder_scheduler
+from app.services.telegram_dispatcher import telegram_dispatcher
+
+RATINGS_RECOMPUTE_INTERVAL_SECONDS = 86400
+JOBS_PURGE_INTERVAL_SECONDS = 3600
+
+
+# Пропущенный тик не повторяем: следующий догонит его окно
+@job_queue.task("reminders.tick", max_attempts=1)
+async def send_booking_reminders(payload: dict):
+    await reminder_scheduler.tick()
+
+
+@job_queue.task("ratings.recompute")
+async def recompute_ratings(payload: dict):
+    async with SessionLocal() as db:
+        await recompute_master_ratings(db, payload.get("master_id"))
+
+
+@job_queue.task("jobs.purge")
+async def purge_jobs(payload: dict):
+    await job_queue.purge(timedelta(days=settings.job_retention_days))
+
+
+if settings.telegram_bot_token:
+    job_queue.periodic("reminders.tick", settings.reminder_tick_seconds)
+job_queue.periodic("ratings.recompute", RATINGS_RECOMPUTE_INTERVAL_SECONDS)
+job_queue.periodic("jobs.purge", JOBS_PURGE_INTERVAL_SECONDS)
+
+
+async def main():
+    # Отдельный процесс-воркер: python -m app.services.tasks
+    from app.database import engine
+    
+    logging.basicConfig(level=logging.INFO)
+    if settings.telegram_bot_token:
+        await telegram_dispatcher.start()
+    await job_queue.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await job_queue.stop(settings.job_drain_seconds)
+        await telegram_dispatcher.stop(settings.telegram_dispatch_drain_seconds)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,298 @@
+import asyncio
+import heapq
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_MESSAGE_LENGTH = 4096
+COALESCE_SEPARATOR = "\n\n"
+THROUGHPUT_WINDOW_SECONDS = 60
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+    
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def delay(self, now: float) -> float:
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+    
+    def take(self, now: float):
+        self._refill(now)
+        self.tokens -= 1
+    
+    def full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+class OutgoingMessage:
+    __slots__ = ("text", "params", "future", "attempts")
+    
+    def __init__(self, text: str, params: Dict[str, Any], future: asyncio.Future):
+        self.text = text
+        self.params = params
+        self.future = future
+        self.attempts = 0
+    
+    def coalesces_with(self, other: "OutgoingMessage") -> bool:
+        # Склеиваем только простой текст с одинаковыми параметрами: кнопки привязаны к своему сообщению
+        return "reply_markup" not in self.params and self.params == other.params
+
+
+class _Chat:
+    __slots__ = ("bucket", "messages", "blocked_until", "scheduled", "sending")
+    
+    def __init__(self, bucket: TokenBucket):
+        self.bucket = bucket
+        self.messages: Deque[OutgoingMessage] = deque()
+        self.blocked_until = 0.0
+        self.scheduled = False
+        self.sending = False
+
+
+class TelegramDispatcher:
+    # Общий путь исходящих сообщений бота. Лимиты Telegram: ~30 сообщений/с на бота, 1/с в личный чат,
+    # 20/мин в группу. Глобальный token bucket + bucket на чат; 429 с retry_after ставит чат на паузу.
+    # Пока чат ждёт своей очереди, его новые сообщения копятся и уходят одним sendMessage
+    
+    def __init__(
+        self,
+        token: Optional[str],
+        base_url: str,
+        global_rate: float,
+        chat_rate: float,
+        group_rate_per_minute: float,
+        concurrency: int,
+        max_attempts: int
+    ):
+        self.token = token
+        self.base_url = base_url.rstrip("/")
+        # Без запаса на всплеск: равномерные 30/с не превышают лимит ни в одном секундном окне
+        self.global_bucket = TokenBucket(global_rate, 1)
+        self.chat_rate = chat_rate
+        self.group_rate = group_rate_per_minute / 60
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.requests = 0
+        self.delivered = 0
+        self.coalesced = 0
+        self.rate_limited = 0
+        self.retries = 0
+        self.failed = 0
+        self._chats: Dict[int, _Chat] = {}
+        self._heap: List[Tuple[float, int, int]] = []
+        self._seq = 0
+        self._pending = 0
+        self._recent: Deque[Tuple[float, int]] = deque()
+        self._wakeup = asyncio.Event()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._send_tasks: set = set()
+    
+    @property
+    def running(self) -> bool:
+        return self._loop_task is not None
+    
+    def send(self, chat_id: int, text: str, **params) -> asyncio.Future:
+        # Future завершается True после доставки и False, если Telegram отказал окончательно
+        future = asyncio.get_running_loop().create_future()
+        if not self.running:
+            future.set_result(False)
+            self.failed += 1
+            return future
+        
+        chat = self._chats.get(chat_id)
+        if chat is None:
+            # Отрицательные id — группы и каналы, у них лимит строже
+            rate = self.group_rate if chat_id < 0 else self.chat_rate
+            chat = self._chats[chat_id] = _Chat(TokenBucket(rate, 1))
+        chat.messages.append(OutgoingMessage(text, params, future))
+        self._pending += 1
+        self._schedule(chat_id, chat)
+        return future
+    
+    def _schedule(self, chat_id: int, chat: _Chat):
+        if chat.scheduled or chat.sending or not chat.messages:
+            return
+        now = time.monotonic()
+        ready_at = max(now + chat.bucket.delay(now), chat.blocked_until)
+        self._seq += 1
+        heapq.heappush(self._heap, (ready_at, self._seq, chat_id))
+        chat.scheduled = True
+        self._wakeup.set()
+    
+    def _batch(self, chat: _Chat) -> List[OutgoingMessage]:
+        batch = [chat.messages.popleft()]
+        length = len(batch[0].text)
+        while chat.messages and chat.messages[0].coalesces_with(batch[0]):
+            length += len(COALESCE_SEPARATOR) + len(chat.messages[0].text)
+            if length > MAX_MESSAGE_LENGTH:
+                break
+            batch.append(chat.messages.popleft())
+        return batch
+    
+    def _prune(self, now: float):
+        # Простаивающий чат с полным bucket ничего не помнит: его состояние можно выбросить
+        for chat_id in [chat_id for chat_id, chat in self._chats.items()
+                        if not chat.messages and not chat.sending and not chat.scheduled
+                        and chat.blocked_until <= now and chat.bucket.full(now)]:
+            del self._chats[chat_id]
+    
+    async def _run(self):
+        while True:
+            if not self._heap:
+                self._prune(time.monotonic())
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            
+            ready_at, _, chat_id = self._heap[0]
+            delay = ready_at - time.monotonic()
+            if delay > 0:
+                # Новое сообщение может оказаться готовым раньше: ждём либо его, либо срока
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            heapq.heappop(self._heap)
+            chat = self._chats[chat_id]
+            chat.scheduled = False
+            # Пока ждём глобальный лимит, чат не планируется повторно, а его новые сообщения попадут в эту пачку
+            chat.sending = True
+            
+            await asyncio.sleep(self.global_bucket.delay(time.monotonic()))
+            await self._slots.acquire()
+            
+            now = time.monotonic()
+            self.global_bucket.take(now)
+            chat.bucket.take(now)
+            batch = self._batch(chat)
+            self._pending -= len(batch)
+            task = asyncio.create_task(self._deliver(chat_id, chat, batch))
+            self._send_tasks.add(task)
+            task.add_done_callback(self._send_tasks.discard)
+    
+    async def _deliver(self, chat_id: int, chat: _Chat, batch: List[OutgoingMessage]):
+        text = COALESCE_SEPARATOR.join(message.text for message in batch)
+        payload = {"chat_id": chat_id, "text": text, **batch[0].params}
+        retry_after = None
+        try:
+            self.requests += 1
+            try:
+                response = await self._client.post(f"{self.base_url}/bot{self.token}/sendMessage", json=payload)
+                body = response.json()
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning(f"Telegram sendMessage to {chat_id} failed: {e!r}")
+                response, body = None, {}
+            
+            if body.get("ok"):
+                self._finish(batch, True)
+                self.delivered += len(batch)
+                self.coalesced += len(batch) - 1
+                self._recent.append((time.monotonic(), len(batch)))
+            elif response is not None and response.status_code == 429:
+                self.rate_limited += 1
+                retry_after = float(body.get("parameters", {}).get("retry_after", 1))
+            elif response is not None and 400 <= response.status_code < 500:
+                # Бот заблокирован, чат не найден, неверный текст — повтор не поможет
+                logger.warning(f"Telegram rejected message to {chat_id}: {body.get('description')}")
+                self._finish(batch, False)
+            else:
+                batch[0].attempts += 1
+                if batch[0].attempts >= self.max_attempts:
+                    self._finish(batch, False)
+                else:
+                    self.retries += 1
+                    retry_after = min(2 ** batch[0].attempts, 30)
+            
+            if retry_after is not None:
+                # Возвращаем пачку в начало очереди чата, порядок сообщений сохраняется
+                chat.messages.extendleft(reversed(batch))
+                self._pending += len(batch)
+                chat.blocked_until = time.monotonic() + retry_after
+        finally:
+            self._slots.release()
+            chat.sending = False
+            self._schedule(chat_id, chat)
+    
+    def _finish(self, batch: List[OutgoingMessage], delivered: bool):
+        for message in batch:
+            if not delivered:
+                self.failed += 1
+            if not message.future.done():
+                message.future.set_result(delivered)
+    
+    async def start(self):
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30),
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+        )
+        self._wakeup = asyncio.Event()
+        self._loop_task = asyncio.create_task(self._run())
+    
+    async def stop(self, drain_seconds: float):
+        if self._loop_task is None:
+            return
+        deadline = time.monotonic() + drain_seconds
+        while (self._pending or self._send_tasks) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        
+        self._loop_task.cancel()
+        await asyncio.gather(self._loop_task, *self._send_tasks, return_exceptions=True)
+        self._loop_task = None
+        for chat in self._chats.values():
+            self._finish(list(chat.messages), False)
+            chat.messages.clear()
+        self._chats.clear()
+        self._heap.clear()
+        self._pending = 0
+        await self._client.aclose()
+    
+    def stats(self) -> dict:
+        now = time.monotonic()
+        while self._recent and self._recent[0][0] < now - THROUGHPUT_WINDOW_SECONDS:
+            self._recent.popleft()
+        return {
+            "pending": self._pending,
+            "chats": len(self._chats),
+            "blocked_chats": sum(chat.blocked_until > now for chat in self._chats.values()),
+            "in_flight": len(self._send_tasks),
+            "requests": self.requests,
+            "delivered": self.delivered,
+            "coalesced": self.coalesced,
+            "rate_limited": self.rate_limited,
+            "retries": self.retries,
+            "failed": self.failed,
+            "messages_per_second": round(sum(count for _, count in self._recent) / THROUGHPUT_WINDOW_SECONDS, 3),
+        }
+
+
+telegram_dispatcher = TelegramDispatcher(
+    token=settings.telegram_bot_token,
+    base_url=settings.telegram_api_base_url,
+    global_rate=settings.telegram_dispatch_global_rate,
+    chat_rate=settings.telegram_dispatch_chat_rate,
+    group_rate_per_minute=settings.telegram_dispatch_group_rate_per_minute,
+    concurrency=settings.telegram_dispatch_concurrency,
+    max_attempts=settings.telegram_dispatch_max_attempts,
+)
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+ACCEPTED = "accepted"
+DUPLICATE = "duplicate"
+FULL = "full"
+
+
+class UpdateQueue:
+    # Вебхук кладёт апдейт в очередь и сразу отвечает Telegram, воркеры разбирают её в фоне.
+    # Апдейты одного чата обрабатываются строго по порядку: чат в работе не больше чем у одного воркера,
+    # а воркеры не простаивают в ожидании чужого чата
+    
+    def __init__(self, max_size: int, workers: int, dedup_size: int):
+        self.max_size = max_size
+        self.workers = workers
+        self.dedup_size = dedup_size
+        self.accepted = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.processed = 0
+        self.failed = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._recent: "OrderedDict[int, None]" = OrderedDict()
+        # chat_key -> апдейты в порядке поступления; ключ есть, пока чат в очереди или в работе
+        self._pending: Dict[Hashable, Deque[Tuple[float, Any]]] = {}
+        self._size = 0
+        self._in_flight = 0
+        self._ready: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._handler: Optional[Callable[[Any], Awaitable[Any]]] = None
+    
+    def _remember(self, update_id: int):
+        self._recent[update_id] = None
+        if len(self._recent) > self.dedup_size:
+            self._recent.popitem(last=False)
+    
+    def put(self, update_id: int, chat_key: Hashable, item: Any) -> str:
+        if update_id in self._recent:
+            self.duplicates += 1
+            return DUPLICATE
+        # Переполненная очередь не запоминает update_id: Telegram повторит доставку позже
+        if self._ready is None or self._size >= self.max_size:
+            self.rejected += 1
+            return FULL
+        
+        self._remember(update_id)
+        self.accepted += 1
+        self._size += 1
+        chat_updates = self._pending.get(chat_key)
+        if chat_updates is None:
+            self._pending[chat_key] = deque([(time.monotonic(), item)])
+            self._ready.put_nowait(chat_key)
+        else:
+            chat_updates.append((time.monotonic(), item))
+        return ACCEPTED
+    
+    async def _worker(self):
+        while True:
+            chat_key = await self._ready.get()
+            chat_updates = self._pending[chat_key]
+            enqueued_at, item = chat_updates.popleft()
+            self._size -= 1
+            self._in_flight += 1
+            self.last_lag = time.monotonic() - enqueued_at
+            self.max_lag = max(self.max_lag, self.last_lag)
+            try:
+                await self._handler(item)
+                self.processed += 1
+            except Exception:
+                self.failed += 1
+                logger.exception("Error processing Telegram update")
+            finally:
+                self._in_flight -= 1
+                # Следующий апдейт чата — в конец общей очереди, чтобы один активный чат не занимал воркер
+                if chat_updates:
+                    self._ready.put_nowait(chat_key)
+                else:
+                    del self._pending[chat_key]
+    
+    async def start(self, handler: Callable[[Any], Awaitable[Any]]):
+        self._handler = handler
+        self._ready = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+    
+    async def stop(self, drain_seconds: float):
+        deadline = time.monotonic() + drain_seconds
+        while (self._size or self._in_flight) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        if self._size or self._in_flight:
+            logger.warning(f"Stopping update queue with {self._size} pending and {self._in_flight} in-flight updates")
+        
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._ready = None
+    
+    def stats(self) -> dict:
+        now = time.monotonic()
+        oldest = min((chat_updates[0][0] for chat_updates in self._pending.values() if chat_updates), default=None)
+        return {
+            "depth": self._size,
+            "max_size": self.max_size,
+            "in_flight": self._in_flight,
+            "chats": len(self._pending),
+            "workers": len(self._tasks),
+            "oldest_pending_seconds": round(now - oldest, 3) if oldest is not None else 0.0,
+            "last_lag_seconds": round(self.last_lag, 3),
+            "max_lag_seconds": round(self.max_lag, 3),
+            "accepted": self.accepted,
+            "duplicates": self.duplicates,
+            "rejected": self.rejected,
+            "processed": self.processed,
+            "failed": self.failed,
+        }
+
+
+update_queue = UpdateQueue(
+    max_size=settings.telegram_update_queue_size,
+    workers=settings.telegram_update_workers,
+    dedup_size=settings.telegram_update_dedup_size,
+)
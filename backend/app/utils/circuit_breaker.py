@@ -0,0 +1,55 @@
+import time
+
+
+class CircuitBreaker:
+    # closed: запросы идут как обычно; после failure_threshold ошибок подряд — open, запросы сразу
+    # отбиваются; через reset_seconds — half_open, пропускаем один пробный запрос
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.rejected = 0
+        self.opened_count = 0
+        self._changed_at = time.monotonic()
+
+    def retry_after(self) -> float:
+        return max(self.reset_seconds - (time.monotonic() - self._changed_at), 0.0)
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        # В half_open пробный запрос мог оборваться, не сообщив результат: через reset_seconds пускаем следующий
+        if self.retry_after() > 0:
+            self.rejected += 1
+            return False
+        self._set_state(self.HALF_OPEN)
+        return True
+
+    def record_success(self):
+        self.failures = 0
+        if self.state != self.CLOSED:
+            self._set_state(self.CLOSED)
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+            self.opened_count += 1
+            self._set_state(self.OPEN)
+
+    def _set_state(self, state: str):
+        self.state = state
+        self._changed_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "rejected": self.rejected,
+            "opened": self.opened_count,
+            "retry_after_seconds": round(self.retry_after(), 3) if self.state != self.CLOSED else 0.0,
+        }
@@ -0,0 +1,20 @@
+from sqlalchemy.exc import DBAPIError
+
+EXCLUSION_VIOLATION = "23P01"
+UNIQUE_VIOLATION = "23505"
+SERIALIZATION_FAILURE = "40001"
+DEADLOCK_DETECTED = "40P01"
+
+
+def sqlstate(exc: DBAPIError):
+    # psycopg2 отдаёт код в pgcode, asyncpg — в sqlstate
+    orig = getattr(exc, "orig", None)
+    return getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+
+
+def is_exclusion_violation(exc: DBAPIError) -> bool:
+    return sqlstate(exc) == EXCLUSION_VIOLATION
+
+
+def is_retryable(exc: DBAPIError) -> bool:
+    return sqlstate(exc) in (SERIALIZATION_FAILURE, DEADLOCK_DETECTED)
@@ -0,0 +1,68 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def _dump(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _load(value, python_type):
+    if value is None:
+        return None
+    if python_type in (date, datetime):
+        return python_type.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(values: Sequence) -> str:
+    raw = json.dumps([_dump(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError(cursor)
+        return tuple(_load(value, column.type.python_type) for value, column in zip(values, columns))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query: Select,
+    sort_columns: Sequence,
+    cursor: Optional[str],
+    limit: int,
+    rows: bool = False
+) -> dict:
+    # Keyset-пагинация по убыванию ключа: WHERE (a, b, id) < (cursor) вместо OFFSET,
+    # цена страницы не зависит от глубины. Последний столбец ключа должен быть уникальным (id)
+    if cursor:
+        query = query.where(tuple_(*sort_columns) < tuple_(*decode_cursor(cursor, sort_columns)))
+    
+    result = await db.execute(query.order_by(*(column.desc() for column in sort_columns)).limit(limit + 1))
+    # rows=True: запрос по отдельным столбцам, строки отдаём как есть. Ключ курсора в обоих случаях
+    # берём по имени столбца: у Row это атрибут, а по ORM-атрибуту (Booking.id) _mapping его не найдёт
+    items = result.all() if rows else result.scalars().all()
+    
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in sort_columns])
+    
+    return {"items": items, "next_cursor": next_cursor}
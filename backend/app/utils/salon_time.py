@@ -0,0 +1,16 @@
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+from app.config import settings
+
+# Расписание мастеров и время записей хранятся в местном времени салона без зоны, а часы контейнера
+# обычно идут в UTC: «сейчас» для сравнения с ними берём только отсюда
+SALON_TZ = ZoneInfo(settings.salon_timezone)
+
+
+def salon_now() -> datetime:
+    return datetime.now(SALON_TZ).replace(tzinfo=None)
+
+
+def salon_today() -> date:
+    return salon_now().date()
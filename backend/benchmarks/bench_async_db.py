@@ -0,0 +1,222 @@
+# Пропускная способность под конкурентной нагрузкой: синхронная Session внутри async-роутов (как было до asyncpg)
+# против AsyncSession. Оба варианта выполняют одни и те же запросы ORM, отличается только слой БД.
+# Сервер — uvicorn в отдельном процессе, нагрузка — httpx из этого. Отдельно замеряется, как один медленный
+# запрос (pg_sleep) влияет на задержку быстрых: синхронная сессия держит цикл событий всего процесса.
+# Нужна БД из DATABASE_URL: данные создаются перед замером и удаляются после.
+# Запуск из backend/: python -m benchmarks.bench_async_db
+import asyncio
+import multiprocessing
+import socket
+import time
+from typing import List
+
+import httpx
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import selectinload, sessionmaker
+
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.models import Booking, Master, Service
+
+TELEGRAM_ID = 2_000_000_001
+SECONDS = 5
+CONCURRENCY = (1, 10, 50, 100)
+STALL_CLIENTS = 10
+SLOW_QUERY_SECONDS = 0.5
+ENDPOINTS = ("/masters", "/services", "/bookings")
+
+SEED = (
+    """INSERT INTO services (name, price, duration_minutes, is_active)
+    SELECT 'bench-async ' || g, 1000 + g, 60, true FROM generate_series(1, 10) g""",
+    """INSERT INTO masters (name, work_schedule, is_active)
+    SELECT 'bench-async ' || g, '{"monday": {"start": "09:00", "end": "18:00"}}', true FROM generate_series(1, 20) g""",
+    """INSERT INTO master_services (master_id, service_id)
+    SELECT m.id, s.id FROM masters m JOIN services s ON s.name LIKE 'bench-async %' AND (m.id + s.id) % 3 = 0
+    WHERE m.name LIKE 'bench-async %'""",
+    """INSERT INTO users (telegram_id, first_name) VALUES (:telegram_id, 'bench-async')""",
+    """INSERT INTO bookings (user_id, service_id, master_id, booking_date, booking_time, starts_at, ends_at, status)
+    SELECT (SELECT id FROM users WHERE telegram_id = :telegram_id),
+        (SELECT min(id) FROM services WHERE name LIKE 'bench-async %') + g % 10,
+        (SELECT min(id) FROM masters WHERE name LIKE 'bench-async %') + g % 20,
+        date '2030-01-01' + g, '10:00', timestamp '2030-01-01 10:00' + g * interval '1 day',
+        timestamp '2030-01-01 11:00' + g * interval '1 day', 'CONFIRMED'
+    FROM generate_series(1, 50) g""",
+)
+CLEANUP = (
+    "DELETE FROM bookings WHERE user_id IN (SELECT id FROM users WHERE telegram_id = :telegram_id)",
+    "DELETE FROM users WHERE telegram_id = :telegram_id",
+    "DELETE FROM master_services WHERE master_id IN (SELECT id FROM masters WHERE name LIKE 'bench-async %')",
+    "DELETE FROM masters WHERE name LIKE 'bench-async %'",
+    "DELETE FROM services WHERE name LIKE 'bench-async %'",
+)
+
+
+def masters_query():
+    return select(Master).options(selectinload(Master.services)).where(Master.is_active == True, Master.name.like("bench-async %"))
+
+
+def services_query():
+    return select(Service).where(Service.is_active == True, Service.name.like("bench-async %"))
+
+
+def bookings_query(user_id: int):
+    return (
+        select(Booking)
+        .options(selectinload(Booking.service), selectinload(Booking.master))
+        .where(Booking.user_id == user_id)
+        .order_by(Booking.booking_date, Booking.booking_time)
+        .limit(50)
+    )
+
+
+def build_app(mode: str, user_id: int):
+    from fastapi import FastAPI
+
+    app = FastAPI()
+
+    if mode == "sync":
+        # Так роуты работали до перехода на asyncpg: async def, но запрос блокирует цикл событий
+        sync_engine = create_engine(
+            settings.database_url, pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow
+        )
+        SyncSession = sessionmaker(bind=sync_engine, autoflush=False, expire_on_commit=False)
+
+        async def run(query) -> list:
+            with SyncSession() as db:
+                return db.execute(query).scalars().all()
+
+        async def sleep(seconds: float):
+            with SyncSession() as db:
+                db.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": seconds})
+    else:
+        async def run(query) -> list:
+            async with SessionLocal() as db:
+                return (await db.execute(query)).scalars().all()
+
+        async def sleep(seconds: float):
+            async with SessionLocal() as db:
+                await db.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": seconds})
+
+    @app.get("/masters")
+    async def masters():
+        return [{"id": master.id, "services": [service.id for service in master.services]} for master in await run(masters_query())]
+
+    @app.get("/services")
+    async def services():
+        return [{"id": service.id, "name": service.name} for service in await run(services_query())]
+
+    @app.get("/bookings")
+    async def bookings():
+        return [
+            {"id": booking.id, "service": booking.service.name, "master": booking.master.name}
+            for booking in await run(bookings_query(user_id))
+        ]
+
+    @app.get("/slow")
+    async def slow():
+        await sleep(SLOW_QUERY_SECONDS)
+        return {}
+
+    return app
+
+
+def serve(mode: str, user_id: int, sock: socket.socket):
+    import uvicorn
+
+    uvicorn.Server(uvicorn.Config(build_app(mode, user_id), log_level="warning")).run(sockets=[sock])
+
+
+def percentile(values: List[float], share: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * share), len(values) - 1)] * 1000
+
+
+async def load(base_url: str, clients: int, slow: bool = False) -> dict:
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + SECONDS
+
+    async def client(index: int, http: httpx.AsyncClient):
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            path = ENDPOINTS[(index + len(latencies)) % len(ENDPOINTS)]
+            started = time.perf_counter()
+            try:
+                response = await http.get(path)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+            except httpx.HTTPError:
+                errors += 1
+
+    async def slow_client(http: httpx.AsyncClient):
+        while time.perf_counter() < deadline:
+            await http.get("/slow")
+
+    limits = httpx.Limits(max_connections=clients + 1)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as http:
+        started = time.perf_counter()
+        tasks = [client(index, http) for index in range(clients)]
+        if slow:
+            tasks.append(slow_client(http))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": percentile(latencies, 0.5),
+        "p99": percentile(latencies, 0.99),
+        "errors": errors,
+    }
+
+
+def measure(mode: str, user_id: int) -> dict:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    base_url = "http://127.0.0.1:%d" % sock.getsockname()[1]
+    server = multiprocessing.Process(target=serve, args=(mode, user_id, sock), daemon=True)
+    server.start()
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(base_url + "/services").raise_for_status()
+                break
+            except httpx.HTTPError:
+                time.sleep(0.1)
+        results = {clients: asyncio.run(load(base_url, clients)) for clients in CONCURRENCY}
+        results["stall"] = asyncio.run(load(base_url, STALL_CLIENTS, slow=True))
+        return results
+    finally:
+        server.terminate()
+        server.join()
+        sock.close()
+
+
+async def execute(statements) -> int:
+    async with engine.begin() as conn:
+        for statement in statements:
+            await conn.execute(text(statement), {"telegram_id": TELEGRAM_ID})
+        user_id = (await conn.execute(text("SELECT id FROM users WHERE telegram_id = :telegram_id"), {"telegram_id": TELEGRAM_ID})).scalar()
+    await engine.dispose()
+    return user_id
+
+
+def main():
+    asyncio.run(execute(CLEANUP))
+    user_id = asyncio.run(execute(SEED))
+    try:
+        results = {mode: measure(mode, user_id) for mode in ("sync", "async")}
+    finally:
+        asyncio.run(execute(CLEANUP))
+
+    print(f"Mixed GET {', '.join(ENDPOINTS)}, {SECONDS} s per run, pool {settings.db_pool_size}+{settings.db_max_overflow}")
+    for clients in (*CONCURRENCY, "stall"):
+        label = f"{STALL_CLIENTS} + pg_sleep({SLOW_QUERY_SECONDS:g})" if clients == "stall" else f"{clients} concurrent"
+        row = "   ".join(
+            f"{mode} {results[mode][clients]['rps']:6.0f} req/s p50 {results[mode][clients]['p50']:6.1f} ms"
+            f" p99 {results[mode][clients]['p99']:7.1f} ms err {results[mode][clients]['errors']}"
+            for mode in ("sync", "async")
+        )
+        print(f"  {label:<22} {row}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# Пропускная способность очереди jobs: несколько процессов с воркерами разбирают одну таблицу через SKIP LOCKED.
+# Каждый прогон проверяет, что любая задача выполнена ровно один раз и записана как DONE.
+# Нужна БД из DATABASE_URL с пустой очередью: воркеры берут любые готовые задачи, а чужие без обработчика уронят.
+# Запуск из backend/: python -m benchmarks.bench_jobs
+import asyncio
+import multiprocessing
+import time
+
+from sqlalchemy import text
+
+NAME = "bench.noop"
+# (задач, процессов, воркеров в процессе, пачка, время задачи в секундах)
+CASES = (
+    (20000, 1, 1, 1, 0),
+    (20000, 1, 1, 10, 0),
+    (20000, 1, 4, 10, 0),
+    (20000, 2, 4, 10, 0),
+    (20000, 4, 4, 10, 0),
+    (3000, 1, 2, 1, 0.02),
+    (3000, 1, 4, 1, 0.02),
+    (3000, 2, 4, 1, 0.02),
+    (3000, 4, 4, 1, 0.02),
+    (3000, 4, 8, 1, 0.02),
+)
+
+
+async def seed(jobs: int):
+    from app.database import engine
+
+    async with engine.begin() as conn:
+        busy = (await conn.execute(text(
+            "SELECT count(*) FROM jobs WHERE status IN ('QUEUED', 'RUNNING') AND name <> :name"
+        ), {"name": NAME})).scalar()
+        if busy:
+            raise SystemExit(f"jobs has {busy} queued or running job(s): run the benchmark on an idle database")
+        await conn.execute(text("DELETE FROM jobs WHERE name = :name"), {"name": NAME})
+        await conn.execute(text(
+            """INSERT INTO jobs (name, payload, status, run_at, attempts, max_attempts)
+            SELECT :name, json_build_object('i', g), 'QUEUED', now(), 0, 5 FROM generate_series(1, :jobs) g"""
+        ), {"name": NAME, "jobs": jobs})
+        await conn.execute(text("ANALYZE jobs"))
+    await engine.dispose()
+
+
+async def results() -> dict:
+    from app.database import engine
+
+    async with engine.connect() as conn:
+        rows = (await conn.execute(text(
+            "SELECT status, count(*) FROM jobs WHERE name = :name GROUP BY status"
+        ), {"name": NAME})).all()
+        await conn.execute(text("DELETE FROM jobs WHERE name = :name"), {"name": NAME})
+        await conn.commit()
+    await engine.dispose()
+    return {status: count for status, count in rows}
+
+
+def worker_process(workers: int, batch: int, seconds: float, out):
+    from app.services.jobs import JobQueue
+
+    async def main():
+        queue = JobQueue(workers, batch, 0.05, 300, 5, 1, 10)
+        executed = []
+
+        @queue.task(NAME)
+        async def handle(payload):
+            executed.append(payload["i"])
+            if seconds:
+                await asyncio.sleep(seconds)
+
+        await queue.start()
+        # Без периодических задач и _reap: замеряем только взятие, выполнение и запись результата
+        queue._scheduler_task.cancel()
+        while True:
+            await asyncio.sleep(0.1)
+            counts = await queue.counts()
+            if counts["queued"] == 0 and counts["running"] == 0:
+                break
+        await queue.stop(5)
+        out.put(executed)
+
+    asyncio.run(main())
+
+
+def bench(jobs: int, processes: int, workers: int, batch: int, seconds: float):
+    asyncio.run(seed(jobs))
+    out = multiprocessing.Queue()
+    started = time.perf_counter()
+    children = [
+        multiprocessing.Process(target=worker_process, args=(workers, batch, seconds, out))
+        for _ in range(processes)
+    ]
+    for child in children:
+        child.start()
+    executed = [i for _ in children for i in out.get()]
+    for child in children:
+        child.join()
+    elapsed = time.perf_counter() - started
+    statuses = asyncio.run(results())
+
+    assert sorted(executed) == list(range(1, jobs + 1)), "some jobs ran twice or not at all"
+    assert statuses == {"DONE": jobs}, statuses
+    print(
+        f"  {jobs:>6} jobs x {seconds * 1000:3.0f} ms   {processes} proc x {workers} workers, batch {batch:<3}"
+        f" {jobs / elapsed:8.0f} jobs/s   each ran once"
+    )
+
+
+def main():
+    print("Throughput from start to empty queue, including process start-up")
+    for case in CASES:
+        bench(*case)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# Горячие списки из кортежей запроса + orjson против старого пути ORM -> response_model -> json.dumps, 1000 строк.
+# Нужна БД из DATABASE_URL: данные создаются в транзакции и откатываются, рабочие таблицы не меняются.
+# Запуск из backend/: python -m benchmarks.bench_serialization
+import asyncio
+import json
+import time
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.database import engine
+from app.models import Booking, Master
+from app.routes.bookings import BOOKING_LOAD_OPTIONS
+from app.schemas import BookingResponse, MasterResponse, Page
+from app.services.rows import booking_rows, booking_rows_query, master_rows, master_rows_query
+from app.utils.pagination import fetch_page
+from app.utils.responses import dumps
+
+ROWS = 1000
+ROUNDS = 15
+BOOKING_SORT = (Booking.booking_date, Booking.booking_time, Booking.id)
+BOOKING_PAGE = TypeAdapter(Page[BookingResponse])
+MASTER_LIST = TypeAdapter(List[MasterResponse])
+
+# Данные с тем, на чём сериализация обычно и расходится: NULL, Decimal с копейками, кириллица,
+# JSON-расписание, запись без мастера, updated_at только у части строк
+SEED = (
+    """INSERT INTO services (name, category, description, price, duration_minutes, is_active, updated_at)
+    SELECT 'Услуга «' || g || '»', CASE WHEN g % 4 = 0 THEN NULL ELSE 'Волосы' END, 'Описание ' || g,
+        1500.50 + g, 30 + g % 4 * 30, true, CASE WHEN g % 3 = 0 THEN now() END
+    FROM generate_series(1, 20) g""",
+    """INSERT INTO masters (name, specialization, phone, telegram_id, work_schedule, rating, reviews_count,
+        rating_sum, rating_1_count, rating_2_count, rating_3_count, rating_4_count, rating_5_count, is_active, updated_at)
+    SELECT 'Мастер ' || g, 'Парикмахер', '+7900' || g, CASE WHEN g % 5 = 0 THEN NULL ELSE 500000 + g END,
+        '{"monday": {"start": "09:00", "end": "18:00"}}', CASE WHEN g % 7 = 0 THEN NULL ELSE 4.25 END,
+        10, 42, 0, 1, 1, 3, 5, true, CASE WHEN g % 2 = 0 THEN now() END
+    FROM generate_series(1, :rows) g""",
+    """INSERT INTO master_services (master_id, service_id)
+    SELECT m.id, s.id FROM (SELECT id, row_number() OVER (ORDER BY id) AS n FROM masters ORDER BY id DESC LIMIT :rows) m
+    JOIN (SELECT id, row_number() OVER (ORDER BY id) AS n FROM services ORDER BY id DESC LIMIT 20) s
+        ON s.n IN (1 + m.n % 20, 1 + (m.n + 7) % 20)""",
+    """INSERT INTO users (telegram_id, first_name) VALUES (:telegram_id, 'Клиент')""",
+    """INSERT INTO bookings (user_id, service_id, master_id, booking_date, booking_time, starts_at, ends_at, status, comment)
+    SELECT (SELECT id FROM users WHERE telegram_id = :telegram_id),
+        (SELECT max(id) FROM services) - g % 20,
+        CASE WHEN g % 10 = 0 THEN NULL ELSE (SELECT max(id) FROM masters) - g % 50 END,
+        date '2030-01-01' + g, '10:00', timestamp '2030-01-01 10:00' + g * interval '1 day',
+        timestamp '2030-01-01 11:00' + g * interval '1 day', 'CONFIRMED',
+        CASE WHEN g % 3 = 0 THEN NULL ELSE 'Комментарий ' || g END
+    FROM generate_series(1, :rows) g""",
+)
+TELEGRAM_ID = 2_000_000_000
+
+
+async def seed(conn, rows: int) -> int:
+    for statement in SEED:
+        await conn.execute(text(statement), {"rows": rows, "telegram_id": TELEGRAM_ID})
+    # Без свежей статистики на почти пустой базе планировщик выбирает nested loop по seq scan, и замер — о нём
+    await conn.execute(text("ANALYZE services, masters, master_services, users, bookings"))
+    return (await conn.execute(text("SELECT id FROM users WHERE telegram_id = :telegram_id"), {"telegram_id": TELEGRAM_ID})).scalar()
+
+
+def response_model_body(adapter: TypeAdapter, data) -> bytes:
+    # Так FastAPI 0.104 отдавал response_model: валидация from_attributes, dump в JSON-типы и json.dumps
+    content = adapter.dump_python(adapter.validate_python(data, from_attributes=True), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+async def legacy_bookings(db: AsyncSession, user_id: int, limit: int) -> bytes:
+    query = select(Booking).options(*BOOKING_LOAD_OPTIONS).where(Booking.user_id == user_id)
+    return response_model_body(BOOKING_PAGE, await fetch_page(db, query, BOOKING_SORT, None, limit))
+
+
+async def row_bookings(db: AsyncSession, user_id: int, limit: int) -> bytes:
+    query = booking_rows_query().where(Booking.user_id == user_id)
+    page = await fetch_page(db, query, BOOKING_SORT, None, limit, rows=True)
+    return dumps({"items": await booking_rows(db, page["items"]), "next_cursor": page["next_cursor"]})
+
+
+async def legacy_masters(db: AsyncSession) -> bytes:
+    result = await db.execute(select(Master).options(selectinload(Master.services)).where(Master.is_active == True))
+    return response_model_body(MASTER_LIST, result.scalars().all())
+
+
+async def row_masters(db: AsyncSession) -> bytes:
+    result = await db.execute(master_rows_query().where(Master.is_active == True))
+    return dumps(await master_rows(db, result.all()))
+
+
+async def measure(db: AsyncSession, build) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        # Каждый прогон с пустой identity map, как в отдельном запросе
+        db.expunge_all()
+        started = time.perf_counter()
+        await build()
+        timings.append(time.perf_counter() - started)
+    return sorted(timings)[ROUNDS // 2] * 1000
+
+
+async def main():
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            user_id = await seed(conn, ROWS)
+            db = AsyncSession(bind=conn, expire_on_commit=False)
+            cases = (
+                ("get_bookings", lambda: legacy_bookings(db, user_id, ROWS), lambda: row_bookings(db, user_id, ROWS)),
+                ("get_masters", lambda: legacy_masters(db), lambda: row_masters(db)),
+            )
+            print(f"{ROWS} rows, median of {ROUNDS}, query + serialization")
+            for label, legacy, rows in cases:
+                legacy_body, rows_body = await legacy(), await rows()
+                assert legacy_body == rows_body, f"{label}: response bodies differ"
+                legacy_ms = await measure(db, legacy)
+                rows_ms = await measure(db, rows)
+                print(
+                    f"  {label:<13} response_model {legacy_ms:7.1f} ms   rows {rows_ms:7.1f} ms"
+                    f"   x{legacy_ms / rows_ms:.1f}   {len(rows_body)} bytes, identical"
+                )
+            await db.close()
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
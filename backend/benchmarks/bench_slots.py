@@ -0,0 +1,97 @@
+# Битовый движок слотов против старого пути с Pydantic-моделью на каждый слот, 40 мастеров на один день.
+# Запуск из backend/: python -m benchmarks.bench_slots
+import json
+import os
+import timeit
+from datetime import date, datetime, timedelta
+
+# Бенчмарк не ходит в БД, но app.schemas тянет за собой настройки
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/booking_db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.schemas import AvailableSlotsResponse, AvailableTimeSlot
+from app.services.slots import MasterDay, build_slots, merge_free_slots, occupancy_mask, working_window
+from app.utils.responses import dumps
+
+MASTERS = 40
+DURATION = 60
+DAY = date(2030, 1, 7)
+SCHEDULE = {"monday": {"start": "08:00", "end": "21:00"}}
+
+
+def masters():
+    # У каждого мастера несколько записей в разное время, чтобы слоты были и свободные, и занятые
+    return [
+        (master_id, f"Мастер {master_id}", [(f"{9 + (master_id + k * 3) % 11:02d}:00", DURATION) for k in range(4)])
+        for master_id in range(1, MASTERS + 1)
+    ]
+
+
+def legacy_slots(data) -> bytes:
+    # Путь до перехода на битовые маски: datetime-цикл, множество занятых стартов и модель на каждый слот
+    all_slots = []
+    for master_id, name, bookings in data:
+        day_schedule = SCHEDULE.get(DAY.strftime("%A").lower(), {})
+        start = datetime.strptime(day_schedule.get("start", "09:00"), "%H:%M").time()
+        end = datetime.strptime(day_schedule.get("end", "18:00"), "%H:%M").time()
+        duration = timedelta(minutes=DURATION)
+        current = datetime.combine(DAY, start)
+        end_datetime = datetime.combine(DAY, end)
+        booked = {booking_time for booking_time, _ in bookings}
+        while current + duration <= end_datetime:
+            time_str = current.time().strftime("%H:%M")
+            all_slots.append(AvailableTimeSlot(
+                time=time_str, available=time_str not in booked, master_id=master_id, master_name=name
+            ))
+            current += timedelta(minutes=30)
+    all_slots.sort(key=lambda slot: slot.time)
+    response = AvailableSlotsResponse(date=DAY, slots=all_slots)
+    # Так FastAPI сериализовал response_model: dump в JSON-совместимые типы и json.dumps
+    return json.dumps(response.model_dump(mode="json"), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def master_days_from(data):
+    return [
+        MasterDay(
+            master_id,
+            name,
+            working_window(SCHEDULE, DAY),
+            occupancy_mask(
+                (int(booking_time[:2]) * 60, int(booking_time[:2]) * 60 + duration) for booking_time, duration in bookings
+            ),
+        )
+        for master_id, name, bookings in data
+    ]
+
+
+def engine_slots(data) -> bytes:
+    return dumps({"date": DAY.isoformat(), "slots": build_slots(master_days_from(data), DURATION)})
+
+
+def engine_merged(data) -> bytes:
+    return dumps({"date": DAY.isoformat(), "slots": merge_free_slots(master_days_from(data), DURATION)})
+
+
+def measure(func, data, number: int = 200) -> float:
+    return min(timeit.repeat(lambda: func(data), number=number, repeat=5)) / number * 1000
+
+
+def main():
+    data = masters()
+    legacy = json.loads(legacy_slots(data))
+    engine = json.loads(engine_slots(data))
+    # Слоты совпадают по времени и мастеру; доступность у нового движка строже (учитывает пересечения)
+    assert [(slot["time"], slot["master_id"]) for slot in legacy["slots"]] == \
+        [(slot["time"], slot["master_id"]) for slot in engine["slots"]]
+    
+    print(f"{MASTERS} masters, 08:00-21:00, {DURATION}-minute service")
+    legacy_ms = measure(legacy_slots, data)
+    print(f"  {'legacy':<17} {legacy_ms:7.3f} ms   {len(legacy['slots'])} slots")
+    for label, func in (("build_slots", engine_slots), ("merge_free_slots", engine_merged)):
+        engine_ms = measure(func, data)
+        slots = len(json.loads(func(data))["slots"])
+        print(f"  {label:<17} {engine_ms:7.3f} ms   {slots} slots   x{legacy_ms / engine_ms:.1f} vs legacy")
+
+
+if __name__ == "__main__":
+    main()
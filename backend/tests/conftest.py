@@ -0,0 +1,106 @@
+import asyncio
+import os
+
+import pytest
+
+# Настройки читаются при импорте app: тестам без БД хватает заглушек, тестам с БД нужен TEST_DATABASE_URL
+os.environ.setdefault("DATABASE_URL", os.getenv("TEST_DATABASE_URL", "postgresql://localhost/booking_db"))
+os.environ.setdefault("SECRET_KEY", "test")
+# Клиент в тестах представляется заголовком X-Telegram-User-Id, без подписи initData
+os.environ.setdefault("TELEGRAM_ALLOW_UNSIGNED_USER_ID", "true")
+
+
+@pytest.fixture(scope="session")
+def loop():
+    # Пул asyncpg привязан к циклу событий, поэтому все тесты с БД идут в одном цикле
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def run(loop):
+    return loop.run_until_complete
+
+
+@pytest.fixture(scope="session")
+def database(run):
+    if not os.getenv("TEST_DATABASE_URL"):
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    from alembic import command
+    from alembic.config import Config
+
+    command.upgrade(Config(os.path.join(os.path.dirname(os.path.dirname(__file__)), "alembic.ini")), "head")
+
+    from app.database import engine
+    yield engine
+    run(engine.dispose())
+
+
+@pytest.fixture
+def db(database, run):
+    from sqlalchemy import text
+    from app.database import SessionLocal
+    from app.middleware.auth import user_cache, verified_init_data
+    from app.services.catalog_cache import catalog_cache
+    from app.services.occupancy import occupancy_index
+
+    async def truncate():
+        async with database.begin() as conn:
+            tables = (await conn.execute(text(
+                "SELECT tablename FROM pg_tables WHERE schemaname = 'public' AND tablename <> 'alembic_version'"
+            ))).scalars().all()
+            await conn.execute(text(f"TRUNCATE {', '.join(tables)} RESTART IDENTITY CASCADE"))
+
+    run(truncate())
+    # Кэши процесса переживают TRUNCATE: id после RESTART IDENTITY совпадут с id прошлого теста
+    user_cache.clear()
+    verified_init_data.clear()
+    catalog_cache.clear()
+    occupancy_index.invalidate()
+
+    session = SessionLocal()
+    yield session
+    run(session.close())
+
+
+@pytest.fixture
+def client(db, run):
+    import httpx
+    from app.main import app
+
+    client = httpx.AsyncClient(app=app, base_url="http://test")
+    yield client
+    run(client.aclose())
+
+
+@pytest.fixture(scope="session")
+def bot_api(run):
+    from fake_bot_api import FakeBotApi
+
+    api = FakeBotApi()
+    run(api.start())
+    yield api
+    run(api.stop())
+
+
+@pytest.fixture
+def dispatcher(bot_api, run):
+    # Отдельный диспетчер с лимитами Telegram, который шлёт в фейковый Bot API
+    from fake_bot_api import CHAT_INTERVAL_SECONDS, GLOBAL_LIMIT_PER_SECOND
+    from app.services.telegram_dispatcher import TelegramDispatcher
+
+    bot_api.reset()
+    dispatcher = TelegramDispatcher(
+        token="123:test",
+        base_url=bot_api.base_url,
+        global_rate=GLOBAL_LIMIT_PER_SECOND,
+        chat_rate=1 / CHAT_INTERVAL_SECONDS,
+        group_rate_per_minute=20,
+        concurrency=10,
+        max_attempts=3,
+    )
+    run(dispatcher.start())
+    yield dispatcher
+    run(dispatcher.stop(0))
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import socket
+import time
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Set
+
+import uvicorn
+
+GLOBAL_LIMIT_PER_SECOND = 30
+CHAT_INTERVAL_SECONDS = 1.0
+GROUP_INTERVAL_SECONDS = 3.0
+# Время фиксируется на сервере, после пересылки по сети: интервалы проверяем с небольшим допуском
+JITTER_SECONDS = 0.05
+
+
+class SentMessage(NamedTuple):
+    at: float
+    chat_id: int
+    payload: dict
+    status: int
+
+
+class _Server(uvicorn.Server):
+    # Сигналы оставляем pytest: Ctrl+C должен прерывать тесты, а не гасить фейковый сервер
+    def install_signal_handlers(self):
+        pass
+
+
+class FakeBotApi:
+    # sendMessage Bot API на локальном порту. Лимиты проверяет так же, как Telegram: не больше 30 сообщений
+    # в секунду на бота, 1/с в личный чат и 20/мин в группу, иначе 429 с retry_after.
+    # flood: чат -> retry_after для одного принудительного 429; blocked: чаты, где бот заблокирован (403)
+
+    def __init__(self):
+        self.base_url = ""
+        self.requests: List[SentMessage] = []
+        self.flood: Dict[int, float] = {}
+        self.blocked: Set[int] = set()
+        self.violations = 0
+        self._accepted: Deque[float] = deque()
+        self._last_accepted: Dict[int, float] = {}
+        self._server = None
+        self._task = None
+
+    def reset(self):
+        self.requests.clear()
+        self.flood.clear()
+        self.blocked.clear()
+        self.violations = 0
+        self._accepted.clear()
+        self._last_accepted.clear()
+
+    def chat(self, chat_id: int) -> List[SentMessage]:
+        return [request for request in self.requests if request.chat_id == chat_id]
+
+    def _respond(self, now: float, chat_id: int) -> tuple:
+        if chat_id in self.blocked:
+            return 403, {"ok": False, "error_code": 403, "description": "Forbidden: bot was blocked by the user"}
+
+        if chat_id in self.flood:
+            retry_after = self.flood.pop(chat_id)
+            return 429, {"ok": False, "error_code": 429, "parameters": {"retry_after": retry_after}}
+
+        while self._accepted and self._accepted[0] <= now - (1 - JITTER_SECONDS):
+            self._accepted.popleft()
+        interval = GROUP_INTERVAL_SECONDS if chat_id < 0 else CHAT_INTERVAL_SECONDS
+        last = self._last_accepted.get(chat_id)
+        if len(self._accepted) >= GLOBAL_LIMIT_PER_SECOND or (last is not None and now - last < interval - JITTER_SECONDS):
+            self.violations += 1
+            return 429, {"ok": False, "error_code": 429, "parameters": {"retry_after": 1}}
+
+        self._accepted.append(now)
+        self._last_accepted[chat_id] = now
+        return 200, {"ok": True, "result": {"message_id": len(self.requests) + 1}}
+
+    async def __call__(self, scope, receive, send):
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        payload = json.loads(body)
+        now = time.monotonic()
+        status, response = self._respond(now, payload["chat_id"])
+        self.requests.append(SentMessage(now, payload["chat_id"], payload, status))
+
+        await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": json.dumps(response).encode()})
+
+    async def start(self):
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        self.base_url = "http://127.0.0.1:%d" % sock.getsockname()[1]
+        self._server = _Server(uvicorn.Config(self, lifespan="off", log_level="warning"))
+        self._task = asyncio.create_task(self._server.serve(sockets=[sock]))
+        while not self._server.started:
+            await asyncio.sleep(0.01)
+
+    async def stop(self):
+        self._server.should_exit = True
+        await self._task
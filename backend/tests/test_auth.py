@@ -0,0 +1,100 @@
+import hashlib
+import hmac
+import json
+import time
+from types import SimpleNamespace
+from typing import Optional
+from urllib.parse import urlencode
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import settings
+from app.middleware import auth
+from app.middleware.auth import verify_init_data, verified_init_data
+from app.models import User
+
+BOT_TOKEN = "123456:test-token"
+TELEGRAM_ID = 777000
+
+
+def sign(fields: dict, bot_token: str = BOT_TOKEN) -> str:
+    # Подпись Telegram WebApp: HMAC-SHA256 строки "key=value" по алфавиту, ключ — HMAC("WebAppData", токен)
+    data_check_string = "\n".join(f"{key}={value}" for key, value in sorted(fields.items()))
+    secret = hmac.new(b"WebAppData", bot_token.encode(), hashlib.sha256).digest()
+    return urlencode({**fields, "hash": hmac.new(secret, data_check_string.encode(), hashlib.sha256).hexdigest()})
+
+
+def init_data(auth_date: Optional[float] = None, telegram_id: int = TELEGRAM_ID) -> str:
+    return sign({
+        "auth_date": str(int(time.time() if auth_date is None else auth_date)),
+        "query_id": "AAH",
+        "user": json.dumps({"id": telegram_id, "first_name": "Анна"}, ensure_ascii=False),
+    })
+
+
+@pytest.fixture(autouse=True)
+def signed_auth(monkeypatch):
+    monkeypatch.setattr(settings, "telegram_bot_token", BOT_TOKEN)
+    monkeypatch.setattr(settings, "telegram_allow_unsigned_user_id", False)
+    verified_init_data.clear()
+    yield
+    verified_init_data.clear()
+
+
+def rejected(data: str) -> str:
+    with pytest.raises(HTTPException) as error:
+        verify_init_data(data)
+    assert error.value.status_code == 401
+    return error.value.detail
+
+
+def test_signed_init_data_is_accepted():
+    assert verify_init_data(init_data()) == TELEGRAM_ID
+
+
+def test_tampered_init_data_is_rejected():
+    data = init_data()
+    assert rejected(data.replace(str(TELEGRAM_ID), str(TELEGRAM_ID + 1))) == "Invalid Telegram init data"
+    assert rejected(data + "&start_param=admin") == "Invalid Telegram init data"
+    assert rejected(sign({"auth_date": str(int(time.time())), "user": '{"id": 1}'}, "654321:other-bot")) == "Invalid Telegram init data"
+    assert verified_init_data.stats()["entries"] == 0
+
+
+def test_expired_init_data_is_rejected():
+    max_age = settings.telegram_init_data_max_age_seconds
+    assert rejected(init_data(auth_date=time.time() - max_age - 1)) == "Telegram init data expired"
+    assert verify_init_data(init_data(auth_date=time.time() - max_age + 60)) == TELEGRAM_ID
+
+
+def test_verified_init_data_is_cached_until_the_signature_expires(monkeypatch):
+    data = init_data(auth_date=time.time() - settings.telegram_init_data_max_age_seconds + 60)
+    assert verify_init_data(data) == TELEGRAM_ID
+
+    # Повторный запрос с той же строкой HMAC не пересчитывает
+    def no_hmac(bot_token):
+        raise AssertionError("HMAC recomputed on a cache hit")
+
+    secret_key = auth._secret_key
+    monkeypatch.setattr(auth, "_secret_key", no_hmac)
+    hits = verified_init_data.stats()["hits"]
+    assert verify_init_data(data) == TELEGRAM_ID
+    assert verified_init_data.stats()["hits"] == hits + 1
+
+    # Запись живёт не дольше подписи: через минуту строка снова проверяется и отклоняется
+    monkeypatch.setattr(auth, "_secret_key", secret_key)
+    wall, monotonic = time.time(), time.monotonic()
+    monkeypatch.setattr(auth, "time", SimpleNamespace(time=lambda: wall + 61, monotonic=lambda: monotonic + 61))
+    assert rejected(data) == "Telegram init data expired"
+
+
+def test_routes_accept_only_signed_init_data(client, db, run):
+    async def seed():
+        db.add(User(telegram_id=TELEGRAM_ID, first_name="Анна"))
+        await db.commit()
+
+    run(seed())
+    assert run(client.get("/api/users/me", headers={"X-Telegram-Init-Data": init_data()})).json()["telegram_id"] == TELEGRAM_ID
+    assert run(client.get("/api/users/me", headers={"X-Telegram-Init-Data": init_data() + "x"})).status_code == 401
+    # Без подписи заголовку с id больше не верят
+    assert run(client.get("/api/users/me", headers={"X-Telegram-User-Id": str(TELEGRAM_ID)})).status_code == 401
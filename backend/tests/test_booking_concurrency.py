@@ -0,0 +1,60 @@
+import asyncio
+import time
+from datetime import date
+
+from sqlalchemy import func, select
+
+from app.models import Booking, Master, Service, User
+
+RACERS = 200
+DAY = date(2030, 1, 7)
+# Проигравшие упираются в exclusion-констрейнт и сразу получают 409: хвост не должен расти с числом участников
+P99_SECONDS = 5.0
+P50_TAIL_RATIO = 3
+
+
+def seed(db, run):
+    async def insert():
+        service = Service(name="Стрижка", price=1000, duration_minutes=60)
+        master = Master(name="Анна")
+        db.add_all([service, master])
+        db.add_all([User(telegram_id=1000 + i, first_name=f"Клиент {i}") for i in range(RACERS)])
+        await db.commit()
+        return service.id, master.id
+
+    return run(insert())
+
+
+def test_one_winner_per_slot(client, db, run):
+    service_id, master_id = seed(db, run)
+    payload = {
+        "service_id": service_id,
+        "master_id": master_id,
+        "booking_date": DAY.isoformat(),
+        "booking_time": "10:00",
+    }
+
+    async def book(telegram_id):
+        started = time.perf_counter()
+        response = await client.post("/api/bookings/", json=payload, headers={"X-Telegram-User-Id": str(telegram_id)})
+        return response.status_code, time.perf_counter() - started
+
+    async def race():
+        return await asyncio.gather(*(book(1000 + i) for i in range(RACERS)))
+
+    results = run(race())
+    statuses = sorted(status for status, _ in results)
+    assert statuses.count(200) == 1
+    assert statuses.count(409) == RACERS - 1
+
+    latencies = sorted(latency for _, latency in results)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    p50 = latencies[len(latencies) // 2]
+    assert p99 < P99_SECONDS, f"p99 {p99:.3f}s"
+    # Все запросы обслуживает один цикл событий, поэтому медиана — это в основном очередь к пулу; хвост не должен от неё отрываться
+    assert p99 < P50_TAIL_RATIO * p50, f"p99 {p99:.3f}s, p50 {p50:.3f}s"
+
+    async def stored():
+        return (await db.execute(select(func.count()).select_from(Booking))).scalar()
+
+    assert run(stored()) == 1
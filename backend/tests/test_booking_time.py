@@ -0,0 +1,54 @@
+from datetime import date
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas import BookingCreate, SlotHoldCreate
+from app.services.allocator import pick_master
+from app.services.slots import MasterDay, booking_interval, booking_period, fits_window, parse_time
+
+DAY = date(2030, 1, 7)
+WINDOW = (parse_time("09:00"), parse_time("18:00"))
+
+
+@pytest.mark.parametrize("value", ["00:00", "09:30", "23:59"])
+def test_booking_time_accepts_hh_mm(value):
+    assert BookingCreate(service_id=1, booking_date=DAY, booking_time=value).booking_time == value
+    assert SlotHoldCreate(service_id=1, master_id=1, booking_date=DAY, booking_time=value).booking_time == value
+
+
+@pytest.mark.parametrize("value", ["24:30", "9:30", "10:60", "10:00:00", "", "ten"])
+def test_booking_time_rejects_malformed(value):
+    with pytest.raises(ValidationError):
+        BookingCreate(service_id=1, booking_date=DAY, booking_time=value)
+    with pytest.raises(ValidationError):
+        SlotHoldCreate(service_id=1, master_id=1, booking_date=DAY, booking_time=value)
+
+
+def interval(value: str, duration: int = 60):
+    return booking_interval(*booking_period(DAY, value, duration))
+
+
+@pytest.mark.parametrize("value, fits", [
+    ("09:00", True),
+    ("17:00", True),
+    ("10:15", False),  # вне 30-минутной сетки
+    ("08:30", False),  # до начала смены
+    ("17:30", False),  # заканчивается после конца смены
+    ("23:30", False),  # переходит через полночь
+])
+def test_fits_window(value, fits):
+    assert fits_window(WINDOW, interval(value)) is fits
+
+
+def test_grid_follows_window_start():
+    window = (parse_time("09:15"), parse_time("18:00"))
+    assert fits_window(window, interval("09:45"))
+    assert not fits_window(window, interval("10:00"))
+
+
+def test_pick_master_skips_off_grid_and_out_of_window():
+    days = [MasterDay(1, "A", WINDOW, 0), MasterDay(2, "B", (parse_time("12:00"), parse_time("20:00")), 0)]
+    assert pick_master(days, interval("10:15")) is None
+    assert pick_master(days, interval("19:00")) == 2
+    assert pick_master(days, interval("10:00")) == 1
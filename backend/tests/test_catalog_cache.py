@@ -0,0 +1,63 @@
+import itertools
+
+from sqlalchemy import text
+
+from app import database
+from app.database import create_engine, create_sessionmaker
+from app.models import Service
+from app.services.catalog_cache import catalog_cache
+
+
+def seed_service(db, run):
+    async def insert():
+        db.add(Service(name="Стрижка", price=1000, duration_minutes=60))
+        await db.commit()
+
+    run(insert())
+
+
+def test_cache_miss_reads_the_primary(client, db, run, monkeypatch):
+    seed_service(db, run)
+    # Реплика, до которой не достучаться: каталог её не трогает, остальные GET-роуты трогают
+    replica = create_engine("postgresql://nobody@127.0.0.1:1/booking_db")
+    monkeypatch.setattr(database, "_replica_cycle", itertools.cycle([create_sessionmaker(replica)]))
+
+    for url in ("/api/services/", "/api/masters/", "/api/promotions/", "/api/settings/", "/api/bootstrap/"):
+        assert run(client.get(url)).status_code == 200, url
+    run(replica.dispose())
+
+
+def test_read_primary_answers_from_the_primary_without_touching_the_entry(client, database, db, run):
+    seed_service(db, run)
+    assert run(client.get("/api/services/")).json()[0]["name"] == "Стрижка"
+
+    async def rename():
+        # Мимо ORM: версия таблицы не растёт, как при правке из другого процесса
+        async with database.begin() as conn:
+            await conn.execute(text("UPDATE services SET name = 'Окрашивание'"))
+
+    run(rename())
+    assert run(client.get("/api/services/")).json()[0]["name"] == "Стрижка"
+    assert run(client.get("/api/services/", headers={"X-Read-Primary": "1"})).json()[0]["name"] == "Окрашивание"
+    # Заголовок может прислать любой клиент: общая запись остаётся до своей версии или TTL
+    assert run(client.get("/api/services/")).json()[0]["name"] == "Стрижка"
+    assert catalog_cache.stats()["bypassed"] == 1
+
+
+def test_entries_are_bounded(client, db, run, monkeypatch):
+    seed_service(db, run)
+    monkeypatch.setattr(catalog_cache, "max_entries", 3)
+
+    assert run(client.get("/api/services/")).status_code == 200
+    for i in range(20):
+        # Каждая новая категория — новый ключ кэша
+        assert run(client.get("/api/services/", params={"category": f"random-{i}"})).json() == []
+        # Часто читаемый общий список не вытесняется
+        run(client.get("/api/services/"))
+
+    stats = catalog_cache.stats()
+    assert stats["entries"] == 3
+    assert stats["evicted"] == 18
+    hits = stats["hits"]
+    run(client.get("/api/services/"))
+    assert catalog_cache.stats()["hits"] == hits + 1
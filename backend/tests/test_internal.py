@@ -0,0 +1,37 @@
+import pytest
+
+from app.config import settings
+from app.main import app
+from app.routes import internal
+
+TOKEN = "internal-secret"
+ROUTES = [(method, route.path) for route in internal.router.routes for method in route.methods]
+
+
+@pytest.fixture
+def stats_client(run):
+    import httpx
+
+    client = httpx.AsyncClient(app=app, base_url="http://test")
+    yield client
+    run(client.aclose())
+
+
+@pytest.mark.parametrize("method, path", ROUTES)
+def test_internal_routes_are_closed_without_a_configured_token(run, stats_client, monkeypatch, method, path):
+    monkeypatch.setattr(settings, "internal_api_token", None)
+    assert run(stats_client.request(method, path)).status_code == 404
+    assert run(stats_client.request(method, path, headers={"X-Internal-Token": ""})).status_code == 404
+
+
+@pytest.mark.parametrize("method, path", ROUTES)
+def test_internal_routes_require_the_token(run, stats_client, monkeypatch, method, path):
+    monkeypatch.setattr(settings, "internal_api_token", TOKEN)
+    assert run(stats_client.request(method, path)).status_code == 403
+    assert run(stats_client.request(method, path, headers={"X-Internal-Token": TOKEN + "x"})).status_code == 403
+
+
+def test_internal_stats_answer_with_the_token(run, stats_client, monkeypatch):
+    monkeypatch.setattr(settings, "internal_api_token", TOKEN)
+    response = run(stats_client.get("/internal/catalog-cache", headers={"X-Internal-Token": TOKEN}))
+    assert response.status_code == 200
@@ -0,0 +1,126 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import select, update
+
+from app.models.job import Job, JobStatus
+from app.services import jobs as jobs_module
+from app.services.jobs import JobQueue
+
+LEASE_SECONDS = 60
+
+
+def make_queue(claim_batch: int, worker_id: str = "test:1") -> JobQueue:
+    queue = JobQueue(
+        workers=1,
+        claim_batch=claim_batch,
+        poll_seconds=0.05,
+        lease_seconds=LEASE_SECONDS,
+        max_attempts=3,
+        retry_base_seconds=1,
+        retry_max_seconds=1,
+    )
+    queue.worker_id = worker_id
+    return queue
+
+
+async def statuses(db) -> dict:
+    db.expire_all()
+    rows = await db.execute(select(Job.payload, Job.status, Job.attempts))
+    return {payload["i"]: (status, attempts) for payload, status, attempts in rows.all()}
+
+
+async def drain(queue: JobQueue, expected: int, timeout: float = 10):
+    await queue.start()
+    try:
+        deadline = time.monotonic() + timeout
+        while queue.succeeded + queue.failed < expected:
+            assert time.monotonic() < deadline, queue.stats()
+            await asyncio.sleep(0.02)
+    finally:
+        await queue.stop(1)
+
+
+def test_each_job_is_done_as_soon_as_it_finishes(db, run):
+    queue = make_queue(claim_batch=3)
+    seen = []
+
+    @queue.task("probe")
+    async def probe(payload):
+        # Задачи идут одной пачкой, но предыдущая уже должна быть записана как DONE
+        seen.append((payload["i"], await statuses(db)))
+
+    async def scenario():
+        for i in range(3):
+            await queue.enqueue("probe", {"i": i})
+        await drain(queue, 3)
+        return await statuses(db)
+
+    assert run(scenario()) == {i: (JobStatus.DONE, 1) for i in range(3)}
+    assert [i for i, _ in seen] == [0, 1, 2]
+    for i, before in seen:
+        assert [before[j][0] for j in range(3)] == [JobStatus.DONE] * i + [JobStatus.RUNNING] * (3 - i)
+
+
+def test_jobs_left_when_the_lease_runs_out_keep_their_attempt(db, run, monkeypatch):
+    # Часы воркера: первая задача «съедает» всю аренду пачки. Подменяем time только в модуле jobs,
+    # цикл событий продолжает идти по настоящим
+    skew = [0.0]
+    monkeypatch.setattr(jobs_module, "time", SimpleNamespace(monotonic=lambda: time.monotonic() + skew[0], time=time.time))
+    queue = make_queue(claim_batch=3)
+    runs = []
+
+    # Как reminders.tick: одна попытка, и потраченная впустую попытка означает FAILED без запуска
+    @queue.task("once", max_attempts=1)
+    async def once(payload):
+        runs.append(payload["i"])
+        if payload["i"] == 0:
+            skew[0] += LEASE_SECONDS
+
+    async def scenario():
+        for i in range(3):
+            await queue.enqueue("once", {"i": i})
+        await drain(queue, 3)
+        return await statuses(db)
+
+    assert run(scenario()) == {i: (JobStatus.DONE, 1) for i in range(3)}
+    assert runs == [0, 1, 2]
+    assert (queue.released, queue.failed, queue.reaped) == (2, 0, 0)
+
+
+def test_results_are_written_only_under_the_current_lease(db, run):
+    owner, other = make_queue(claim_batch=1, worker_id="node-a:1"), make_queue(claim_batch=1, worker_id="node-b:1")
+    for queue in (owner, other):
+        queue.task("noop")(lambda payload: asyncio.sleep(0))
+
+    async def expire(job_id: int):
+        # То, что делает _reap с истёкшей арендой
+        await db.execute(update(Job).where(Job.id == job_id).values(status=JobStatus.QUEUED, locked_by=None, locked_at=None))
+        await db.commit()
+
+    async def scenario():
+        job_id = await owner.enqueue("noop", {"i": 0})
+        (stale,) = await owner._claim()
+        await expire(job_id)
+        (current,) = await other._claim()
+
+        # Опоздавший воркер не может ни завершить, ни уронить, ни вернуть чужую аренду,
+        # даже с тем же номером попытки
+        await owner._complete(stale)
+        await owner._complete(current)
+        await owner._fail(current, "late")
+        await owner._release([current])
+        taken_over = (await statuses(db))[0]
+
+        await expire(job_id)
+        (reclaimed,) = await owner._claim()
+        # Тот же процесс взял задачу заново: результат прошлой аренды тоже не записывается
+        await owner._complete(current)
+        still_running = (await statuses(db))[0]
+
+        await owner._complete(reclaimed)
+        return taken_over, still_running, (await statuses(db))[0]
+
+    assert run(scenario()) == ((JobStatus.RUNNING, 2), (JobStatus.RUNNING, 3), (JobStatus.DONE, 3))
+    assert (owner.succeeded, owner.failed, owner.retried, owner.released) == (1, 0, 0, 0)
@@ -0,0 +1,32 @@
+from datetime import date, timedelta
+
+from app.services import occupancy
+from app.services.occupancy import OccupancyIndex
+
+DAY = date(2030, 1, 7)
+
+
+def test_full_cache_keeps_recent_days(monkeypatch):
+    monkeypatch.setattr(occupancy, "salon_today", lambda: DAY)
+    index = OccupancyIndex(max_entries=3, ttl_seconds=0, horizon_days=30)
+    for offset in range(5):
+        index.put(1, DAY + timedelta(days=offset), {offset: (600, 660)})
+
+    assert [index.get(1, DAY + timedelta(days=offset)) is not None for offset in range(5)] == [False, False, True, True, True]
+    assert index.evictions == 2
+
+
+def test_past_days_are_swept_when_the_day_changes(monkeypatch):
+    today = [DAY]
+    monkeypatch.setattr(occupancy, "salon_today", lambda: today[0])
+    index = OccupancyIndex(max_entries=2, ttl_seconds=0, horizon_days=30)
+    index.put(1, DAY, {})
+    index.put(2, DAY + timedelta(days=1), {})
+    index.get(1, DAY)
+
+    today[0] = DAY + timedelta(days=1)
+    index.put(3, DAY + timedelta(days=1), {})
+    # По LRU вытеснили бы мастера 2, но место освобождает вчерашний день
+    assert index.get(1, DAY) is None
+    assert index.get(2, DAY + timedelta(days=1)) is not None
+    assert index.get(3, DAY + timedelta(days=1)) is not None
@@ -0,0 +1,42 @@
+from datetime import date, datetime
+
+from app.models import Booking, Service, User
+from app.models.booking import BookingStatus
+
+USER = {"X-Telegram-User-Id": "555"}
+
+
+def test_bookings_follow_cursor(client, db, run):
+    async def seed():
+        user = User(telegram_id=555)
+        service = Service(name="Стрижка", price=1000, duration_minutes=60)
+        db.add_all([user, service])
+        await db.flush()
+        db.add_all([
+            Booking(
+                user_id=user.id,
+                service_id=service.id,
+                booking_date=date(2030, 1, day),
+                booking_time="10:00",
+                starts_at=datetime(2030, 1, day, 10),
+                ends_at=datetime(2030, 1, day, 11),
+                status=BookingStatus.CONFIRMED,
+            )
+            for day in range(1, 6)
+        ])
+        await db.commit()
+
+    run(seed())
+
+    dates, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = run(client.get("/api/bookings/", params=params, headers=USER))
+        assert response.status_code == 200
+        page = response.json()
+        dates += [item["booking_date"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert dates == [f"2030-01-0{day}" for day in range(5, 0, -1)]
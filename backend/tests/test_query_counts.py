@@ -0,0 +1,78 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import func, insert, select
+
+from app.middleware.auth import user_cache
+from app.middleware.query_counter import count_queries, install_query_counter
+from app.models import Booking, Master, Service, User, master_service_association
+from app.models.booking import BookingStatus
+from app.services.catalog_cache import catalog_cache
+from app.utils.pagination import MAX_PAGE_SIZE
+
+SIZES = (1, 10, 500)
+USER = {"X-Telegram-User-Id": "777"}
+DAY = date(2030, 1, 7)
+
+
+@pytest.fixture(scope="module")
+def counted(database):
+    install_query_counter(database)
+
+
+def test_list_routes_run_a_constant_number_of_queries(counted, client, db, run):
+    async def grow(size: int, user_id: int):
+        # У каждой записи свой мастер со своей услугой: N+1 по мастерам или услугам сразу даст рост
+        start = await db.scalar(select(func.count()).select_from(Master))
+        services = [Service(name=f"Услуга {i}", price=1000, duration_minutes=60) for i in range(start, size)]
+        masters = [Master(name=f"Мастер {i}") for i in range(start, size)]
+        db.add_all(services + masters)
+        await db.flush()
+        await db.execute(insert(master_service_association), [
+            {"master_id": master.id, "service_id": service.id} for service, master in zip(services, masters)
+        ])
+        db.add_all([
+            Booking(
+                user_id=user_id,
+                service_id=service.id,
+                master_id=master.id,
+                booking_date=DAY + timedelta(days=i),
+                booking_time="10:00",
+                starts_at=datetime.combine(DAY + timedelta(days=i), datetime.min.time()) + timedelta(hours=10),
+                ends_at=datetime.combine(DAY + timedelta(days=i), datetime.min.time()) + timedelta(hours=11),
+                status=BookingStatus.CONFIRMED,
+            )
+            for i, (service, master) in enumerate(zip(services, masters), start=start)
+        ])
+        await db.commit()
+
+    async def seed_user():
+        user = User(telegram_id=777)
+        db.add(user)
+        await db.commit()
+        return user.id
+
+    async def counted_get(url, **kwargs):
+        with count_queries() as counter:
+            response = await client.get(url, **kwargs)
+        assert response.status_code == 200, response.text
+        return counter[0], response.json()
+
+    user_id = run(seed_user())
+    counts = {}
+    for size in SIZES:
+        run(grow(size, user_id))
+        # Каталог мастеров и пользователь закэшированы: считаем запросы промаха, а не попадания в кэш
+        catalog_cache.clear()
+        user_cache.clear()
+
+        queries, masters = run(counted_get("/api/masters/"))
+        assert len(masters) == size
+        counts.setdefault("masters", {})[size] = queries
+
+        queries, page = run(counted_get("/api/bookings/", params={"limit": MAX_PAGE_SIZE}, headers=USER))
+        assert len(page["items"]) == min(size, MAX_PAGE_SIZE)
+        counts.setdefault("bookings", {})[size] = queries
+
+    # Мастера и их услуги; пользователь, страница записей и услуги их мастеров — при любом числе строк
+    assert {route: set(by_size.values()) for route, by_size in counts.items()} == {"masters": {2}, "bookings": {3}}, counts
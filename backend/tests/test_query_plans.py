@@ -0,0 +1,97 @@
+from sqlalchemy import event, text
+
+from app.services.reminders import REMINDERS, reminder_scheduler
+from app.utils.salon_time import salon_now
+
+USERS = 2000
+MASTERS = 1000
+SERVICES = 100
+BOOKINGS_PER_MASTER = 50
+USER = {"X-Telegram-User-Id": "100001"}
+
+# На пустых таблицах планировщик всегда выбирает seq scan, поэтому объём — как у живого салона за несколько лет
+SEED = (
+    f"""INSERT INTO users (telegram_id, first_name)
+    SELECT 100000 + i, 'Клиент ' || i FROM generate_series(1, {USERS}) i""",
+    f"""INSERT INTO services (name, price, duration_minutes, is_active)
+    SELECT 'Услуга ' || i, 1000, 60, true FROM generate_series(1, {SERVICES}) i""",
+    f"""INSERT INTO masters (name, is_active)
+    SELECT 'Мастер ' || i, true FROM generate_series(1, {MASTERS}) i""",
+    f"""INSERT INTO master_services (master_id, service_id)
+    SELECT m, (m * 7 + k * 5) % {SERVICES} + 1 FROM generate_series(1, {MASTERS}) m, generate_series(0, 19) k""",
+    # У каждого мастера по 9 записей в день подряд с 09:00: пересечений нет, констрейнт не мешает
+    f"""INSERT INTO bookings (user_id, service_id, master_id, booking_date, booking_time, starts_at, ends_at, status)
+    SELECT i % {USERS} + 1, i % {SERVICES} + 1, i % {MASTERS} + 1, starts_at::date, to_char(starts_at, 'HH24:MI'),
+        starts_at, starts_at + interval '1 hour',
+        (CASE WHEN i % 10 = 0 THEN 'CANCELLED' WHEN i % 10 < 3 THEN 'PENDING'
+            WHEN i % 10 < 6 THEN 'COMPLETED' ELSE 'CONFIRMED' END)::bookingstatus
+    FROM generate_series(0, {MASTERS * BOOKINGS_PER_MASTER - 1}) i,
+        LATERAL (SELECT date_trunc('day', CAST(:now AS timestamp)) - interval '30 days'
+            + (i / {MASTERS} / 9) * interval '1 day' + (9 + i / {MASTERS} % 9) * interval '1 hour' AS starts_at) s""",
+    f"""INSERT INTO reviews (master_id, user_id, rating, created_at)
+    SELECT i % {MASTERS} + 1, i % {USERS} + 1, i % 5 + 1, now() - i * interval '1 minute'
+    FROM generate_series(1, 50000) i""",
+    f"""INSERT INTO certificates (code, amount, user_id, is_used, created_at)
+    SELECT 'C' || i, 1000, i % {USERS} + 1, i % 3 = 0, now() - i * interval '1 hour'
+    FROM generate_series(1, 20000) i""",
+)
+
+
+def plan_indexes(node) -> set:
+    found = {node["Index Name"]} if "Index Name" in node else set()
+    for child in node.get("Plans", ()):
+        found |= plan_indexes(child)
+    return found
+
+
+def test_hot_queries_use_indexes(client, db, database, run):
+    async def seed():
+        async with database.begin() as conn:
+            for statement in SEED:
+                await conn.execute(text(statement), {"now": salon_now()})
+        async with database.connect() as conn:
+            await (await conn.get_raw_connection()).driver_connection.execute("ANALYZE")
+
+    run(seed())
+
+    async def reminders_window():
+        now = salon_now()
+        await db.execute(reminder_scheduler._query(REMINDERS[0], now, now + REMINDERS[0].offset))
+
+    # Запросы снимаем с настоящих роутов и сервисов, чтобы тест ловил и смену индексов, и смену самих запросов
+    hot = {
+        "ix_bookings_user_date": lambda: client.get("/api/bookings/", headers=USER),
+        "ix_certificates_user_used_created": lambda: client.get("/api/certificates/", params={"is_used": False}, headers=USER),
+        "ix_certificates_user_created": lambda: client.get("/api/certificates/", headers=USER),
+        "ix_reviews_master_created": lambda: client.get("/api/reviews/master/1"),
+        "ix_master_services_service_master": lambda: client.get("/api/services/1/next-available"),
+        "ix_bookings_master_date_status": lambda: client.get("/api/services/2/next-available"),
+        "ix_bookings_confirmed_starts_at": reminders_window,
+    }
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    async def explain():
+        async with database.connect() as conn:
+            plans = [
+                (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)).scalar()
+                for statement, parameters in statements
+                if statement.lstrip().upper().startswith("SELECT")
+            ]
+        return set().union(*(plan_indexes(plan[0]["Plan"]) for plan in plans))
+
+    used = {}
+    for index, request in hot.items():
+        statements.clear()
+        event.listen(database.sync_engine, "before_cursor_execute", capture)
+        try:
+            response = run(request())
+        finally:
+            event.remove(database.sync_engine, "before_cursor_execute", capture)
+        assert response is None or response.status_code == 200, (index, response.text)
+        used[index] = index in run(explain())
+
+    assert used == {index: True for index in hot}
@@ -0,0 +1,94 @@
+import itertools
+import os
+from collections import Counter
+from datetime import date
+
+import pytest
+from sqlalchemy import event, insert
+
+from app import database as database_module
+from app.database import create_engine, create_sessionmaker
+from app.models import Master, Service
+from app.models.master import master_service_association
+from app.services import occupancy
+from app.services.occupancy import occupancy_index
+
+DAY = date(2030, 1, 7)
+
+
+@pytest.fixture
+def engines(database, run, monkeypatch):
+    # Две «реплики» смотрят в ту же тестовую БД, но через свои движки: считаем, куда ушёл каждый запрос
+    replicas = {name: create_engine(os.environ["TEST_DATABASE_URL"]) for name in ("replica-1", "replica-2")}
+    queries = Counter()
+    listeners = []
+    for name, engine in [("primary", database), *replicas.items()]:
+        listener = lambda *args, name=name: queries.update([name])
+        event.listen(engine.sync_engine, "before_cursor_execute", listener)
+        listeners.append((engine, listener))
+    monkeypatch.setattr(database_module, "_replica_cycle", itertools.cycle([create_sessionmaker(engine) for engine in replicas.values()]))
+    monkeypatch.setattr(occupancy, "salon_today", lambda: DAY)
+    yield queries
+    for engine, listener in listeners:
+        event.remove(engine.sync_engine, "before_cursor_execute", listener)
+    for engine in replicas.values():
+        run(engine.dispose())
+
+
+def seed(db, run):
+    async def insert_rows():
+        service = Service(name="Стрижка", price=1000, duration_minutes=60)
+        master = Master(name="Ольга", work_schedule={"monday": {"start": "09:00", "end": "12:00"}})
+        db.add_all([service, master])
+        await db.flush()
+        await db.execute(insert(master_service_association).values(master_id=master.id, service_id=service.id))
+        await db.commit()
+        return master.id, service.id
+
+    return run(insert_rows())
+
+
+def test_reads_go_round_robin_over_replicas(client, db, run, engines):
+    master_id, _ = seed(db, run)
+    engines.clear()
+
+    for _ in range(4):
+        assert run(client.get(f"/api/masters/{master_id}")).status_code == 200
+
+    assert engines["primary"] == 0
+    assert engines["replica-1"] == engines["replica-2"] > 0
+
+
+def test_read_primary_header_reads_the_primary(client, db, run, engines):
+    master_id, _ = seed(db, run)
+    engines.clear()
+
+    for _ in range(2):
+        assert run(client.get(f"/api/masters/{master_id}", headers={"X-Read-Primary": "1"})).status_code == 200
+
+    assert engines["primary"] > 0
+    assert engines["replica-1"] == engines["replica-2"] == 0
+
+
+def test_occupancy_index_is_filled_only_from_the_primary(client, db, run, engines):
+    master_id, service_id = seed(db, run)
+    url = f"/api/masters/{master_id}/available-slots"
+    params = {"booking_date": DAY.isoformat(), "service_id": service_id}
+
+    def free_starts(**headers):
+        response = run(client.get(url, params=params, headers=headers))
+        assert response.status_code == 200
+        return [slot["time"] for slot in response.json()["slots"] if slot["available"]]
+
+    assert free_starts() == ["09:00", "09:30", "10:00", "10:30", "11:00"]
+    assert occupancy_index.stats()["entries"] == 0
+
+    # Маска, которой нет в основной БД, — как отставшая копия: её видят обычные чтения, но не X-Read-Primary
+    occupancy_index.put(master_id, DAY, {999: (600, 660)})
+    assert free_starts() == ["09:00", "11:00"]
+    engines.clear()
+    assert free_starts(**{"X-Read-Primary": "1"}) == ["09:00", "09:30", "10:00", "10:30", "11:00"]
+    assert engines["replica-1"] == engines["replica-2"] == 0
+
+    # Чтение с основной БД заменяет запись индекса свежей маской
+    assert free_starts() == ["09:00", "09:30", "10:00", "10:30", "11:00"]
@@ -0,0 +1,86 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.models import Booking, Notification, Service, User
+from app.models.booking import BookingStatus
+from app.services import reminders
+from app.services.reminders import ReminderScheduler
+
+NOW = datetime(2030, 1, 7, 12, 0)
+CATCHUP = timedelta(hours=1)
+
+# Окна при catchup в час: 24h — (завтра 11:00, завтра 12:00], 2h — (13:00, 14:00]. Нижняя граница не входит
+BOOKINGS = {
+    "24h_edge": (timedelta(hours=24), BookingStatus.CONFIRMED),
+    "24h_caught_up": (timedelta(hours=23, minutes=30), BookingStatus.CONFIRMED),
+    "24h_sent_last_tick": (timedelta(hours=23), BookingStatus.CONFIRMED),
+    "too_early": (timedelta(hours=25), BookingStatus.CONFIRMED),
+    "2h_edge": (timedelta(hours=2), BookingStatus.CONFIRMED),
+    "2h_caught_up": (timedelta(hours=1, minutes=30), BookingStatus.CONFIRMED),
+    "2h_sent_last_tick": (timedelta(hours=1), BookingStatus.CONFIRMED),
+    "pending": (timedelta(hours=2), BookingStatus.PENDING),
+    "cancelled": (timedelta(hours=24), BookingStatus.CANCELLED),
+}
+
+
+def test_tick_sends_each_window_once_on_the_salon_clock(db, run, dispatcher, bot_api, monkeypatch):
+    async def seed():
+        service = Service(name="Стрижка", price=1000, duration_minutes=60)
+        users = {name: User(telegram_id=9000 + i) for i, name in enumerate(BOOKINGS)}
+        db.add_all([service, *users.values()])
+        await db.flush()
+        ids = {}
+        for name, (offset, status) in BOOKINGS.items():
+            starts_at = NOW + offset
+            booking = Booking(
+                user_id=users[name].id,
+                service_id=service.id,
+                booking_date=starts_at.date(),
+                booking_time=starts_at.strftime("%H:%M"),
+                starts_at=starts_at,
+                ends_at=starts_at + timedelta(hours=1),
+                status=status,
+            )
+            db.add(booking)
+            await db.flush()
+            ids[booking.id] = name
+        await db.commit()
+        return ids
+
+    names = run(seed())
+    monkeypatch.setattr(reminders, "telegram_dispatcher", dispatcher)
+    # Часы контейнера в UTC: тик должен брать «сейчас» из часового пояса салона
+    monkeypatch.setattr(reminders, "salon_now", lambda: NOW)
+    scheduler = ReminderScheduler(catchup_seconds=CATCHUP.total_seconds(), batch_size=2)
+
+    async def tick():
+        sent = await scheduler.tick()
+        # Дожидаемся, пока диспетчер доставит всё, что тик поставил в очередь
+        while scheduler.delivered + scheduler.failed < scheduler.sent:
+            await asyncio.sleep(0.05)
+        return sent
+
+    async def notifications():
+        rows = await db.execute(select(Notification.booking_id, Notification.type))
+        return sorted((names[booking_id], type) for booking_id, type in rows.all())
+
+    assert run(tick()) == 4
+    assert run(notifications()) == [
+        ("24h_caught_up", "booking_reminder_24h"),
+        ("24h_edge", "booking_reminder_24h"),
+        ("2h_caught_up", "booking_reminder_2h"),
+        ("2h_edge", "booking_reminder_2h"),
+    ]
+    assert scheduler.last_tick_at == NOW
+    assert sorted(request.payload["text"] for request in bot_api.requests) == [
+        "Напоминаем: завтра в 11:30 вас ждут на «Стрижка».",
+        "Напоминаем: завтра в 12:00 вас ждут на «Стрижка».",
+        "Через 2 часа, в 13:30, вас ждут на «Стрижка».",
+        "Через 2 часа, в 14:00, вас ждут на «Стрижка».",
+    ]
+
+    # Повторный тик в ту же минуту (или второй процесс) ничего не отправляет повторно
+    assert run(tick()) == 0
+    assert len(bot_api.requests) == 4
@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import insert
+
+from app.models import Master, Service
+from app.models.master import master_service_association
+from app.routes import services as services_route
+from app.utils.salon_time import SALON_TZ, salon_now, salon_today
+
+
+def test_salon_now_is_naive_local_time():
+    now = salon_now()
+    expected = datetime.now(timezone.utc).astimezone(SALON_TZ).replace(tzinfo=None)
+    assert now.tzinfo is None
+    assert abs((expected - now).total_seconds()) < 5
+    assert salon_today() == now.date()
+
+
+def test_next_available_uses_salon_clock(client, db, run, monkeypatch):
+    async def seed():
+        service = Service(name="Маникюр", price=1500, duration_minutes=60)
+        master = Master(name="Ольга", work_schedule={"monday": {"start": "09:00", "end": "18:00"}})
+        db.add_all([service, master])
+        await db.flush()
+        await db.execute(insert(master_service_association).values(master_id=master.id, service_id=service.id))
+        await db.commit()
+        return service.id
+
+    service_id = run(seed())
+    # 16:10 в салоне — это 13:10 UTC: по часам контейнера первым слотом оказалось бы уже прошедшее 13:30
+    monkeypatch.setattr(services_route, "salon_now", lambda: datetime(2030, 1, 7, 16, 10))
+
+    response = run(client.get(f"/api/services/{service_id}/next-available", params={"limit": 2}))
+    assert response.status_code == 200
+    assert [(slot["date"], slot["time"]) for slot in response.json()] == [("2030-01-07", "16:30"), ("2030-01-07", "17:00")]
@@ -0,0 +1,20 @@
+from app.utils.pagination import MAX_PAGE_SIZE
+from benchmarks.bench_serialization import TELEGRAM_ID, legacy_bookings, legacy_masters, seed
+
+ROWS = 200
+
+
+def test_row_responses_match_response_model_bytes(client, database, db, run):
+    async def insert():
+        async with database.begin() as conn:
+            return await seed(conn, ROWS)
+
+    user_id = run(insert())
+
+    masters = run(client.get("/api/masters/"))
+    assert masters.status_code == 200
+    assert masters.content == run(legacy_masters(db))
+
+    bookings = run(client.get("/api/bookings/", params={"limit": MAX_PAGE_SIZE}, headers={"X-Telegram-User-Id": str(TELEGRAM_ID)}))
+    assert bookings.status_code == 200
+    assert bookings.content == run(legacy_bookings(db, user_id, MAX_PAGE_SIZE))
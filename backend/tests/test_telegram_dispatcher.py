@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+from app.services.telegram_dispatcher import COALESCE_SEPARATOR
+from fake_bot_api import CHAT_INTERVAL_SECONDS, GLOBAL_LIMIT_PER_SECOND, JITTER_SECONDS
+
+BUTTONS = {"inline_keyboard": [[{"text": "Отменить", "callback_data": "cancel"}]]}
+
+
+def deliver(run, dispatcher, messages, then=(), pause: float = 0.2, timeout: float = 10):
+    # then уходит в диспетчер через pause, когда первая пачка уже отправлена
+    async def send_all():
+        futures = [dispatcher.send(chat_id, text, **params) for chat_id, text, params in messages]
+        if then:
+            await asyncio.sleep(pause)
+            futures += [dispatcher.send(chat_id, text, **params) for chat_id, text, params in then]
+        return await asyncio.wait_for(asyncio.gather(*futures), timeout)
+
+    return run(send_all())
+
+
+def gaps(requests):
+    return [later.at - earlier.at for earlier, later in zip(requests, requests[1:])]
+
+
+def test_global_rate_stays_within_the_bot_limit(run, dispatcher, bot_api):
+    chats = range(1000, 1075)
+    started = time.monotonic()
+    assert all(deliver(run, dispatcher, [(chat_id, "Напоминание", {}) for chat_id in chats]))
+
+    assert bot_api.violations == 0
+    assert len(bot_api.requests) == len(chats)
+    # 75 сообщений при 30/с идут не меньше двух секунд, в любом секундном окне — не больше 30
+    assert time.monotonic() - started >= (len(chats) - 1) / GLOBAL_LIMIT_PER_SECOND - JITTER_SECONDS
+    times = [request.at for request in bot_api.requests]
+    assert max(sum(start <= at < start + 1 - JITTER_SECONDS for at in times) for start in times) <= GLOBAL_LIMIT_PER_SECOND
+
+
+def test_chat_messages_are_spaced_and_coalesced(run, dispatcher, bot_api):
+    assert all(deliver(run, dispatcher, [(1, "Сообщение 0", {})], then=[(1, f"Сообщение {i}", {}) for i in range(1, 5)]))
+
+    requests = bot_api.chat(1)
+    assert bot_api.violations == 0
+    # Первое уходит сразу, остальные копятся, пока чат ждёт свою секунду, и уходят одним sendMessage
+    assert [request.payload["text"] for request in requests] == [
+        "Сообщение 0",
+        COALESCE_SEPARATOR.join(f"Сообщение {i}" for i in range(1, 5)),
+    ]
+    assert min(gaps(requests)) >= CHAT_INTERVAL_SECONDS - JITTER_SECONDS
+
+
+def test_messages_with_buttons_are_never_merged(run, dispatcher, bot_api):
+    messages = [(2, f"Запись {i}", {"reply_markup": BUTTONS}) for i in range(3)] + [(2, "Без кнопок", {})]
+    assert all(deliver(run, dispatcher, messages))
+
+    requests = bot_api.chat(2)
+    assert bot_api.violations == 0
+    assert [(request.payload["text"], "reply_markup" in request.payload) for request in requests] == [
+        ("Запись 0", True), ("Запись 1", True), ("Запись 2", True), ("Без кнопок", False),
+    ]
+    assert min(gaps(requests)) >= CHAT_INTERVAL_SECONDS - JITTER_SECONDS
+
+
+def test_rate_limited_messages_are_redelivered_after_retry_after(run, dispatcher, bot_api):
+    bot_api.flood[3] = 1.5
+    assert deliver(run, dispatcher, [(3, "Первое", {})], then=[(3, "Второе", {})]) == [True, True]
+
+    rejected, delivered = bot_api.chat(3)
+    assert (rejected.status, rejected.payload["text"]) == (429, "Первое")
+    # Пачка вернулась в начало очереди: порядок сохранён, второе сообщение догнало первое
+    assert (delivered.status, delivered.payload["text"]) == (200, "Первое" + COALESCE_SEPARATOR + "Второе")
+    assert delivered.at - rejected.at >= 1.5 - JITTER_SECONDS
+    assert dispatcher.rate_limited == 1
+
+
+def test_rejected_messages_are_not_retried(run, dispatcher, bot_api):
+    bot_api.blocked.add(4)
+    assert deliver(run, dispatcher, [(4, "Напоминание", {}), (5, "Напоминание", {})]) == [False, True]
+
+    assert [request.status for request in bot_api.chat(4)] == [403]
+    assert dispatcher.failed == 1
@@ -0,0 +1,34 @@
+import { readdirSync, readFileSync, statSync, writeFileSync } from 'node:fs'
+import { extname, join } from 'node:path'
+import { fileURLToPath } from 'node:url'
+import { brotliCompressSync, constants, gzipSync } from 'node:zlib'
+
+// Рядом с текстовыми файлами сборки кладём .br и .gz: бэкенд отдаёт их как есть, без сжатия на лету
+const DIST_DIR = fileURLToPath(new URL('../dist/', import.meta.url))
+const COMPRESSIBLE = new Set(['.html', '.js', '.mjs', '.css', '.svg', '.json', '.txt', '.map', '.webmanifest'])
+const MIN_SIZE = 1024
+
+const walk = (dir) =>
+  readdirSync(dir, { withFileTypes: true }).flatMap((entry) =>
+    entry.isDirectory() ? walk(join(dir, entry.name)) : [join(dir, entry.name)]
+  )
+
+for (const file of walk(DIST_DIR)) {
+  if (!COMPRESSIBLE.has(extname(file)) || statSync(file).size < MIN_SIZE) continue
+
+  const source = readFileSync(file)
+  const variants = {
+    '.br': brotliCompressSync(source, {
+      params: {
+        [constants.BROTLI_PARAM_QUALITY]: constants.BROTLI_MAX_QUALITY,
+        [constants.BROTLI_PARAM_SIZE_HINT]: source.length,
+      },
+    }),
+    '.gz': gzipSync(source, { level: 9 }),
+  }
+  for (const [suffix, compressed] of Object.entries(variants)) {
+    if (compressed.length < source.length) {
+      writeFileSync(file + suffix, compressed)
+    }
+  }
+}
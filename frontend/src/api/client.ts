@@ -9,7 +9,14 @@ import type {
   SalonSettings,
   User,
   AvailableSlotsResponse,
+  AvailabilityCalendarResponse,
+  NextAvailableSlot,
+  Page,
+  Bootstrap,
+  BootstrapResponse,
   BookingCreate,
+  SlotHold,
+  SlotHoldCreate,
   ReviewCreate,
   UserUpdate
 } from './types'
@@ -23,6 +30,25 @@ const apiClient = axios.create({
   },
 })
 
+// После записи бэкенд ещё несколько секунд читает из основной БД, а не с реплик,
+// чтобы пользователь сразу увидел свою запись (read-your-writes)
+const READ_YOUR_WRITES_MS = 5000
+let lastWriteAt = 0
+
+apiClient.interceptors.request.use((config) => {
+  if (config.method === 'get' && Date.now() - lastWriteAt < READ_YOUR_WRITES_MS) {
+    config.headers.set('X-Read-Primary', '1')
+  }
+  return config
+})
+
+apiClient.interceptors.response.use((response) => {
+  if (response.config.method !== 'get') {
+    lastWriteAt = Date.now()
+  }
+  return response
+})
+
 const getTelegramUserId = (): number | null => {
   if (typeof window !== 'undefined' && (window as any).Telegram?.WebApp?.initDataUnsafe?.user?.id) {
     return (window as any).Telegram.WebApp.initDataUnsafe.user.id
@@ -30,14 +56,25 @@ const getTelegramUserId = (): number | null => {
   return null
 }
 
-const getAuthHeaders = () => {
+const getTelegramInitData = (): string | null => {
+  if (typeof window !== 'undefined' && (window as any).Telegram?.WebApp?.initData) {
+    return (window as any).Telegram.WebApp.initData
+  }
+  return null
+}
+
+const getAuthHeaders = (): Record<string, string> => {
+  const headers: Record<string, string> = {}
+  // Бэкенд проверяет подпись initData; голый id принимается только в режиме локальной разработки
+  const initData = getTelegramInitData()
+  if (initData) {
+    headers['X-Telegram-Init-Data'] = initData
+  }
   const telegramId = getTelegramUserId()
   if (telegramId) {
-    return {
-      'X-Telegram-User-Id': telegramId.toString(),
-    }
+    headers['X-Telegram-User-Id'] = telegramId.toString()
   }
-  return {}
+  return headers
 }
 
 export const servicesApi = {
@@ -59,6 +96,11 @@ export const servicesApi = {
     const response = await apiClient.get<string[]>(`/services/categories/list`)
     return response.data
   },
+
+  getNextAvailable: async (id: number, limit: number = 5): Promise<NextAvailableSlot[]> => {
+    const response = await apiClient.get<NextAvailableSlot[]>(`/services/${id}/next-available?limit=${limit}`)
+    return response.data
+  },
 }
 
 export const mastersApi = {
@@ -106,6 +148,26 @@ export const mastersApi = {
     )
     return response.data
   },
+
+  getCalendar: async (
+    serviceId: number,
+    dateFrom: string,
+    dateTo: string,
+    masterId?: number,
+    includeSlots: boolean = false
+  ): Promise<AvailabilityCalendarResponse> => {
+    const params = new URLSearchParams({
+      from: dateFrom,
+      to: dateTo,
+      include_slots: includeSlots.toString(),
+    })
+    if (masterId) params.append('master_id', masterId.toString())
+    
+    const response = await apiClient.get<AvailabilityCalendarResponse>(
+      `/masters/service/${serviceId}/calendar?${params.toString()}`
+    )
+    return response.data
+  },
 }
 
 export const bookingsApi = {
@@ -116,11 +178,12 @@ export const bookingsApi = {
     return response.data
   },
 
-  getAll: async (status?: string): Promise<Booking[]> => {
+  getAll: async (status?: string, cursor?: string): Promise<Page<Booking>> => {
     const params = new URLSearchParams()
     if (status) params.append('status', status)
+    if (cursor) params.append('cursor', cursor)
     
-    const response = await apiClient.get<Booking[]>(`/bookings/?${params.toString()}`, {
+    const response = await apiClient.get<Page<Booking>>(`/bookings/?${params.toString()}`, {
       headers: getAuthHeaders(),
     })
     return response.data
@@ -139,14 +202,29 @@ export const bookingsApi = {
     })
     return response.data
   },
+
+  hold: async (hold: SlotHoldCreate): Promise<SlotHold> => {
+    const response = await apiClient.post<SlotHold>('/bookings/holds', hold, {
+      headers: getAuthHeaders(),
+    })
+    return response.data
+  },
+
+  releaseHold: async (holdId: string): Promise<void> => {
+    await apiClient.delete(`/bookings/holds/${holdId}`, {
+      headers: getAuthHeaders(),
+    })
+  },
 }
 
 export const certificatesApi = {
-  getAll: async (isUsed?: boolean): Promise<Certificate[]> => {
+  getAll: async (isUsed?: boolean, cursor?: string, limit?: number): Promise<Page<Certificate>> => {
     const params = new URLSearchParams()
     if (isUsed !== undefined) params.append('is_used', isUsed.toString())
+    if (cursor) params.append('cursor', cursor)
+    if (limit) params.append('limit', limit.toString())
     
-    const response = await apiClient.get<Certificate[]>(`/certificates/?${params.toString()}`, {
+    const response = await apiClient.get<Page<Certificate>>(`/certificates/?${params.toString()}`, {
       headers: getAuthHeaders(),
     })
     return response.data
@@ -183,8 +261,11 @@ export const reviewsApi = {
     return response.data
   },
 
-  getByMaster: async (masterId: number): Promise<Review[]> => {
-    const response = await apiClient.get<Review[]>(`/reviews/master/${masterId}`)
+  getByMaster: async (masterId: number, cursor?: string): Promise<Page<Review>> => {
+    const params = new URLSearchParams()
+    if (cursor) params.append('cursor', cursor)
+    
+    const response = await apiClient.get<Page<Review>>(`/reviews/master/${masterId}?${params.toString()}`)
     return response.data
   },
 }
@@ -211,3 +292,64 @@ export const usersApi = {
     return response.data
   },
 }
+
+// Главный экран получает всё одним запросом. Секции с прошлого запуска храним вместе с их etag,
+// сервер присылает только изменившиеся, а если не изменилось ничего — 304 без тела
+const BOOTSTRAP_STORAGE_KEY = 'bootstrap'
+
+interface StoredBootstrap {
+  etag: string
+  sections: BootstrapResponse
+}
+
+const loadStoredBootstrap = (): StoredBootstrap | null => {
+  try {
+    const raw = localStorage.getItem(BOOTSTRAP_STORAGE_KEY)
+    return raw ? JSON.parse(raw) : null
+  } catch {
+    return null
+  }
+}
+
+const storeBootstrap = (bootstrap: StoredBootstrap) => {
+  try {
+    localStorage.setItem(BOOTSTRAP_STORAGE_KEY, JSON.stringify(bootstrap))
+  } catch {
+    // Хранилище недоступно или переполнено: в следующий раз просто получим все секции
+  }
+}
+
+const bootstrapData = (sections: BootstrapResponse): Bootstrap => ({
+  services: sections.services.data ?? [],
+  categories: sections.categories.data ?? [],
+  promotions: sections.promotions.data ?? [],
+  settings: sections.settings.data as SalonSettings,
+  user: sections.user.data ?? null,
+})
+
+export const bootstrapApi = {
+  get: async (): Promise<Bootstrap> => {
+    const stored = loadStoredBootstrap()
+    const headers = getAuthHeaders()
+    if (stored) {
+      headers['If-None-Match'] = [stored.etag, ...Object.values(stored.sections).map((section) => section.etag)].join(', ')
+    }
+    
+    const response = await apiClient.get<BootstrapResponse>('/bootstrap/', {
+      headers,
+      validateStatus: (status) => status === 200 || status === 304,
+    })
+    if (response.status === 304 && stored) {
+      return bootstrapData(stored.sections)
+    }
+    
+    const sections = { ...response.data }
+    for (const key of Object.keys(sections) as (keyof BootstrapResponse)[]) {
+      if (!('data' in sections[key]) && stored) {
+        sections[key] = stored.sections[key] as any
+      }
+    }
+    storeBootstrap({ etag: response.headers['etag'], sections })
+    return bootstrapData(sections)
+  },
+}
@@ -1,3 +1,8 @@
+export interface Page<T> {
+  items: T[]
+  next_cursor: string | null
+}
+
 export interface Service {
   id: number
   name: string
@@ -21,6 +26,7 @@ export interface Master {
   work_schedule: Record<string, any> | null
   rating: string | null
   reviews_count: number
+  rating_histogram: Record<number, number>
   services: Service[]
   is_active: boolean
   created_at: string
@@ -121,6 +127,26 @@ export interface AvailableSlotsResponse {
   slots: AvailableTimeSlot[]
 }
 
+export interface NextAvailableSlot {
+  date: string
+  time: string
+  master_id: number
+  master_name: string | null
+}
+
+export interface CalendarDay {
+  date: string
+  free_slots: number
+  slots?: AvailableTimeSlot[]
+}
+
+export interface AvailabilityCalendarResponse {
+  service_id: number
+  from: string
+  to: string
+  days: CalendarDay[]
+}
+
 export interface BookingCreate {
   service_id: number
   master_id?: number | null
@@ -130,6 +156,18 @@ export interface BookingCreate {
   certificate_id?: number | null
 }
 
+export interface SlotHoldCreate {
+  service_id: number
+  master_id: number
+  booking_date: string
+  booking_time: string
+}
+
+export interface SlotHold extends SlotHoldCreate {
+  id: string
+  expires_at: string
+}
+
 export interface ReviewCreate {
   master_id: number
   booking_id?: number | null
@@ -143,3 +181,24 @@ export interface UserUpdate {
   first_name?: string | null
   last_name?: string | null
 }
+
+export interface BootstrapSection<T> {
+  etag: string
+  data?: T
+}
+
+export interface BootstrapResponse {
+  services: BootstrapSection<Service[]>
+  categories: BootstrapSection<string[]>
+  promotions: BootstrapSection<Promotion[]>
+  settings: BootstrapSection<SalonSettings>
+  user: BootstrapSection<User | null>
+}
+
+export interface Bootstrap {
+  services: Service[]
+  categories: string[]
+  promotions: Promotion[]
+  settings: SalonSettings
+  user: User | null
+}
@@ -52,7 +52,7 @@ function Booking() {
 
   const { data: certificates } = useQuery({
     queryKey: ['certificates', 'unused'],
-    queryFn: () => certificatesApi.getAll(false),
+    queryFn: () => certificatesApi.getAll(false, undefined, 100).then((page) => page.items),
   })
 
   const createBookingMutation = useMutation({
@@ -61,8 +61,35 @@ function Booking() {
       queryClient.invalidateQueries({ queryKey: ['bookings'] })
       navigate('/bookings')
     },
+    onError: (error: any) => {
+      if (error?.response?.status === 409) {
+        alert('Это время уже занято, выберите другое')
+        setSelectedTime('')
+        queryClient.invalidateQueries({ queryKey: ['available-slots'] })
+      }
+    },
   })
 
+  const handleSelectTime = async (time: string) => {
+    setSelectedTime(time)
+    if (!selectedServiceId || !selectedMasterId) return
+
+    try {
+      await bookingsApi.hold({
+        service_id: selectedServiceId,
+        master_id: selectedMasterId,
+        booking_date: selectedDate,
+        booking_time: time,
+      })
+    } catch (error: any) {
+      if (error?.response?.status === 409) {
+        alert('Это время уже занято, выберите другое')
+        setSelectedTime('')
+        queryClient.invalidateQueries({ queryKey: ['available-slots'] })
+      }
+    }
+  }
+
   const handleSubmit = (e: React.FormEvent) => {
     e.preventDefault()
     if (!selectedServiceId || !selectedDate || !selectedTime) {
@@ -163,7 +190,7 @@ function Booking() {
                   <button
                     key={slot.time}
                     type="button"
-                    onClick={() => setSelectedTime(slot.time)}
+                    onClick={() => handleSelectTime(slot.time)}
                     disabled={!slot.available}
                     className={`px-4 py-2 rounded-lg border ${
                       selectedTime === slot.time
@@ -1,4 +1,4 @@
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
+import { useInfiniteQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import { bookingsApi } from '../api/client'
 import { Link } from 'react-router-dom'
 import { useState } from 'react'
@@ -7,10 +7,13 @@ function Bookings() {
   const queryClient = useQueryClient()
   const [statusFilter, setStatusFilter] = useState<string>('')
 
-  const { data: bookings, isLoading } = useQuery({
+  const { data, isLoading, hasNextPage, fetchNextPage, isFetchingNextPage } = useInfiniteQuery({
     queryKey: ['bookings', statusFilter || undefined],
-    queryFn: () => bookingsApi.getAll(statusFilter || undefined),
+    queryFn: ({ pageParam }) => bookingsApi.getAll(statusFilter || undefined, pageParam),
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
   })
+  const bookings = data?.pages.flatMap((page) => page.items)
 
   const cancelMutation = useMutation({
     mutationFn: (id: number) => bookingsApi.cancel(id),
@@ -168,6 +171,18 @@ function Bookings() {
           ))}
         </div>
 
+        {hasNextPage && (
+          <div className="text-center mt-6">
+            <button
+              onClick={() => fetchNextPage()}
+              disabled={isFetchingNextPage}
+              className="px-6 py-2 bg-white text-gray-700 rounded-lg shadow-md hover:bg-gray-100 transition-colors disabled:opacity-50"
+            >
+              {isFetchingNextPage ? 'Загрузка...' : 'Показать ещё'}
+            </button>
+          </div>
+        )}
+
         {bookings?.length === 0 && (
           <div className="text-center py-12 text-gray-500">
             Записи не найдены
@@ -1,14 +1,17 @@
-import { useQuery } from '@tanstack/react-query'
+import { useInfiniteQuery } from '@tanstack/react-query'
 import { certificatesApi } from '../api/client'
 import { useState } from 'react'
 
 function Certificates() {
   const [filterUsed, setFilterUsed] = useState<boolean | undefined>(undefined)
 
-  const { data: certificates, isLoading } = useQuery({
+  const { data, isLoading, hasNextPage, fetchNextPage, isFetchingNextPage } = useInfiniteQuery({
     queryKey: ['certificates', filterUsed],
-    queryFn: () => certificatesApi.getAll(filterUsed),
+    queryFn: ({ pageParam }) => certificatesApi.getAll(filterUsed, pageParam),
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
   })
+  const certificates = data?.pages.flatMap((page) => page.items)
 
   if (isLoading) {
     return (
@@ -102,6 +105,18 @@ function Certificates() {
           ))}
         </div>
 
+        {hasNextPage && (
+          <div className="text-center mt-6">
+            <button
+              onClick={() => fetchNextPage()}
+              disabled={isFetchingNextPage}
+              className="px-6 py-2 bg-white text-gray-700 rounded-lg shadow-md hover:bg-gray-100 transition-colors disabled:opacity-50"
+            >
+              {isFetchingNextPage ? 'Загрузка...' : 'Показать ещё'}
+            </button>
+          </div>
+        )}
+
         {certificates?.length === 0 && (
           <div className="text-center py-12 text-gray-500">
             Сертификаты не найдены
@@ -1,22 +1,28 @@
 import { Link } from 'react-router-dom'
-import { useQuery } from '@tanstack/react-query'
-import { servicesApi, promotionsApi, settingsApi } from '../api/client'
+import { useQuery, useQueryClient } from '@tanstack/react-query'
+import { bootstrapApi } from '../api/client'
 
 function Home() {
-  const { data: services } = useQuery({
-    queryKey: ['services', 'featured'],
-    queryFn: () => servicesApi.getAll(undefined, true),
-  })
+  const queryClient = useQueryClient()
 
-  const { data: promotions } = useQuery({
-    queryKey: ['promotions', 'featured'],
-    queryFn: () => promotionsApi.getAll(true),
+  const { data } = useQuery({
+    queryKey: ['bootstrap'],
+    queryFn: async () => {
+      const bootstrap = await bootstrapApi.get()
+      // Экраны услуг, акций и профиля открываются уже с данными, без отдельных запросов
+      queryClient.setQueryData(['services'], bootstrap.services)
+      queryClient.setQueryData(['categories'], bootstrap.categories)
+      queryClient.setQueryData(['promotions'], bootstrap.promotions)
+      if (bootstrap.user) {
+        queryClient.setQueryData(['user', 'me'], bootstrap.user)
+      }
+      return bootstrap
+    },
   })
 
-  const { data: settings } = useQuery({
-    queryKey: ['settings'],
-    queryFn: () => settingsApi.get(),
-  })
+  const services = data?.services
+  const promotions = data?.promotions
+  const settings = data?.settings
 
   return (
     <div className="min-h-screen bg-gray-50">
@@ -1,4 +1,4 @@
-import { useQuery } from '@tanstack/react-query'
+import { useInfiniteQuery, useQuery } from '@tanstack/react-query'
 import { useParams, Link } from 'react-router-dom'
 import { mastersApi, reviewsApi } from '../api/client'
 
@@ -12,11 +12,19 @@ function MasterDetail() {
     enabled: !!masterId,
   })
 
-  const { data: reviews } = useQuery({
+  const {
+    data: reviewPages,
+    hasNextPage,
+    fetchNextPage,
+    isFetchingNextPage,
+  } = useInfiniteQuery({
     queryKey: ['reviews', 'master', masterId],
-    queryFn: () => reviewsApi.getByMaster(masterId),
+    queryFn: ({ pageParam }) => reviewsApi.getByMaster(masterId, pageParam),
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
     enabled: !!masterId,
   })
+  const reviews = reviewPages?.pages.flatMap((page) => page.items)
 
   if (masterLoading) {
     return (
@@ -69,6 +77,25 @@ function MasterDetail() {
                   <span className="text-gray-500 ml-2">
                     ({master.reviews_count} отзывов)
                   </span>
+                  {master.reviews_count > 0 && (
+                    <div className="mt-2 space-y-1">
+                      {[5, 4, 3, 2, 1].map((star) => {
+                        const count = master.rating_histogram?.[star] ?? 0
+                        return (
+                          <div key={star} className="flex items-center text-sm">
+                            <span className="w-4 text-gray-600">{star}</span>
+                            <div className="flex-1 h-2 mx-2 bg-gray-200 rounded">
+                              <div
+                                className="h-2 bg-yellow-500 rounded"
+                                style={{ width: `${(count / master.reviews_count) * 100}%` }}
+                              />
+                            </div>
+                            <span className="w-8 text-right text-gray-500">{count}</span>
+                          </div>
+                        )
+                      })}
+                    </div>
+                  )}
                 </div>
               )}
               {master.phone && (
@@ -128,6 +155,17 @@ function MasterDetail() {
                 </div>
               ))}
             </div>
+            {hasNextPage && (
+              <div className="text-center mt-6">
+                <button
+                  onClick={() => fetchNextPage()}
+                  disabled={isFetchingNextPage}
+                  className="px-6 py-2 bg-white text-gray-700 rounded-lg shadow-md hover:bg-gray-100 transition-colors disabled:opacity-50"
+                >
+                  {isFetchingNextPage ? 'Загрузка...' : 'Показать ещё'}
+                </button>
+              </div>
+            )}
           </div>
         )}
       </div>